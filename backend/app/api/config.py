@@ -14,6 +14,46 @@ class Settings:
     # Database
     BASE_DIR: Path = Path(__file__).resolve().parent.parent.parent
     FAIRRANK_DB: str = os.getenv("FAIRRANK_DB", str(BASE_DIR / "fairrank.db"))
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "8"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # seconds
+    DB_EXECUTOR_THREADS: int = int(os.getenv("DB_EXECUTOR_THREADS", "0"))  # async DB threads; 0 = DB_POOL_SIZE
+    DB_BATCH_SIZE: int = int(os.getenv("DB_BATCH_SIZE", "1000"))  # rows per bulk-write transaction
+    
+    # SQLite PRAGMA profile applied to every new connection.
+    # WAL lets feed reads proceed while engines write; set a value to ""
+    # to leave that PRAGMA at the SQLite default.
+    DB_JOURNAL_MODE: str = os.getenv("DB_JOURNAL_MODE", "WAL")
+    DB_SYNCHRONOUS: str = os.getenv("DB_SYNCHRONOUS", "NORMAL")
+    DB_MMAP_SIZE: int = int(os.getenv("DB_MMAP_SIZE", str(256 * 1024 * 1024)))  # bytes
+    DB_CACHE_SIZE: int = int(os.getenv("DB_CACHE_SIZE", "-65536"))  # negative = KiB (64 MiB)
+    DB_TEMP_STORE: str = os.getenv("DB_TEMP_STORE", "MEMORY")
+    DB_BUSY_TIMEOUT_MS: int = int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000"))
+    
+    # Similarity index
+    SIMILARITY_TOP_K: int = int(os.getenv("SIMILARITY_TOP_K", "10"))
+    SIMILARITY_LSH_TABLES: int = int(os.getenv("SIMILARITY_LSH_TABLES", "0"))  # 0 = brute force only
+    SIMILARITY_LSH_BITS: int = int(os.getenv("SIMILARITY_LSH_BITS", "12"))
+    SIMILARITY_BLOCK_SIZE: int = int(os.getenv("SIMILARITY_BLOCK_SIZE", "1024"))  # rows per matmul tile
+    SIMILARITY_MIN_SCORE: float = float(os.getenv("SIMILARITY_MIN_SCORE", "0.5"))  # blocked all-pairs threshold
+    SIMILARITY_INDEX_CHECK_INTERVAL: float = float(os.getenv("SIMILARITY_INDEX_CHECK_INTERVAL", "5"))  # seconds between embedding stamp checks; 0 = every query
+    IMPRESSION_SHARDS: int = int(os.getenv("IMPRESSION_SHARDS", "16"))
+    IMPRESSION_FLUSH_INTERVAL: float = float(os.getenv("IMPRESSION_FLUSH_INTERVAL", "5"))  # seconds
+    IMPRESSION_FLUSH_THRESHOLD: int = int(os.getenv("IMPRESSION_FLUSH_THRESHOLD", "1000"))  # pending views
+    FAIRRANK_BOUNDS_TOLERANCE: float = float(os.getenv("FAIRRANK_BOUNDS_TOLERANCE", "0.05"))  # bound drift (fraction of range) incremental runs absorb
+    EXPOSURE_STATS_MAX_AGE: int = int(os.getenv("EXPOSURE_STATS_MAX_AGE", "300"))  # seconds; rebuild to catch other writers
+    PLATFORM_STATS_TTL: float = float(os.getenv("PLATFORM_STATS_TTL", "30"))  # seconds a stats snapshot is served
+    MATCH_TOP_K: int = int(os.getenv("MATCH_TOP_K", "20"))  # matches kept per request; 0 = all
+    MATCH_MIN_SCORE: float = float(os.getenv("MATCH_MIN_SCORE", "1"))
+    MATCH_WORKERS: int = int(os.getenv("MATCH_WORKERS", "0"))  # batch matching processes; 0 = CPU count
+    MATCH_PARALLEL_MIN_REQUESTS: int = int(os.getenv("MATCH_PARALLEL_MIN_REQUESTS", "500"))
+    MATCH_CACHE_SIZE: int = int(os.getenv("MATCH_CACHE_SIZE", "1024"))  # cached requests per process
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "2"))  # background engine job threads
+    JOB_HISTORY: int = int(os.getenv("JOB_HISTORY", "100"))  # finished jobs kept for status lookups
+    REWARD_QUEUE_MAXSIZE: int = int(os.getenv("REWARD_QUEUE_MAXSIZE", "10000"))  # full queue applies inline
+    REWARD_QUEUE_BATCH_SIZE: int = int(os.getenv("REWARD_QUEUE_BATCH_SIZE", "500"))
+    REWARD_QUEUE_FLUSH_INTERVAL: float = float(os.getenv("REWARD_QUEUE_FLUSH_INTERVAL", "0.5"))  # seconds
+    FEED_SNAPSHOT_MAX_AGE: float = float(os.getenv("FEED_SNAPSHOT_MAX_AGE", "60"))  # seconds between checks for runs in other processes; 0 = only this process's runs
+    EMBEDDING_SNAPSHOT_DIR: str = os.getenv("EMBEDDING_SNAPSHOT_DIR", "")  # empty = read embeddings from SQLite
     
     # CORS - Frontend URLs
     BACKEND_CORS_ORIGINS: list = [
@@ -4,7 +4,11 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from app.api.config import settings
+from app.core.database import close_pool, close_db_executor
 from app.core.logger import get_logger
+from app.services.impression_tracker import get_impression_tracker
+from app.services.reward_queue import get_reward_queue
+from app.services.job_runner import shutdown_job_runner
 
 # Import all route modules
 from app.api.routes import (
@@ -85,6 +89,9 @@ app.include_router(engines.router)
 async def startup_event():
     logger.info(f"Starting {settings.PROJECT_NAME} v{settings.VERSION}")
     logger.info(f"Database: {settings.FAIRRANK_DB}")
+    logger.info(f"DB connection pool size: {settings.DB_POOL_SIZE}")
+    get_impression_tracker().start()
+    get_reward_queue().start()
     logger.info(f"API docs: http://localhost:8000/docs")
     logger.info("All routes registered successfully")
 
@@ -93,6 +100,11 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Shutting down API server")
+    shutdown_job_runner()
+    get_impression_tracker().stop()
+    get_reward_queue().stop()
+    close_db_executor()
+    close_pool()
 
 
 # Root endpoint
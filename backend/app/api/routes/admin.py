@@ -1,9 +1,15 @@
 """Admin endpoints for database management and statistics."""
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from app.api.schema.admin import InitResponse, SeedResponse, PlatformStatsResponse
 from app.api.schema.common import StandardResponse
 from app.scripts.init_db import init_database
-from app.repositories.platform_stats import PlatformStatsRepository
+from app.core.database import get_pool, run_in_db, db_executor_stats
+from app.services.impression_tracker import get_impression_tracker
+from app.services.reward_queue import get_reward_queue
+from app.services.matching_engine import MatchingEngine
+from app.services.fairrank_engine import FairRankEngine
+from app.services.job_runner import get_job_runner
+from app.services.platform_stats_cache import PlatformStatsCache
 from app.core.logger import get_logger
 
 logger = get_logger(__name__)
@@ -19,7 +25,7 @@ async def initialize_database():
     Creates all necessary tables. This operation is idempotent.
     """
     try:
-        init_database()
+        await run_in_db(init_database)
         logger.info("Database initialized successfully")
         return {
             "success": True,
@@ -41,7 +47,7 @@ async def seed_database():
         # Import here to avoid circular imports
         from app.scripts.seed_data import seed_database as seed_func
         
-        result = seed_func()
+        result = await run_in_db(seed_func)
         logger.info(f"Database seeded: {result}")
         
         return {
@@ -61,7 +67,9 @@ async def seed_database():
 
 
 @router.get("/stats", response_model=PlatformStatsResponse)
-async def get_platform_statistics():
+async def get_platform_statistics(
+    fresh: bool = Query(False, description="Recompute instead of serving the cached snapshot")
+):
     """
     Get platform-wide statistics.
     
@@ -69,28 +77,44 @@ async def get_platform_statistics():
     - Total projects, creators, engagements
     - Underexposed projects count
     - Average FairRank score
-    - Exposure distribution histogram
+    - Exposure distribution histogram and exposure Gini (with error bound)
+    - When the snapshot was computed (`updated_at`)
+
+    Served from a snapshot materialized in `platform_stats`, refreshed
+    after each FairRank run and otherwise at most every
+    `PLATFORM_STATS_TTL` seconds. `fresh=true` recomputes it.
     """
     try:
-        repo = PlatformStatsRepository()
-        
-        total_projects = repo.count_projects()
-        total_creators = repo.count_creators()
-        total_engagements = repo.count_engagements()
-        underexposed = repo.count_underexposed_projects(threshold=100)
-        avg_fairrank = repo.get_avg_fairrank()
-        distribution = repo.get_exposure_distribution()
-        
+        stats = await run_in_db(PlatformStatsCache.get, fresh)
         logger.info("Platform statistics retrieved")
-        
-        return {
-            "total_projects": total_projects,
-            "total_creators": total_creators,
-            "total_engagements": total_engagements,
-            "underexposed_projects": underexposed,
-            "avg_fairrank": avg_fairrank,
-            "exposure_distribution": distribution
-        }
+        return stats
     except Exception as e:
         logger.error(f"Failed to get platform stats: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/metrics", response_model=StandardResponse)
+async def get_runtime_metrics():
+    """
+    Get in-process runtime metrics.
+    
+    - Impression tracker: pending views, flush lag, flush counts
+    - Reward queue: backlog depth and applied/failed counters
+    - Matching: result cache hits/misses and match writes
+    - FairRank: incremental runs and full-run fallbacks by reason
+    - Engine jobs: running/queued kinds and counts by status
+    - Database connection pool usage and DB executor backlog
+    """
+    return {
+        "success": True,
+        "message": "Runtime metrics",
+        "data": {
+            "impressions": get_impression_tracker().stats(),
+            "rewards": get_reward_queue().stats(),
+            "matching": MatchingEngine.cache_stats(),
+            "fairrank": FairRankEngine.run_stats(),
+            "jobs": get_job_runner().stats(),
+            "db_pool": get_pool().stats(),
+            "db_executor": db_executor_stats()
+        }
+    }
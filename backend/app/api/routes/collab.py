@@ -1,11 +1,12 @@
 """Collaboration endpoints for requests and matching."""
-from fastapi import APIRouter, HTTPException, Path
+from fastapi import APIRouter, HTTPException, Path, Query
 from app.api.schema.collab import (
     CollabRequestCreate,
     CollabRequestResponse,
     CollabMatchListResponse
 )
 from app.repositories.collab import CollabRepository
+from app.core.database import run_in_db
 from app.services.matching_engine import MatchingEngine
 from app.core.logger import get_logger
 
@@ -28,7 +29,8 @@ async def create_collab_request(request: CollabRequestCreate):
         # Convert skills list to comma-separated string for storage
         skills_str = ",".join(request.skills_needed)
         
-        request_id = repo.create_request(
+        request_id = await run_in_db(
+            repo.create_request,
             requester_id=request.requester_id,
             project_id=request.project_id,
             role_needed=request.role_needed,
@@ -41,7 +43,7 @@ async def create_collab_request(request: CollabRequestCreate):
         logger.info(f"Collaboration request created: ID {request_id}")
         
         # Return created request
-        result = repo.get_request(request_id)
+        result = await run_in_db(repo.get_request, request_id)
         return result
         
     except Exception as e:
@@ -60,7 +62,7 @@ async def get_collab_request(
     """
     try:
         repo = CollabRepository()
-        request = repo.get_request(request_id)
+        request = await run_in_db(repo.get_request, request_id)
         
         if not request:
             logger.warning(f"Collaboration request not found: ID {request_id}")
@@ -78,7 +80,9 @@ async def get_collab_request(
 
 @router.get("/requests/{request_id}/matches", response_model=CollabMatchListResponse)
 async def get_collab_matches(
-    request_id: int = Path(..., description="ID of the collaboration request")
+    request_id: int = Path(..., description="ID of the collaboration request"),
+    top_k: int = Query(None, ge=0, le=500, description="Number of matches to keep (0 = all; default from settings)"),
+    min_score: float = Query(None, ge=0, description="Minimum match score (default from settings)")
 ):
     """
     Get matched creators for a collaboration request.
@@ -88,25 +92,29 @@ async def get_collab_matches(
     - Location proximity (20%)
     - Availability match (20%)
     
+    Only the best `top_k` creators scoring at least `min_score` are kept;
+    they replace the request's previous matches. Results are cached and
+    only recomputed when the request or a creator profile changed.
+
     Returns top matches with explanations.
     """
     try:
         # Check if request exists
         repo = CollabRepository()
-        request = repo.get_request(request_id)
+        request = await run_in_db(repo.get_request, request_id)
         
         if not request:
             logger.warning(f"Collaboration request not found for matching: ID {request_id}")
             raise HTTPException(status_code=404, detail="Collaboration request not found")
         
-        # Run matching engine (this writes results to collab_matches table)
-        engine = MatchingEngine()
-        engine.run(request_id)
-        
-        logger.info(f"Matching engine completed for request {request_id}")
+        # Run matching engine (writes collab_matches only if the result changed)
+        stored = await run_in_db(MatchingEngine.get_matches, request_id, top_k=top_k, min_score=min_score)
+        if stored is None:
+            # the request was deleted while matching ran
+            raise HTTPException(status_code=404, detail="Collaboration request not found")
         
         # Get matches from database
-        matches = repo.get_matches_for_request(request_id)
+        matches = await run_in_db(repo.get_matches_for_request, request_id, limit=len(stored))
         
         logger.info(f"Found {len(matches)} matches for request {request_id}")
         
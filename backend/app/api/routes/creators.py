@@ -8,6 +8,7 @@ from app.api.schema.creator import (
     CreatorListResponse
 )
 from app.repositories.creators import CreatorRepository
+from app.core.database import run_in_db
 from app.core.logger import get_logger
 
 logger = get_logger(__name__)
@@ -25,7 +26,8 @@ async def create_creator(creator: CreatorCreate):
     try:
         repo = CreatorRepository()
         
-        creator_id = repo.create_creator(
+        creator_id = await run_in_db(
+            repo.create_creator,
             name=creator.name,
             role=creator.role,
             skills=creator.skills,
@@ -37,7 +39,7 @@ async def create_creator(creator: CreatorCreate):
         logger.info(f"Creator created: ID {creator_id}")
         
         # Return created creator
-        result = repo.get_creator(creator_id)
+        result = await run_in_db(repo.get_creator, creator_id)
         return result
         
     except Exception as e:
@@ -65,13 +67,14 @@ async def list_creators(
         # Parse skills filter
         skill_list = skills.split(",") if skills else None
         
-        creators = repo.get_all_creators(
+        creators = await run_in_db(
+            repo.get_all_creators,
             limit=limit,
             offset=offset,
             skill_filter=skill_list
         )
         
-        total = repo.count_creators(skill_filter=skill_list)
+        total = await run_in_db(repo.count_creators, skill_filter=skill_list)
         
         logger.info(f"Listed {len(creators)} creators (total: {total})")
         
@@ -99,7 +102,7 @@ async def get_creator(creator_id: int):
     """
     try:
         repo = CreatorRepository()
-        creator = repo.get_creator(creator_id)
+        creator = await run_in_db(repo.get_creator, creator_id)
         
         if not creator:
             logger.warning(f"Creator not found: ID {creator_id}")
@@ -126,13 +129,14 @@ async def update_creator(creator_id: int, update: CreatorUpdate):
         repo = CreatorRepository()
         
         # Check if creator exists
-        existing = repo.get_creator(creator_id)
+        existing = await run_in_db(repo.get_creator, creator_id)
         if not existing:
             logger.warning(f"Creator not found for update: ID {creator_id}")
             raise HTTPException(status_code=404, detail="Creator not found")
         
         # Update creator
-        repo.update_creator(
+        await run_in_db(
+            repo.update_creator,
             creator_id=creator_id,
             name=update.name,
             role=update.role,
@@ -145,7 +149,7 @@ async def update_creator(creator_id: int, update: CreatorUpdate):
         logger.info(f"Creator updated: ID {creator_id}")
         
         # Return updated creator
-        result = repo.get_creator(creator_id)
+        result = await run_in_db(repo.get_creator, creator_id)
         return result
         
     except HTTPException:
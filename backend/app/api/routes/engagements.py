@@ -6,6 +6,8 @@ from app.api.schema.engagement import (
     EngagementStatsResponse
 )
 from app.repositories.engagements import EngagementRepository
+from app.services.gamification import GamificationService
+from app.core.database import run_in_db
 from app.core.logger import get_logger
 
 logger = get_logger(__name__)
@@ -25,10 +27,9 @@ async def add_reaction(
     Automatically triggers gamification rewards for the reactor.
     """
     try:
-        repo = EngagementRepository()
-        
-        # Create engagement (this already handles reward logic in your existing code)
-        engagement_id = repo.create_engagement(
+        # Create engagement and queue the creator's engagement bonus
+        engagement_id = await run_in_db(
+            GamificationService.record_engagement,
             project_id=project_id,
             user_id=reaction.user_id,
             reaction=reaction.reaction_type,
@@ -65,7 +66,7 @@ async def get_project_stats(
         repo = EngagementRepository()
         
         # Get aggregated stats
-        stats = repo.get_project_stats(project_id)
+        stats = await run_in_db(repo.get_project_stats, project_id)
         
         if stats is None:
             # Project might not exist or have no engagements
@@ -1,8 +1,10 @@
 """Engine trigger endpoints for FairRank and Similarity calculations."""
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from app.api.schema.admin import EngineTriggerRequest, EngineTriggerResponse
+import asyncio
+from fastapi import APIRouter, HTTPException, Path
+from app.api.schema.admin import EngineTriggerRequest, EngineTriggerResponse, JobResponse
 from app.services.fairrank_engine import FairRankEngine
 from app.services.similarity_engine import SimilarityEngine
+from app.services.job_runner import get_job_runner, SUCCEEDED
 from app.core.logger import get_logger
 
 logger = get_logger(__name__)
@@ -10,89 +12,125 @@ logger = get_logger(__name__)
 router = APIRouter(prefix="/api/engines", tags=["engines"])
 
 
+async def _respond(job, name: str, background: bool):
+    """Return the trigger response, waiting for the job unless `background`."""
+    if background:
+        logger.info(f"{name} calculation scheduled in background: job {job.id} ({job.status})")
+        return {
+            "success": True,
+            "message": f"{name} calculation scheduled in background",
+            "job_id": job.id
+        }
+
+    await asyncio.wrap_future(job.future)
+    if job.status != SUCCEEDED:
+        logger.error(f"{name} calculation {job.status}: {job.error}")
+        raise HTTPException(status_code=500, detail=job.error or f"{name} job {job.status}")
+    logger.info(f"{name} calculation completed: job {job.id}")
+    return {
+        "success": True,
+        "message": f"{name} calculation completed",
+        "job_id": job.id
+    }
+
+
 @router.post("/fairrank", response_model=EngineTriggerResponse)
 async def trigger_fairrank(
-    request: EngineTriggerRequest = EngineTriggerRequest(),
-    background_tasks: BackgroundTasks = None
+    request: EngineTriggerRequest = EngineTriggerRequest()
 ):
     """
     Trigger FairRank calculation for all projects.
-    
+
     Recalculates:
     - Engagement scores
     - Underexposed boosts
     - Freshness scores
     - Combined FairRank scores
-    
-    Can run synchronously or in background.
+
+    Uses the vectorized batch mode (single aggregate query + bulk upsert).
+    With `incremental` only projects whose engagements or impressions
+    changed since the last run are rescored.
+    Runs as a job: synchronously waits for it, or with `background` returns
+    the job ID at once. Triggers that arrive while a FairRank job is
+    running are coalesced into a single follow-up run; a full trigger
+    upgrades an incremental follow-up to a full run (a full run also
+    covers every incremental trigger). Cancelling stops the run between
+    loading, scoring and persisting; once persisting starts it completes.
     """
+    engine = FairRankEngine()
+    run = engine.run_incremental if request.incremental else engine.run_batch
+    mode = "incremental" if request.incremental else "full"
+
+    def fairrank_job(job):
+        job.set_progress(0.0, "Scoring projects")
+        run(checkpoint=job.check_cancelled)
+
     try:
-        engine = FairRankEngine()
-        
-        if request.background and background_tasks:
-            # Run in background
-            background_tasks.add_task(engine.run)
-            logger.info("FairRank calculation started in background")
-            return {
-                "success": True,
-                "message": "FairRank calculation started in background",
-                "job_id": None
-            }
-        else:
-            # Run synchronously
-            engine.run()
-            logger.info("FairRank calculation completed")
-            return {
-                "success": True,
-                "message": "FairRank calculation completed",
-                "job_id": None
-            }
-            
+        job = get_job_runner().submit(
+            "fairrank", fairrank_job, mode=mode, scope=0 if request.incremental else 1
+        )
     except Exception as e:
         logger.error(f"FairRank calculation failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    return await _respond(job, "FairRank", request.background)
 
 
 @router.post("/similarity", response_model=EngineTriggerResponse)
 async def trigger_similarity(
-    request: EngineTriggerRequest = EngineTriggerRequest(),
-    background_tasks: BackgroundTasks = None
+    request: EngineTriggerRequest = EngineTriggerRequest()
 ):
     """
     Trigger similarity calculation for all projects.
-    
-    Generates embeddings and computes pairwise similarities.
-    This can be a heavy operation for many projects.
-    
-    Can run synchronously or in background.
+
+    Generates embeddings, rebuilds the vector index and stores each
+    project's top-K neighbours (not every pair).
+
+    Runs as a job like `/fairrank`; overlapping triggers are coalesced.
     """
+    engine = SimilarityEngine()
+
+    def similarity_job(job):
+        job.set_progress(0.0, "Generating embeddings")
+        engine.generate_dummy_embeddings(dim=16)
+        job.check_cancelled()
+        job.set_progress(0.5, "Computing top-K similarities")
+        engine.compute_top_k_similarities()
+
     try:
-        engine = SimilarityEngine()
-        
-        if request.background and background_tasks:
-            # Run in background
-            def run_similarity():
-                engine.generate_dummy_embeddings(dim=16)
-                engine.compute_all_similarities()
-            
-            background_tasks.add_task(run_similarity)
-            logger.info("Similarity calculation started in background")
-            return {
-                "success": True,
-                "message": "Similarity calculation started in background",
-                "job_id": None
-            }
-        else:
-            # Run synchronously
-            engine.generate_dummy_embeddings(dim=16)
-            engine.compute_all_similarities()
-            logger.info("Similarity calculation completed")
-            return {
-                "success": True,
-                "message": "Similarity calculation completed",
-                "job_id": None
-            }
-            
+        job = get_job_runner().submit("similarity", similarity_job)
     except Exception as e:
         logger.error(f"Similarity calculation failed: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+    return await _respond(job, "Similarity", request.background)
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str = Path(..., description="Job ID returned by an engine trigger")
+):
+    """
+    Get the status, progress and duration of an engine job.
+
+    Only the most recent jobs are kept (`JOB_HISTORY`).
+    """
+    job = get_job_runner().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+
+@router.post("/jobs/{job_id}/cancel", response_model=JobResponse)
+async def cancel_job(
+    job_id: str = Path(..., description="Job ID returned by an engine trigger")
+):
+    """
+    Cancel an engine job.
+
+    A queued job is cancelled immediately; a running job stops at its next
+    step boundary. Finished jobs are returned unchanged.
+    """
+    job = get_job_runner().cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    logger.info(f"Cancel requested for job {job_id} ({job.status})")
+    return job.to_dict()
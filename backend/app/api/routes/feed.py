@@ -1,9 +1,12 @@
 """Feed endpoint for FairRank-based discovery."""
+import base64
+import json
+from typing import Optional
 from fastapi import APIRouter, HTTPException, Query
-from datetime import datetime, timedelta
 from app.api.schema.feed import FeedResponse, FeedItemResponse
-from app.repositories.fairrank import FairRankRepository
-from app.repositories.projects import ProjectRepository
+from app.services.feed_snapshot import FeedCache
+from app.core.database import run_in_db
+from app.services.impression_tracker import get_impression_tracker
 from app.core.logger import get_logger
 
 logger = get_logger(__name__)
@@ -11,47 +14,27 @@ logger = get_logger(__name__)
 router = APIRouter(prefix="/api", tags=["feed"])
 
 
-def generate_explanation_badge(project: dict, fairrank_data: dict) -> str:
-    """
-    Generate explanation badge for why a project is shown in the feed.
-    
-    Priority order:
-    1. Underexposed (impressions < 100)
-    2. Fresh (created < 24 hours ago)
-    3. High engagement (engagement_score > 0.7)
-    4. Default recommendation
-    """
-    impressions = project.get("impressions", 0)
-    created_at = project.get("created_at")
-    engagement_score = fairrank_data.get("engagement_score", 0.0)
-    
-    # Parse created_at timestamp
+def encode_cursor(score: float, project_id: int) -> str:
+    """Encode the sort key of the last item on a page as an opaque cursor."""
+    raw = json.dumps([score, project_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """Inverse of `encode_cursor`; raises ValueError on malformed input."""
     try:
-        if isinstance(created_at, str):
-            created_datetime = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-        else:
-            created_datetime = created_at
-        
-        hours_old = (datetime.utcnow() - created_datetime).total_seconds() / 3600
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        score, project_id = json.loads(raw)
+        return float(score), int(project_id)
     except Exception as e:
-        logger.warning(f"Failed to parse created_at: {e}")
-        hours_old = 999  # Default to old
-    
-    # Generate badge based on priority
-    if impressions < 100:
-        return "🚀 Boosting emerging project"
-    elif hours_old < 24:
-        return "✨ Fresh content"
-    elif engagement_score > 0.7:
-        return "📈 High engagement"
-    else:
-        return "🎯 Recommended for you"
+        raise ValueError("invalid cursor") from e
 
 
 @router.get("/feed", response_model=FeedResponse)
 async def get_discovery_feed(
     limit: int = Query(default=20, ge=1, le=50),
-    offset: int = Query(default=0, ge=0)
+    offset: int = Query(default=0, ge=0),
+    cursor: Optional[str] = Query(default=None, description="`next_cursor` from the previous page; overrides offset")
 ):
     """
     Get the FairRank-sorted discovery feed.
@@ -62,37 +45,30 @@ async def get_discovery_feed(
     - Freshness (20%)
     
     Each project includes an explanation badge showing why it was recommended.
+
+    Page with `offset`, or follow `next_cursor` for constant-cost deep pages.
     """
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        offset = 0
+
     try:
-        fairrank_repo = FairRankRepository()
-        
-        # Get ranked projects (joins fair_rank_scores with projects)
-        ranked_projects = fairrank_repo.get_ranked_feed(limit=limit, offset=offset)
-        
-        feed_items = []
-        for item in ranked_projects:
-            project = item["project"]
-            fairrank = item["fairrank"]
-            
-            # Generate explanation badge
-            badge = generate_explanation_badge(project, fairrank)
-            
-            feed_items.append({
-                "id": project["id"],
-                "title": project["title"],
-                "abstract": project["abstract"],
-                "creator_id": project["creator_id"],
-                "stage": project["stage"],
-                "fairrank_score": fairrank["score"],
-                "explanation_badge": badge,
-                "impressions": project["impressions"],
-                "created_at": project["created_at"]
-            })
+        # Served from the in-memory snapshot published by FairRankEngine
+        snapshot = await run_in_db(FeedCache.get_snapshot)
+        feed_items, has_more = snapshot.page(limit, offset=offset, after=after)
+        total = len(snapshot)
+        get_impression_tracker().record(item["id"] for item in feed_items)
         
-        # Get total count
-        total = fairrank_repo.count_ranked_projects()
+        logger.info(f"Feed generated: {len(feed_items)} items (total: {total}, snapshot v{snapshot.version})")
         
-        logger.info(f"Feed generated: {len(feed_items)} items (total: {total})")
+        next_cursor = None
+        if has_more and feed_items:
+            last = feed_items[-1]
+            next_cursor = encode_cursor(last["fairrank_score"], last["id"])
         
         return {
             "items": feed_items,
@@ -100,10 +76,11 @@ async def get_discovery_feed(
                 "total": total,
                 "limit": limit,
                 "offset": offset,
-                "has_more": (offset + limit) < total
+                "has_more": has_more,
+                "next_cursor": next_cursor
             }
         }
         
     except Exception as e:
         logger.error(f"Failed to generate feed: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,7 +1,7 @@
 """Health check endpoint."""
 from fastapi import APIRouter
 from app.api.schema.common import HealthResponse
-from app.core.database import get_connection
+from app.core.database import pooled_connection, run_in_db
 from datetime import datetime
 from app.core.logger import get_logger
 
@@ -18,9 +18,12 @@ async def health_check():
     Returns the API status and database connectivity status.
     """
     # Test database connection
+    def ping():
+        with pooled_connection() as conn:
+            conn.execute("SELECT 1")
+
     try:
-        conn = get_connection()
-        conn.close()
+        await run_in_db(ping)
         db_status = "connected"
         logger.info("Health check: database connected")
     except Exception as e:
@@ -9,7 +9,8 @@ from app.api.schema.project import (
     SimilarProjectsResponse
 )
 from app.repositories.projects import ProjectRepository
-from app.repositories.similarity import SimilarityRepository
+from app.core.database import run_in_db
+from app.services.impression_tracker import get_impression_tracker
 from app.services.similarity_engine import SimilarityEngine
 from app.core.logger import get_logger
 
@@ -29,7 +30,8 @@ async def create_project(project: ProjectCreate):
         repo = ProjectRepository()
         
         # Create project in database
-        project_id = repo.create_project(
+        project_id = await run_in_db(
+            repo.create_project,
             title=project.title,
             abstract=project.abstract,
             creator_id=project.creator_id,
@@ -41,14 +43,14 @@ async def create_project(project: ProjectCreate):
         # Generate embedding for similarity detection
         try:
             engine = SimilarityEngine()
-            engine.generate_embedding_for_project(project_id)
+            await run_in_db(engine.generate_embedding_for_project, project_id)
             logger.info(f"Embedding generated for project {project_id}")
         except Exception as e:
             logger.warning(f"Failed to generate embedding for project {project_id}: {e}")
             # Don't fail the request if embedding generation fails
         
         # Return created project
-        result = repo.get_project(project_id)
+        result = await run_in_db(repo.get_project, project_id)
         return result
         
     except Exception as e:
@@ -70,13 +72,14 @@ async def list_projects(
     try:
         repo = ProjectRepository()
         
-        projects = repo.get_all_projects(
+        projects = await run_in_db(
+            repo.get_all_projects,
             limit=limit,
             offset=offset,
             stage_filter=stage
         )
         
-        total = repo.count_projects(stage_filter=stage)
+        total = await run_in_db(repo.count_projects, stage_filter=stage)
         
         logger.info(f"Listed {len(projects)} projects (total: {total})")
         
@@ -104,12 +107,13 @@ async def get_project(project_id: int):
     """
     try:
         repo = ProjectRepository()
-        project = repo.get_project(project_id)
+        project = await run_in_db(repo.get_project, project_id)
         
         if not project:
             logger.warning(f"Project not found: ID {project_id}")
             raise HTTPException(status_code=404, detail="Project not found")
         
+        get_impression_tracker().record((project_id,))
         logger.info(f"Retrieved project: ID {project_id}")
         return project
         
@@ -132,13 +136,14 @@ async def update_project(project_id: int, update: ProjectUpdate):
         repo = ProjectRepository()
         
         # Check if project exists
-        existing = repo.get_project(project_id)
+        existing = await run_in_db(repo.get_project, project_id)
         if not existing:
             logger.warning(f"Project not found for update: ID {project_id}")
             raise HTTPException(status_code=404, detail="Project not found")
         
         # Update project
-        repo.update_project(
+        await run_in_db(
+            repo.update_project,
             project_id=project_id,
             title=update.title,
             abstract=update.abstract,
@@ -151,13 +156,13 @@ async def update_project(project_id: int, update: ProjectUpdate):
         if update.title or update.abstract:
             try:
                 engine = SimilarityEngine()
-                engine.generate_embedding_for_project(project_id)
+                await run_in_db(engine.generate_embedding_for_project, project_id)
                 logger.info(f"Embedding regenerated for project {project_id}")
             except Exception as e:
                 logger.warning(f"Failed to regenerate embedding: {e}")
         
         # Return updated project
-        result = repo.get_project(project_id)
+        result = await run_in_db(repo.get_project, project_id)
         return result
         
     except HTTPException:
@@ -175,22 +180,31 @@ async def get_similar_projects(
     """
     Get similar projects based on text embeddings.
     
-    Uses cosine similarity to find semantically related projects.
+    Answered directly from the in-process vector index (top-K cosine
+    similarity), so no pairwise similarity table scan is needed.
     """
     try:
-        repo = SimilarityRepository()
-        
-        # Check if project exists
-        from app.repositories.projects import ProjectRepository
         project_repo = ProjectRepository()
-        project = project_repo.get_project(project_id)
+        project = await run_in_db(project_repo.get_project, project_id)
         
         if not project:
             logger.warning(f"Project not found for similarity: ID {project_id}")
             raise HTTPException(status_code=404, detail="Project not found")
         
-        # Get similar projects
-        similar = repo.get_similar_projects(project_id, limit=limit)
+        # Top-K neighbours from the vector index
+        neighbours = await run_in_db(SimilarityEngine.find_similar, project_id, k=limit)
+        details = await run_in_db(project_repo.get_projects_by_ids, [pid for pid, _ in neighbours])
+        
+        similar = [
+            {
+                "id": pid,
+                "title": details[pid]["title"],
+                "abstract": details[pid]["abstract"],
+                "similarity_score": score
+            }
+            for pid, score in neighbours
+            if pid in details
+        ]
         
         logger.info(f"Found {len(similar)} similar projects for ID {project_id}")
         
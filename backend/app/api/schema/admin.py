@@ -46,6 +46,10 @@ class PlatformStatsResponse(BaseModel):
     underexposed_projects: int = Field(..., description="Projects with impressions < 100")
     avg_fairrank: float = Field(..., description="Average FairRank score")
     exposure_distribution: Dict[str, int] = Field(..., description="Histogram of impression counts")
+    exposure_gini: Optional[float] = Field(None, description="Gini coefficient of impressions (estimate)")
+    exposure_gini_error: Optional[float] = Field(None, description="Bound on |exposure_gini - exact Gini|")
+    engagement_gini: Optional[float] = Field(None, description="Gini coefficient of engagement scores from the last FairRank run")
+    updated_at: Optional[str] = Field(None, description="When these statistics were computed (UTC)")
     
     class Config:
         json_schema_extra = {
@@ -61,19 +65,28 @@ class PlatformStatsResponse(BaseModel):
                     "101-200": 7,
                     "201-500": 4,
                     "500+": 1
-                }
+                },
+                "exposure_gini": 0.41,
+                "exposure_gini_error": 0.003,
+                "engagement_gini": 0.37,
+                "updated_at": "2024-01-15T10:30:00"
             }
         }
 
 
 class EngineTriggerRequest(BaseModel):
     """Schema for triggering engine calculations"""
-    background: bool = Field(default=False, description="Run in background task")
+    background: bool = Field(default=False, description="Return the job ID without waiting for the run")
+    incremental: bool = Field(
+        default=False,
+        description="FairRank only: rescore projects changed since the last run"
+    )
     
     class Config:
         json_schema_extra = {
             "example": {
-                "background": False
+                "background": False,
+                "incremental": False
             }
         }
 
@@ -82,13 +95,47 @@ class EngineTriggerResponse(BaseModel):
     """Schema for engine trigger response"""
     success: bool
     message: str
-    job_id: Optional[str] = Field(None, description="Job ID if running in background")
+    job_id: Optional[str] = Field(None, description="Job ID; poll /api/engines/jobs/{job_id}")
     
     class Config:
         json_schema_extra = {
             "example": {
                 "success": True,
                 "message": "FairRank calculation completed",
-                "job_id": None
+                "job_id": "3f2c9a8e5b7d4e1f9a0b6c2d8e4f1a3b"
+            }
+        }
+
+
+class JobResponse(BaseModel):
+    """Schema for a background engine job"""
+    job_id: str
+    kind: str
+    mode: Optional[str] = Field(None, description="Run variant, e.g. full or incremental")
+    status: str = Field(..., description="queued, running, succeeded, failed or cancelled")
+    progress: float = Field(..., description="Fraction completed, 0.0 - 1.0")
+    message: Optional[str] = None
+    error: Optional[str] = None
+    coalesced: int = Field(0, description="Later triggers folded into this job")
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    duration_seconds: Optional[float] = None
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "job_id": "3f2c9a8e5b7d4e1f9a0b6c2d8e4f1a3b",
+                "kind": "similarity",
+                "mode": None,
+                "status": "running",
+                "progress": 0.5,
+                "message": "Computing top-K similarities",
+                "error": None,
+                "coalesced": 2,
+                "created_at": "2026-01-01T12:00:00",
+                "started_at": "2026-01-01T12:00:00.120000",
+                "finished_at": None,
+                "duration_seconds": 1.84
             }
         }
\ No newline at end of file
@@ -23,4 +23,5 @@ class PaginationMeta(BaseModel):
     total: int = Field(..., description="Total number of items")
     limit: int = Field(..., description="Items per page")
     offset: int = Field(..., description="Current offset")
-    has_more: bool = Field(..., description="Whether more items exist")
\ No newline at end of file
+    has_more: bool = Field(..., description="Whether more items exist")
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for the next page, if any")
\ No newline at end of file
@@ -68,7 +68,8 @@ class FeedResponse(BaseModel):
                     "total": 20,
                     "limit": 10,
                     "offset": 0,
-                    "has_more": True
+                    "has_more": True,
+                    "next_cursor": "WzAuNjUsIDEyXQ"
                 }
             }
         }
\ No newline at end of file
@@ -33,9 +33,16 @@ def execute_script(script: str):
             pass
 # app/core/database.py
 
+import asyncio
+import functools
 import os
+import queue
 import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from sqlite3 import Connection
+from app.api.config import settings
 from app.core.logger import get_logger
 
 logger = get_logger(__name__)
@@ -44,18 +51,236 @@ logger = get_logger(__name__)
 DATABASE_NAME = os.environ.get("FAIRRANK_DB", "fairrank.db")
 
 
-def get_connection() -> Connection:
-    """Return an SQLite connection configured with row factory and FK support.
+def pragma_profile():
+    """Return the (pragma, value) pairs from Settings applied to new connections."""
+    profile = [
+        ("busy_timeout", settings.DB_BUSY_TIMEOUT_MS),
+        ("journal_mode", settings.DB_JOURNAL_MODE),
+        ("synchronous", settings.DB_SYNCHRONOUS),
+        ("mmap_size", settings.DB_MMAP_SIZE),
+        ("cache_size", settings.DB_CACHE_SIZE),
+        ("temp_store", settings.DB_TEMP_STORE),
+    ]
+    return [(name, value) for name, value in profile if value not in (None, "")]
+
+
+def get_connection(database: str = None, check_same_thread: bool = True) -> Connection:
+    """Return an SQLite connection configured with row factory, FK support
+    and the PRAGMA profile from Settings.
 
     Raises sqlite3.Error on failure which should be logged by callers.
     """
-    logger.debug("Opening DB connection to %s", DATABASE_NAME)
-    conn = sqlite3.connect(DATABASE_NAME)
+    database = database or DATABASE_NAME
+    logger.debug("Opening DB connection to %s", database)
+    conn = sqlite3.connect(database, check_same_thread=check_same_thread)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON;")
+    for name, value in pragma_profile():
+        conn.execute("PRAGMA {} = {};".format(name, value))
     return conn
 
 
+class ConnectionPool:
+    """Bounded pool of long-lived, pre-configured SQLite connections.
+
+    Connections are created lazily up to `size` and handed out LIFO so the
+    hottest connection (warm page cache) is reused first. Each checkout
+    runs a cheap health check and replaces broken connections. When all
+    connections are in use `acquire` blocks for up to `timeout` seconds
+    and then raises sqlite3.OperationalError.
+
+    The pool resets itself after a fork: SQLite connections must not be
+    shared with child processes.
+    """
+
+    def __init__(self, database: str, size: int, timeout: float):
+        self.database = database
+        self.size = max(1, size)
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._pid = os.getpid()
+
+    def _connect(self) -> Connection:
+        # pooled connections move between threads, one user at a time
+        return get_connection(self.database, check_same_thread=False)
+
+    @staticmethod
+    def _is_healthy(conn: Connection) -> bool:
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _discard(self, conn: Connection):
+        with self._lock:
+            self._created -= 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def acquire(self) -> Connection:
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    logger.debug("Fork detected, resetting connection pool")
+                    self._reset()
+
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_create = self._created < self.size
+                    if can_create:
+                        self._created += 1
+                if can_create:
+                    try:
+                        return self._connect()
+                    except Exception:
+                        with self._lock:
+                            self._created -= 1
+                        raise
+                try:
+                    conn = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise sqlite3.OperationalError(
+                        "connection pool exhausted (size=%d, timeout=%ss)" % (self.size, self.timeout)
+                    )
+
+            if self._is_healthy(conn):
+                return conn
+            logger.warning("Discarding unhealthy pooled connection")
+            self._discard(conn)
+
+    def release(self, conn: Connection):
+        """Return a connection to the pool, rolling back any open transaction."""
+        if self._pid != os.getpid():
+            return
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            logger.warning("Rollback on release failed, discarding connection")
+            self._discard(conn)
+            return
+        self._idle.put(conn)
+
+    def close(self):
+        """Close all idle connections."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    def stats(self) -> dict:
+        return {"size": self.size, "open": self._created, "idle": self._idle.qsize()}
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """Return the process-wide pool for DATABASE_NAME, creating it on first use."""
+    global _pool
+    pool = _pool
+    if pool is None or pool.database != DATABASE_NAME:
+        with _pool_lock:
+            if _pool is None or _pool.database != DATABASE_NAME:
+                if _pool is not None:
+                    _pool.close()
+                _pool = ConnectionPool(DATABASE_NAME, settings.DB_POOL_SIZE, settings.DB_POOL_TIMEOUT)
+            pool = _pool
+    return pool
+
+
+def close_pool():
+    """Close idle pooled connections (called on application shutdown)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+@contextmanager
+def pooled_connection():
+    """Check a connection out of the pool for the duration of the block."""
+    pool = get_pool()
+    conn = pool.acquire()
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+_executor_pending = 0
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    """Return the thread pool that runs blocking DB work for async callers.
+
+    Sized to `DB_EXECUTOR_THREADS` (default: the connection pool size) so
+    each thread can hold a pooled connection without waiting for another.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.DB_EXECUTOR_THREADS or settings.DB_POOL_SIZE,
+                    thread_name_prefix="db",
+                )
+    return _executor
+
+
+def close_db_executor():
+    """Wait for queued DB work and stop the executor threads."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
+
+
+async def run_in_db(func, *args, **kwargs):
+    """Await `func(*args, **kwargs)` run on the DB executor.
+
+    Use it from `async def` routes for anything that touches SQLite, so
+    the event loop keeps serving other requests meanwhile. The whole call
+    runs on one thread, so `BaseRepository.transaction()` blocks inside
+    `func` work as usual.
+    """
+    global _executor_pending
+    with _executor_lock:
+        _executor_pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_db_executor(), functools.partial(func, *args, **kwargs))
+    finally:
+        with _executor_lock:
+            _executor_pending -= 1
+
+
+def db_executor_stats() -> dict:
+    executor = _executor
+    return {
+        "threads": executor._max_workers if executor is not None else 0,
+        "pending": _executor_pending,
+    }
+
+
 def execute_script(script: str):
     """Execute a multi-statement SQL script (used for schema initialization).
 
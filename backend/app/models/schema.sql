@@ -43,11 +43,59 @@ CREATE TABLE IF NOT EXISTS engagements (
     FOREIGN KEY (project_id) REFERENCES projects(project_id) ON DELETE CASCADE
 );
 
+-- Per-project engagement aggregates, maintained by the triggers at the
+-- end of this file (rebuild with `main.py --rebuild-engagement-stats`)
+CREATE TABLE IF NOT EXISTS project_engagement_stats (
+    project_id INTEGER PRIMARY KEY,
+    total_reactions INTEGER NOT NULL DEFAULT 0,
+    likes INTEGER NOT NULL DEFAULT 0,
+    insightful INTEGER NOT NULL DEFAULT 0,
+    inspiring INTEGER NOT NULL DEFAULT 0,
+    weight_sum REAL NOT NULL DEFAULT 0,
+    last_engaged_at TEXT,
+    FOREIGN KEY (project_id) REFERENCES projects(project_id) ON DELETE CASCADE
+);
+
+-- Backfill projects engaged with before the table existed (no-op afterwards)
+INSERT OR IGNORE INTO project_engagement_stats
+    (project_id, total_reactions, likes, insightful, inspiring, weight_sum, last_engaged_at)
+SELECT
+    project_id,
+    COUNT(*),
+    COALESCE(SUM(reaction = 'like'), 0),
+    COALESCE(SUM(reaction = 'insightful'), 0),
+    COALESCE(SUM(reaction = 'inspiring'), 0),
+    COALESCE(SUM(weight), 0),
+    MAX(created_at)
+FROM engagements
+WHERE project_id IS NOT NULL
+GROUP BY project_id;
+
 CREATE TABLE IF NOT EXISTS project_embeddings (
     project_id INTEGER PRIMARY KEY,
-    embedding TEXT
+    embedding BLOB  -- float32 payload with header, see EmbeddingRepository
+);
+
+-- Single-row version stamp for project_embeddings, bumped by triggers;
+-- `token` is random per database so stamps never collide across rebuilds
+CREATE TABLE IF NOT EXISTS embedding_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    token TEXT NOT NULL DEFAULT (lower(hex(randomblob(8)))),
+    version INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT OR IGNORE INTO embedding_state (id) VALUES (1);
+
+-- Same for the creator profile fields matching reads (skills, location,
+-- availability); point awards do not bump it
+CREATE TABLE IF NOT EXISTS creator_profile_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    token TEXT NOT NULL DEFAULT (lower(hex(randomblob(8)))),
+    version INTEGER NOT NULL DEFAULT 0
 );
 
+INSERT OR IGNORE INTO creator_profile_state (id) VALUES (1);
+
 CREATE TABLE IF NOT EXISTS project_similarity (
     project_a INTEGER,
     project_b INTEGER,
@@ -66,6 +114,24 @@ CREATE TABLE IF NOT EXISTS fair_rank_scores (
     computed_at TEXT
 );
 
+-- Normalization bounds used by the last full FairRank run
+CREATE TABLE IF NOT EXISTS fair_rank_state (
+    id INTEGER PRIMARY KEY DEFAULT 1,
+    engagement_min REAL,
+    engagement_max REAL,
+    impressions_min REAL,
+    impressions_max REAL,
+    computed_at TEXT,
+    scores_updated_at TEXT  -- last write to fair_rank_scores by any run; feed caches compare it
+);
+
+-- Projects whose FairRank inputs changed since they were last scored
+-- (maintained by the triggers at the end of this file)
+CREATE TABLE IF NOT EXISTS fair_rank_changes (
+    project_id INTEGER PRIMARY KEY,
+    changed_at TEXT
+);
+
 CREATE TABLE IF NOT EXISTS collab_requests (
     request_id INTEGER PRIMARY KEY AUTOINCREMENT,
     requester_id INTEGER NOT NULL,
@@ -106,8 +172,12 @@ CREATE TABLE IF NOT EXISTS platform_stats (
     total_projects INTEGER DEFAULT 0,
     underexposed_count INTEGER DEFAULT 0,
     avg_fairrank REAL DEFAULT 0.0,
-    exposure_gini REAL DEFAULT 0.0,
-    updated_at TEXT
+    exposure_gini REAL DEFAULT 0.0,  -- Gini of FairRank engagement scores
+    updated_at TEXT,
+    total_engagements INTEGER DEFAULT 0,
+    impression_gini REAL,  -- Gini of project impressions (histogram estimate)
+    impression_gini_error REAL DEFAULT 0.0,
+    exposure_distribution TEXT  -- JSON {bucket: count}; NULL until a stats snapshot is saved
 );
 
 -- Indexes for performance
@@ -116,4 +186,158 @@ CREATE INDEX IF NOT EXISTS idx_engagements_project ON engagements(project_id);
 CREATE INDEX IF NOT EXISTS idx_rewards_creator ON creator_rewards(creator_id);
 CREATE INDEX IF NOT EXISTS idx_collab_matches_request ON collab_matches(request_id);
 CREATE INDEX IF NOT EXISTS idx_collab_requests_project ON collab_requests(project_id);
-CREATE INDEX IF NOT EXISTS idx_fairrank_score ON fair_rank_scores(final_score DESC);
\ No newline at end of file
+-- Feed order and keyset cursor: (final_score DESC, project_id DESC)
+CREATE INDEX IF NOT EXISTS idx_fairrank_score_project ON fair_rank_scores(final_score DESC, project_id DESC);
+DROP INDEX IF EXISTS idx_fairrank_score;
+
+-- FairRank change log: record every project whose engagements or
+-- impressions changed so the engine can rescore incrementally
+CREATE TRIGGER IF NOT EXISTS trg_fair_rank_engagement_insert
+AFTER INSERT ON engagements
+BEGIN
+    INSERT OR REPLACE INTO fair_rank_changes (project_id, changed_at)
+    VALUES (NEW.project_id, strftime('%Y-%m-%dT%H:%M:%f', 'now'));
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_fair_rank_engagement_delete
+AFTER DELETE ON engagements
+BEGIN
+    INSERT OR REPLACE INTO fair_rank_changes (project_id, changed_at)
+    VALUES (OLD.project_id, strftime('%Y-%m-%dT%H:%M:%f', 'now'));
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_fair_rank_engagement_update
+AFTER UPDATE OF project_id, weight ON engagements
+BEGIN
+    INSERT OR REPLACE INTO fair_rank_changes (project_id, changed_at)
+    VALUES (OLD.project_id, strftime('%Y-%m-%dT%H:%M:%f', 'now'));
+    INSERT OR REPLACE INTO fair_rank_changes (project_id, changed_at)
+    VALUES (NEW.project_id, strftime('%Y-%m-%dT%H:%M:%f', 'now'));
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_fair_rank_project_insert
+AFTER INSERT ON projects
+BEGIN
+    INSERT OR REPLACE INTO fair_rank_changes (project_id, changed_at)
+    VALUES (NEW.project_id, strftime('%Y-%m-%dT%H:%M:%f', 'now'));
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_fair_rank_project_impressions
+AFTER UPDATE OF impressions ON projects
+BEGIN
+    INSERT OR REPLACE INTO fair_rank_changes (project_id, changed_at)
+    VALUES (NEW.project_id, strftime('%Y-%m-%dT%H:%M:%f', 'now'));
+END;
+
+-- Embedding version stamp: any write invalidates on-disk snapshots
+CREATE TRIGGER IF NOT EXISTS trg_embedding_insert
+AFTER INSERT ON project_embeddings
+BEGIN
+    UPDATE embedding_state SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_embedding_update
+AFTER UPDATE ON project_embeddings
+BEGIN
+    UPDATE embedding_state SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_embedding_delete
+AFTER DELETE ON project_embeddings
+BEGIN
+    UPDATE embedding_state SET version = version + 1 WHERE id = 1;
+END;
+
+-- project_embeddings has no foreign key; drop a deleted project's
+-- embedding here so cached vector indexes see the version move
+CREATE TRIGGER IF NOT EXISTS trg_project_delete_embedding
+AFTER DELETE ON projects
+BEGIN
+    DELETE FROM project_embeddings WHERE project_id = OLD.project_id;
+END;
+
+-- Creator profile version stamp: invalidates cached collaboration matches
+CREATE TRIGGER IF NOT EXISTS trg_creator_profile_insert
+AFTER INSERT ON creator_profiles
+BEGIN
+    UPDATE creator_profile_state SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_creator_profile_update
+AFTER UPDATE OF skills, location, availability ON creator_profiles
+BEGIN
+    UPDATE creator_profile_state SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_creator_profile_delete
+AFTER DELETE ON creator_profiles
+BEGIN
+    UPDATE creator_profile_state SET version = version + 1 WHERE id = 1;
+END;
+
+-- Engagement aggregates: apply each engagement row as a +1 / -1 delta
+CREATE TRIGGER IF NOT EXISTS trg_engagement_stats_insert
+AFTER INSERT ON engagements
+WHEN NEW.project_id IS NOT NULL
+BEGIN
+    INSERT INTO project_engagement_stats
+        (project_id, total_reactions, likes, insightful, inspiring, weight_sum, last_engaged_at)
+    VALUES (
+        NEW.project_id, 1,
+        COALESCE(NEW.reaction = 'like', 0), COALESCE(NEW.reaction = 'insightful', 0),
+        COALESCE(NEW.reaction = 'inspiring', 0), COALESCE(NEW.weight, 0), NEW.created_at
+    )
+    ON CONFLICT(project_id) DO UPDATE SET
+        total_reactions = total_reactions + 1,
+        likes = likes + excluded.likes,
+        insightful = insightful + excluded.insightful,
+        inspiring = inspiring + excluded.inspiring,
+        weight_sum = weight_sum + excluded.weight_sum,
+        last_engaged_at = CASE
+            WHEN last_engaged_at IS NULL OR excluded.last_engaged_at > last_engaged_at
+            THEN COALESCE(excluded.last_engaged_at, last_engaged_at)
+            ELSE last_engaged_at
+        END;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_engagement_stats_delete
+AFTER DELETE ON engagements
+WHEN OLD.project_id IS NOT NULL
+BEGIN
+    UPDATE project_engagement_stats SET
+        total_reactions = total_reactions - 1,
+        likes = likes - COALESCE(OLD.reaction = 'like', 0),
+        insightful = insightful - COALESCE(OLD.reaction = 'insightful', 0),
+        inspiring = inspiring - COALESCE(OLD.reaction = 'inspiring', 0),
+        weight_sum = weight_sum - COALESCE(OLD.weight, 0),
+        last_engaged_at = (SELECT MAX(created_at) FROM engagements WHERE project_id = OLD.project_id)
+    WHERE project_id = OLD.project_id;
+END;
+
+-- An update is a delete of OLD followed by an insert of NEW
+CREATE TRIGGER IF NOT EXISTS trg_engagement_stats_update
+AFTER UPDATE OF project_id, reaction, weight, created_at ON engagements
+BEGIN
+    UPDATE project_engagement_stats SET
+        total_reactions = total_reactions - 1,
+        likes = likes - COALESCE(OLD.reaction = 'like', 0),
+        insightful = insightful - COALESCE(OLD.reaction = 'insightful', 0),
+        inspiring = inspiring - COALESCE(OLD.reaction = 'inspiring', 0),
+        weight_sum = weight_sum - COALESCE(OLD.weight, 0),
+        last_engaged_at = (SELECT MAX(created_at) FROM engagements WHERE project_id = OLD.project_id)
+    WHERE project_id = OLD.project_id;
+    INSERT INTO project_engagement_stats
+        (project_id, total_reactions, likes, insightful, inspiring, weight_sum, last_engaged_at)
+    SELECT
+        NEW.project_id, 1,
+        COALESCE(NEW.reaction = 'like', 0), COALESCE(NEW.reaction = 'insightful', 0),
+        COALESCE(NEW.reaction = 'inspiring', 0), COALESCE(NEW.weight, 0), NEW.created_at
+    WHERE NEW.project_id IS NOT NULL
+    ON CONFLICT(project_id) DO UPDATE SET
+        total_reactions = total_reactions + 1,
+        likes = likes + excluded.likes,
+        insightful = insightful + excluded.insightful,
+        inspiring = inspiring + excluded.inspiring,
+        weight_sum = weight_sum + excluded.weight_sum,
+        last_engaged_at = (SELECT MAX(created_at) FROM engagements WHERE project_id = NEW.project_id);
+END;
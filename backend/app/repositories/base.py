@@ -60,70 +60,181 @@ class BaseRepository:
                 pass
 # app/repositories/base.py
 
-from app.core.database import get_connection
+import threading
+from contextlib import contextmanager
+from itertools import islice
+from app.api.config import settings
+from app.core.database import pooled_connection, run_in_db
 from app.core.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Connection of the transaction open on the current thread, if any
+_tx = threading.local()
+
+
+@contextmanager
+def _connection():
+    """Yield (connection, autocommit) for a single repository call.
+
+    Inside `BaseRepository.transaction()` the call joins the open
+    transaction and must not commit; otherwise it borrows a pooled
+    connection and commits its own work.
+    """
+    conn = getattr(_tx, "conn", None)
+    if conn is not None:
+        yield conn, False
+        return
+    with pooled_connection() as conn:
+        yield conn, True
+
 
 class BaseRepository:
     """Low-level DB helpers used by all repository classes.
 
     Methods log queries and parameters to make debugging SQL issues easy.
     They re-raise exceptions after logging so calling code can decide how to
-    handle failures.
+    handle failures. Connections are checked out of the shared pool in
+    `app.core.database` instead of being opened per call.
+
+    Wrap multi-statement operations in `transaction()` so every helper
+    call inside the block shares one connection and one commit:
+
+        with BaseRepository.transaction():
+            BaseRepository.execute(...)
+            BaseRepository.fetch_one(...)
     """
 
+    @staticmethod
+    @contextmanager
+    def transaction():
+        """Unit of work: run the enclosed repository calls atomically.
+
+        Commits on normal exit and rolls back if the block raises. Nested
+        `transaction()` blocks run as savepoints of the outermost one: their
+        work commits with it, and a nested block that raises rolls back only
+        its own work. Transactions are per thread.
+        """
+        conn = getattr(_tx, "conn", None)
+        if conn is not None:
+            conn.execute("SAVEPOINT nested_tx")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK TO nested_tx")
+                conn.execute("RELEASE nested_tx")
+                raise
+            conn.execute("RELEASE nested_tx")
+            return
+        with pooled_connection() as conn:
+            _tx.conn = conn
+            try:
+                # take the write lock up front so concurrent writers queue on
+                # busy_timeout instead of failing a read->write lock upgrade
+                conn.execute("BEGIN IMMEDIATE")
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                _tx.conn = None
+
     @staticmethod
     def fetch_one(query, params=()):
         logger.debug("SQL fetch_one: %s | params=%s", query.strip(), params)
         try:
-            conn = get_connection()
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            result = cursor.fetchone()
-            return dict(result) if result else None
+            with _connection() as (conn, _):
+                cursor = conn.cursor()
+                cursor.execute(query, params)
+                result = cursor.fetchone()
+                return dict(result) if result else None
         except Exception:
             logger.exception("fetch_one failed")
             raise
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
 
     @staticmethod
     def fetch_all(query, params=()):
         logger.debug("SQL fetch_all: %s | params=%s", query.strip(), params)
         try:
-            conn = get_connection()
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
+            with _connection() as (conn, _):
+                cursor = conn.cursor()
+                cursor.execute(query, params)
+                rows = cursor.fetchall()
+                return [dict(row) for row in rows]
         except Exception:
             logger.exception("fetch_all failed")
             raise
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
 
     @staticmethod
     def execute(query, params=()):
         logger.debug("SQL execute: %s | params=%s", query.strip(), params)
         try:
-            conn = get_connection()
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            conn.commit()
-            return cursor.lastrowid
+            with _connection() as (conn, autocommit):
+                cursor = conn.cursor()
+                cursor.execute(query, params)
+                if autocommit:
+                    conn.commit()
+                return cursor.lastrowid
         except Exception:
             logger.exception("execute failed")
             raise
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
+
+    @staticmethod
+    def execute_many(query, rows, batch_size=None):
+        """Run `query` once per parameter tuple in `rows` using executemany.
+
+        `rows` may be any iterable (including a generator); it is streamed
+        in chunks of `batch_size` (default `settings.DB_BATCH_SIZE`), each
+        chunk committed as its own transaction so memory and lock hold
+        times stay bounded. Inside `transaction()` all chunks join the open
+        transaction instead. Returns the number of rows affected.
+        """
+        batch_size = batch_size or settings.DB_BATCH_SIZE
+        logger.debug("SQL execute_many: %s | batch_size=%d", query.strip(), batch_size)
+        total = 0
+        iterator = iter(rows)
+        try:
+            while True:
+                chunk = list(islice(iterator, batch_size))
+                if not chunk:
+                    break
+                with _connection() as (conn, autocommit):
+                    cursor = conn.cursor()
+                    cursor.executemany(query, chunk)
+                    if autocommit:
+                        conn.commit()
+                    total += cursor.rowcount
+            return total
+        except Exception:
+            logger.exception("execute_many failed")
+            raise
+
+
+class AsyncRepository:
+    """Awaitable counterparts of the `BaseRepository` helpers.
+
+    Each call runs on the DB executor (`app.core.database.run_in_db`)
+    instead of blocking the event loop. For repository methods that issue
+    several statements, `call` runs the whole method on one executor thread.
+    """
+
+    @staticmethod
+    async def fetch_one(query, params=()):
+        return await run_in_db(BaseRepository.fetch_one, query, params)
+
+    @staticmethod
+    async def fetch_all(query, params=()):
+        return await run_in_db(BaseRepository.fetch_all, query, params)
+
+    @staticmethod
+    async def execute(query, params=()):
+        return await run_in_db(BaseRepository.execute, query, params)
+
+    @staticmethod
+    async def execute_many(query, rows, batch_size=None):
+        return await run_in_db(BaseRepository.execute_many, query, rows, batch_size)
+
+    @staticmethod
+    async def call(func, *args, **kwargs):
+        return await run_in_db(func, *args, **kwargs)
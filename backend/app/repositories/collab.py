@@ -39,8 +39,20 @@ class CollabRepository(BaseRepository):
             (request_id,)
         )
 from datetime import datetime
+from itertools import islice
+from app.api.config import settings
 from app.repositories.base import BaseRepository
-from app.repositories.rewards import RewardRepository
+
+# Max ids bound into a single `IN (...)` clause (SQLite < 3.32 allows 999 variables)
+ID_CHUNK_SIZE = 500
+
+INSERT_MATCH_QUERY = """
+INSERT INTO collab_matches
+(request_id, creator_id, match_score)
+VALUES (?, ?, ?)
+ON CONFLICT(request_id, creator_id) DO UPDATE SET
+    match_score=excluded.match_score
+"""
 
 
 class CollabRepository(BaseRepository):
@@ -65,20 +77,77 @@ class CollabRepository(BaseRepository):
         )
 
     @staticmethod
-    def insert_match(request_id, creator_id, score):
-        query = """
-        INSERT INTO collab_matches
-        (request_id, creator_id, match_score)
-        VALUES (?, ?, ?)
-        ON CONFLICT(request_id, creator_id) DO UPDATE SET
-            match_score=excluded.match_score
+    def replace_matches(request_id, matches):
+        """Make `matches` ([(creator_id, score)]) the only matches of a request.
+
+        Runs in one transaction. Returns the creator_ids that were not
+        already matched to this request; callers award the collaboration
+        bonus to those only, so re-running matching does not award it again.
         """
-        BaseRepository.execute(query, (request_id, creator_id, score))
-        # award collaboration bonus when match is created
-        try:
-            RewardRepository.add_reward(creator_id, "Collaboration Bonus", 5)
-        except Exception:
-            pass
+        return [creator_id for _, creator_id in CollabRepository.replace_matches_bulk([(request_id, matches)])]
+
+    @staticmethod
+    def replace_matches_bulk(results, batch_size=None):
+        """`replace_matches` for many requests; `results` yields (request_id, matches).
+
+        Requests are written in chunks of `batch_size`, one transaction per
+        chunk. Returns the newly matched (request_id, creator_id) pairs.
+        """
+        batch_size = batch_size or settings.DB_BATCH_SIZE
+        iterator = iter(results)
+        new_matches = []
+        while True:
+            chunk = list(islice(iterator, batch_size))
+            if not chunk:
+                break
+            with BaseRepository.transaction():
+                previous = {}
+                request_ids = [request_id for request_id, _ in chunk]
+                for start in range(0, len(request_ids), ID_CHUNK_SIZE):
+                    ids = request_ids[start:start + ID_CHUNK_SIZE]
+                    for row in BaseRepository.fetch_all(
+                        "SELECT request_id, creator_id FROM collab_matches WHERE request_id IN ({})".format(
+                            ",".join("?" * len(ids))
+                        ),
+                        tuple(ids),
+                    ):
+                        previous.setdefault(row["request_id"], set()).add(row["creator_id"])
+                BaseRepository.execute_many(
+                    "DELETE FROM collab_matches WHERE request_id = ?",
+                    ((request_id,) for request_id, _ in chunk),
+                )
+                BaseRepository.execute_many(
+                    INSERT_MATCH_QUERY,
+                    (
+                        (request_id, creator_id, score)
+                        for request_id, matches in chunk
+                        for creator_id, score in matches
+                    ),
+                )
+                new_matches.extend(
+                    (request_id, creator_id)
+                    for request_id, matches in chunk
+                    for creator_id, _ in matches
+                    if creator_id not in previous.get(request_id, ())
+                )
+        return new_matches
+
+    @staticmethod
+    def get_match_scores(request_id):
+        """Return the stored [(creator_id, score)] of a request, best first."""
+        rows = BaseRepository.fetch_all(
+            "SELECT creator_id, match_score FROM collab_matches WHERE request_id = ? "
+            "ORDER BY match_score DESC, creator_id",
+            (request_id,)
+        )
+        return [(r["creator_id"], r["match_score"]) for r in rows]
+
+    @staticmethod
+    def get_open_requests():
+        return BaseRepository.fetch_all(
+            "SELECT request_id, skills_needed, location_pref FROM collab_requests "
+            "WHERE status = 'open' ORDER BY request_id"
+        )
 
     @staticmethod
     def get_request(request_id):
@@ -88,8 +157,8 @@ class CollabRepository(BaseRepository):
         )
     
     @staticmethod
-    def get_matches_for_request(request_id):
-        """Get all matches for a collaboration request with creator details"""
+    def get_matches_for_request(request_id, limit=None):
+        """Get the matches for a collaboration request with creator details, best first"""
         query = """
         SELECT 
             m.creator_id,
@@ -102,20 +171,21 @@ class CollabRepository(BaseRepository):
         JOIN creator_profiles c ON m.creator_id = c.creator_id
         JOIN users u ON c.creator_id = u.user_id
         WHERE m.request_id = ?
-        ORDER BY m.match_score DESC
+        ORDER BY m.match_score DESC, m.creator_id
+        LIMIT ?
         """
-        rows = BaseRepository.fetch_all(query, (request_id,))
+        rows = BaseRepository.fetch_all(query, (request_id, -1 if limit is None else limit))
         
         # Convert to format expected by API
         matches = []
         for row in rows:
             matches.append({
-                "creator_id": row[0],
-                "creator_name": row[1],
-                "match_score": row[2],
-                "explanation": f"Match score: {row[2]:.2f}",
-                "skills": row[3].split(",") if row[3] else [],
-                "location": row[4],
-                "availability": row[5]
+                "creator_id": row["creator_id"],
+                "creator_name": row["name"],
+                "match_score": row["match_score"],
+                "explanation": f"Match score: {row['match_score']:.2f}",
+                "skills": row["skills"].split(",") if row["skills"] else [],
+                "location": row["location"],
+                "availability": row["availability"]
             })
         return matches
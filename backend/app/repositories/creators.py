@@ -36,10 +36,29 @@ class CreatorRepository(BaseRepository):
         )
 # app/repositories/creators.py
 
+from app.core.logger import get_logger
 from app.repositories.base import BaseRepository
 
+logger = get_logger(__name__)
+
 
 class CreatorRepository(BaseRepository):
+    # callbacks(creator_id) run after a profile is created, updated or deleted
+    _change_listeners = []
+
+    @staticmethod
+    def add_change_listener(callback):
+        """Register `callback(creator_id)` to be called when a profile changes."""
+        if callback not in CreatorRepository._change_listeners:
+            CreatorRepository._change_listeners.append(callback)
+
+    @staticmethod
+    def _notify_change(creator_id):
+        for callback in list(CreatorRepository._change_listeners):
+            try:
+                callback(creator_id)
+            except Exception:
+                logger.exception("Creator change listener failed for creator_id=%s", creator_id)
 
     @staticmethod
     def create_creator_profile(user_id, role, skills, availability, location, bio):
@@ -48,10 +67,12 @@ class CreatorRepository(BaseRepository):
         (creator_id, role, skills, availability, location, bio)
         VALUES (?, ?, ?, ?, ?, ?)
         """
-        return BaseRepository.execute(
+        rowid = BaseRepository.execute(
             query,
             (user_id, role, skills, availability, location, bio)
         )
+        CreatorRepository._notify_change(user_id)
+        return rowid
 
     @staticmethod
     def get_creator(creator_id):
@@ -73,6 +94,15 @@ class CreatorRepository(BaseRepository):
             "DELETE FROM creator_profiles WHERE creator_id = ?",
             (creator_id,)
         )
+        CreatorRepository._notify_change(creator_id)
+
+    @staticmethod
+    def get_profile_version():
+        """Return (token, version); the version changes whenever a profile's
+        skills, location or availability is written, or a profile is
+        created or deleted."""
+        row = BaseRepository.fetch_one("SELECT token, version FROM creator_profile_state WHERE id = 1")
+        return (row["token"], row["version"]) if row else None
 
     @staticmethod
     def get_all_creators():
@@ -113,6 +143,7 @@ class CreatorRepository(BaseRepository):
         
         query = f"UPDATE creator_profiles SET {', '.join(updates)} WHERE creator_id = ?"
         BaseRepository.execute(query, tuple(params))
+        CreatorRepository._notify_change(creator_id)
     
     @staticmethod
     def count_creators(skill_filter=None):
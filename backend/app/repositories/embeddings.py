@@ -1,18 +1,57 @@
 import json
+import struct
+from collections import Counter
+
+import numpy as np
 from app.repositories.base import BaseRepository
 
 
+UPSERT_EMBEDDING_QUERY = """
+INSERT INTO project_embeddings (project_id, embedding)
+VALUES (?, ?)
+ON CONFLICT(project_id) DO UPDATE SET
+    embedding=excluded.embedding
+"""
+
+# Binary layout: 8-byte header (magic, format version, dim) followed by
+# `dim` little-endian float32 values. The header keeps the payload 4-byte
+# aligned so it can be viewed with `np.frombuffer` without copying.
+EMBEDDING_MAGIC = b"FE"
+EMBEDDING_FORMAT_VERSION = 1
+EMBEDDING_HEADER = struct.Struct("<2sHI")
+EMBEDDING_DTYPE = np.dtype("<f4")
+
+
+def encode_embedding(vector):
+    """Serialize a vector to the binary float32 BLOB format."""
+    values = np.asarray(vector, dtype=EMBEDDING_DTYPE).ravel()
+    return EMBEDDING_HEADER.pack(EMBEDDING_MAGIC, EMBEDDING_FORMAT_VERSION, values.size) + values.tobytes()
+
+
+def decode_embedding(value):
+    """Return a float32 array for a stored embedding (binary or legacy JSON text)."""
+    if value is None:
+        return np.empty(0, dtype=EMBEDDING_DTYPE)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        magic, version, dim = EMBEDDING_HEADER.unpack_from(value)
+        if magic != EMBEDDING_MAGIC or version != EMBEDDING_FORMAT_VERSION:
+            raise ValueError("unsupported embedding format: magic={!r} version={}".format(magic, version))
+        return np.frombuffer(value, dtype=EMBEDDING_DTYPE, count=dim, offset=EMBEDDING_HEADER.size)
+    return np.asarray(json.loads(value), dtype=EMBEDDING_DTYPE)
+
+
 class EmbeddingRepository(BaseRepository):
     @staticmethod
     def upsert_embedding(project_id, embedding):
-        BaseRepository.execute(
-            """
-            INSERT INTO project_embeddings (project_id, embedding)
-            VALUES (?, ?)
-            ON CONFLICT(project_id) DO UPDATE SET
-                embedding=excluded.embedding
-            """,
-            (project_id, json.dumps(embedding))
+        BaseRepository.execute(UPSERT_EMBEDDING_QUERY, (project_id, encode_embedding(embedding)))
+
+    @staticmethod
+    def upsert_embeddings(rows, batch_size=None):
+        """Bulk variant of `upsert_embedding`; `rows` yields (project_id, embedding)."""
+        return BaseRepository.execute_many(
+            UPSERT_EMBEDDING_QUERY,
+            ((project_id, encode_embedding(embedding)) for project_id, embedding in rows),
+            batch_size=batch_size,
         )
 
     @staticmethod
@@ -20,7 +59,80 @@ class EmbeddingRepository(BaseRepository):
         rows = BaseRepository.fetch_all("SELECT * FROM project_embeddings")
         for r in rows:
             try:
-                r["embedding"] = json.loads(r["embedding"])
+                r["embedding"] = decode_embedding(r["embedding"]).tolist()
             except Exception:
                 r["embedding"] = []
         return rows
+
+    @staticmethod
+    def get_embedding_matrix():
+        """Return (project_ids, matrix) with one contiguous float32 row per project.
+
+        Binary payloads are concatenated and viewed with `np.frombuffer`, so
+        no per-value parsing happens. Rows whose dimension differs from the
+        most common one, and unreadable rows, are skipped.
+        """
+        rows = BaseRepository.fetch_all(
+            "SELECT project_id, embedding FROM project_embeddings ORDER BY project_id"
+        )
+        decoded = []
+        for r in rows:
+            try:
+                vector = decode_embedding(r["embedding"])
+            except Exception:
+                continue
+            if vector.size:
+                decoded.append((r["project_id"], vector))
+        if not decoded:
+            return np.empty(0, dtype=np.int64), np.empty((0, 0), dtype=EMBEDDING_DTYPE)
+
+        dim = Counter(v.size for _, v in decoded).most_common(1)[0][0]
+        kept = [(pid, v) for pid, v in decoded if v.size == dim]
+        ids = np.fromiter((pid for pid, _ in kept), dtype=np.int64, count=len(kept))
+        buffer = b"".join(v.data for _, v in kept)
+        return ids, np.frombuffer(buffer, dtype=EMBEDDING_DTYPE).reshape(len(kept), dim)
+
+    @staticmethod
+    def get_dimension():
+        """Return the dimension of one stored binary embedding, or None if there are none.
+
+        Read from the BLOB length alone; nothing is decoded.
+        """
+        row = BaseRepository.fetch_one(
+            "SELECT length(embedding) AS n FROM project_embeddings WHERE typeof(embedding) = 'blob' LIMIT 1"
+        )
+        if not row or not row["n"]:
+            return None
+        return (row["n"] - EMBEDDING_HEADER.size) // EMBEDDING_DTYPE.itemsize
+
+    @staticmethod
+    def get_version():
+        """Return a stamp that changes whenever any embedding is written."""
+        row = BaseRepository.fetch_one("SELECT token, version FROM embedding_state WHERE id = 1")
+        return "{}-{}".format(row["token"], row["version"]) if row else None
+
+    @staticmethod
+    def migrate_to_binary(batch_size=None):
+        """Rewrite legacy JSON-text embeddings in the binary format.
+
+        Idempotent: only rows still stored as TEXT are touched. Returns the
+        number of rows converted.
+        """
+        rows = BaseRepository.fetch_all(
+            "SELECT project_id, embedding FROM project_embeddings WHERE typeof(embedding) = 'text'"
+        )
+
+        def converted():
+            for r in rows:
+                try:
+                    vector = json.loads(r["embedding"])
+                except (TypeError, ValueError):
+                    continue
+                yield encode_embedding(vector), r["project_id"]
+
+        with BaseRepository.transaction():
+            return BaseRepository.execute_many(
+                "UPDATE project_embeddings SET embedding = ? WHERE project_id = ?",
+                converted(),
+                batch_size=batch_size,
+            )
@@ -39,8 +39,23 @@ class EngagementRepository(BaseRepository):
 
 from datetime import datetime
 from app.repositories.base import BaseRepository
-from app.repositories.projects import ProjectRepository
-from app.repositories.rewards import RewardRepository
+
+
+# Ground-truth per-project aggregates; column order matches
+# `project_engagement_stats`
+ENGAGEMENT_STATS_AGGREGATE = """
+SELECT
+    project_id,
+    COUNT(*) AS total_reactions,
+    COALESCE(SUM(reaction = 'like'), 0) AS likes,
+    COALESCE(SUM(reaction = 'insightful'), 0) AS insightful,
+    COALESCE(SUM(reaction = 'inspiring'), 0) AS inspiring,
+    COALESCE(SUM(weight), 0) AS weight_sum,
+    MAX(created_at) AS last_engaged_at
+FROM engagements
+WHERE project_id IS NOT NULL
+GROUP BY project_id
+"""
 
 
 class EngagementRepository(BaseRepository):
@@ -52,23 +67,13 @@ class EngagementRepository(BaseRepository):
         (project_id, user_id, reaction, weight, created_at)
         VALUES (?, ?, ?, ?, ?)
         """
-        rowid = BaseRepository.execute(
+        # the creator's engagement bonus is queued by
+        # GamificationService.record_engagement
+        return BaseRepository.execute(
             query,
             (project_id, user_id, reaction, weight, datetime.utcnow().isoformat())
         )
 
-        # reward creator for engagement if reaction is like/comment
-        try:
-            if reaction and reaction.lower() in ("like", "comment"):
-                proj = ProjectRepository.get_project(project_id)
-                if proj:
-                    RewardRepository.add_reward(proj.get("creator_id"), "Engagement Bonus", 1)
-        except Exception:
-            # don't fail engagement on reward errors
-            pass
-
-        return rowid
-
     @staticmethod
     def get_project_engagements(project_id):
         return BaseRepository.fetch_all(
@@ -85,34 +90,73 @@ class EngagementRepository(BaseRepository):
 
     @staticmethod
     def get_project_stats(project_id):
-        """Get aggregated engagement statistics for a project"""
+        """Get aggregated engagement statistics for a project.
+
+        Reads the trigger-maintained `project_engagement_stats` row and the
+        project's impressions in one indexed lookup. Returns None when the
+        project does not exist.
+        """
         query = """
-        SELECT 
-            COUNT(*) as total_reactions,
-            SUM(CASE WHEN reaction = 'like' THEN 1 ELSE 0 END) as likes,
-            SUM(CASE WHEN reaction = 'insightful' THEN 1 ELSE 0 END) as insightful,
-            SUM(CASE WHEN reaction = 'inspiring' THEN 1 ELSE 0 END) as inspiring
-        FROM engagements
-        WHERE project_id = ?
+        SELECT
+            p.impressions,
+            COALESCE(s.total_reactions, 0) AS total_reactions,
+            COALESCE(s.likes, 0) AS likes,
+            COALESCE(s.insightful, 0) AS insightful,
+            COALESCE(s.inspiring, 0) AS inspiring
+        FROM projects p
+        LEFT JOIN project_engagement_stats s ON s.project_id = p.project_id
+        WHERE p.project_id = ?
         """
         row = BaseRepository.fetch_one(query, (project_id,))
-        
-        # Get impressions from projects table
-        project = ProjectRepository.get_project(project_id)
-        impressions = project.get("impressions", 0) if project else 0
-        
-        if row:
-            total_reactions = row[0] or 0
-            engagement_score = total_reactions / max(impressions, 1) if impressions > 0 else 0.0
-            
-            return {
-                "project_id": project_id,
-                "total_reactions": total_reactions,
-                "likes": row[1] or 0,
-                "insightful": row[2] or 0,
-                "inspiring": row[3] or 0,
-                "impressions": impressions,
-                "engagement_score": engagement_score
-            }
-        
-        return None
+        if not row:
+            return None
+
+        impressions = row["impressions"] or 0
+        total_reactions = row["total_reactions"]
+        engagement_score = total_reactions / max(impressions, 1) if impressions > 0 else 0.0
+
+        return {
+            "project_id": project_id,
+            "total_reactions": total_reactions,
+            "likes": row["likes"],
+            "insightful": row["insightful"],
+            "inspiring": row["inspiring"],
+            "impressions": impressions,
+            "engagement_score": engagement_score
+        }
+
+    @staticmethod
+    def rebuild_project_stats():
+        """Recompute `project_engagement_stats` from `engagements`; returns rows written."""
+        with BaseRepository.transaction():
+            BaseRepository.execute("DELETE FROM project_engagement_stats")
+            BaseRepository.execute(
+                "INSERT INTO project_engagement_stats "
+                "(project_id, total_reactions, likes, insightful, inspiring, weight_sum, last_engaged_at) "
+                + ENGAGEMENT_STATS_AGGREGATE
+            )
+            row = BaseRepository.fetch_one("SELECT COUNT(*) AS n FROM project_engagement_stats")
+        return row["n"]
+
+    @staticmethod
+    def verify_project_stats(tolerance=1e-6):
+        """Return the project ids whose stored aggregates drifted from `engagements`."""
+        query = """
+        SELECT a.project_id
+        FROM ({aggregate}) a
+        LEFT JOIN project_engagement_stats s ON s.project_id = a.project_id
+        WHERE s.project_id IS NULL
+           OR s.total_reactions != a.total_reactions
+           OR s.likes != a.likes
+           OR s.insightful != a.insightful
+           OR s.inspiring != a.inspiring
+           OR ABS(s.weight_sum - a.weight_sum) > ?
+           OR s.last_engaged_at IS NOT a.last_engaged_at
+        UNION
+        SELECT s.project_id
+        FROM project_engagement_stats s
+        WHERE (s.total_reactions != 0 OR ABS(s.weight_sum) > ? OR s.last_engaged_at IS NOT NULL)
+          AND NOT EXISTS (SELECT 1 FROM engagements e WHERE e.project_id = s.project_id)
+        ORDER BY 1
+        """.format(aggregate=ENGAGEMENT_STATS_AGGREGATE)
+        return [r["project_id"] for r in BaseRepository.fetch_all(query, (tolerance, tolerance))]
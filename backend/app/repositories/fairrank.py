@@ -2,25 +2,186 @@ from datetime import datetime
 from app.repositories.base import BaseRepository
 
 
+# Max ids bound into a single `IN (...)` clause
+ID_CHUNK_SIZE = 500
+
+UPSERT_SCORE_QUERY = """
+INSERT INTO fair_rank_scores
+(project_id, engagement_score, freshness_boost, diversity_boost, underexposed_boost, final_score, computed_at)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(project_id) DO UPDATE SET
+    engagement_score=excluded.engagement_score,
+    freshness_boost=excluded.freshness_boost,
+    diversity_boost=excluded.diversity_boost,
+    underexposed_boost=excluded.underexposed_boost,
+    final_score=excluded.final_score,
+    computed_at=excluded.computed_at
+"""
+
+
 class FairRankRepository(BaseRepository):
 
     @staticmethod
     def upsert_score(project_id, engagement, freshness, diversity, underexposed, final):
+        BaseRepository.execute(
+            UPSERT_SCORE_QUERY,
+            (project_id, engagement, freshness, diversity, underexposed, final, datetime.utcnow().isoformat())
+        )
+        FairRankRepository.touch_scores()
+
+    @staticmethod
+    def upsert_scores(rows, batch_size=None, computed_at=None):
+        """Upsert many scores through executemany in chunked transactions.
+
+        `rows` is an iterable of
+        (project_id, engagement, freshness, diversity, underexposed, final)
+        tuples, the same shape `upsert_score` takes as arguments.
+        `computed_at` (ISO string) defaults to now; engines pass the time
+        the scores' ages were measured at.
+        """
+        computed_at = computed_at or datetime.utcnow().isoformat()
+        written = BaseRepository.execute_many(
+            UPSERT_SCORE_QUERY,
+            (tuple(row) + (computed_at,) for row in rows),
+            batch_size=batch_size,
+        )
+        FairRankRepository.touch_scores()
+        return written
+
+    @staticmethod
+    def touch_scores():
+        """Record that `fair_rank_scores` changed (see `get_scores_version`)."""
+        BaseRepository.execute(
+            """
+            INSERT INTO fair_rank_state (id, scores_updated_at) VALUES (1, ?)
+            ON CONFLICT(id) DO UPDATE SET scores_updated_at=excluded.scores_updated_at
+            """,
+            (datetime.utcnow().isoformat(),)
+        )
+
+    @staticmethod
+    def get_scores_version():
+        """Return a stamp that changes whenever a run writes scores (None before any)."""
+        row = BaseRepository.fetch_one("SELECT scores_updated_at FROM fair_rank_state WHERE id = 1")
+        return row["scores_updated_at"] if row else None
+
+    @staticmethod
+    def get_ranking_inputs(now, project_ids=None):
+        """Return per-project FairRank inputs in one pass over `projects`.
+
+        Each row has project_id, creator_id, impressions, the summed
+        engagement weight and `age_days` (fractional days between
+        `created_at` and `now`, NULL when `created_at` is missing).
+        Engagement sums come from `project_engagement_stats`, so no
+        engagement rows are scanned. Pass `project_ids` to restrict the
+        pass to a subset of projects.
+        """
         query = """
-        INSERT INTO fair_rank_scores
-        (project_id, engagement_score, freshness_boost, diversity_boost, underexposed_boost, final_score, computed_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-        ON CONFLICT(project_id) DO UPDATE SET
-            engagement_score=excluded.engagement_score,
-            freshness_boost=excluded.freshness_boost,
-            diversity_boost=excluded.diversity_boost,
-            underexposed_boost=excluded.underexposed_boost,
-            final_score=excluded.final_score,
-            computed_at=excluded.computed_at
+        SELECT
+            p.project_id,
+            p.creator_id,
+            COALESCE(p.impressions, 0) AS impressions,
+            COALESCE(s.weight_sum, 0) AS engagement_sum,
+            julianday(?) - julianday(p.created_at) AS age_days
+        FROM projects p
+        LEFT JOIN project_engagement_stats s ON s.project_id = p.project_id
+        {where}
+        ORDER BY p.project_id
         """
+        if project_ids is None:
+            return BaseRepository.fetch_all(query.format(where=""), (now.isoformat(),))
+
+        # chunk the IN list to stay below SQLite's bound-variable limit
+        ids = list(project_ids)
+        rows = []
+        for start in range(0, len(ids), ID_CHUNK_SIZE):
+            chunk = ids[start:start + ID_CHUNK_SIZE]
+            where = "WHERE p.project_id IN ({})".format(", ".join("?" * len(chunk)))
+            rows.extend(BaseRepository.fetch_all(query.format(where=where), (now.isoformat(), *chunk)))
+        return rows
+
+    @staticmethod
+    def get_input_bounds():
+        """Return the global min/max of engagement sums and impressions."""
+        query = """
+        SELECT
+            MIN(engagement_sum) AS engagement_min,
+            MAX(engagement_sum) AS engagement_max,
+            MIN(impressions) AS impressions_min,
+            MAX(impressions) AS impressions_max
+        FROM (
+            SELECT
+                COALESCE(p.impressions, 0) AS impressions,
+                COALESCE(s.weight_sum, 0) AS engagement_sum
+            FROM projects p
+            LEFT JOIN project_engagement_stats s ON s.project_id = p.project_id
+        )
+        """
+        return BaseRepository.fetch_one(query)
+
+    @staticmethod
+    def get_freshness_stale(now):
+        """Return ids of scored projects whose whole-day age changed since their score was computed.
+
+        Freshness is `1 / (floor(age_days) + 1)`, so exactly these projects
+        have a stale freshness boost at `now`.
+        """
+        rows = BaseRepository.fetch_all(
+            """
+            SELECT s.project_id
+            FROM fair_rank_scores s
+            JOIN projects p ON p.project_id = s.project_id
+            WHERE p.created_at IS NOT NULL AND s.computed_at IS NOT NULL
+              AND MAX(0, CAST(julianday(?) - julianday(p.created_at) AS INTEGER))
+                  != MAX(0, CAST(julianday(s.computed_at) - julianday(p.created_at) AS INTEGER))
+            """,
+            (now.isoformat(),)
+        )
+        return [r["project_id"] for r in rows]
+
+    @staticmethod
+    def get_state():
+        """Return the normalization bounds recorded by the last full run."""
+        return BaseRepository.fetch_one("SELECT * FROM fair_rank_state WHERE id = 1")
+
+    @staticmethod
+    def save_state(bounds, computed_at):
         BaseRepository.execute(
-            query,
-            (project_id, engagement, freshness, diversity, underexposed, final, datetime.utcnow().isoformat())
+            """
+            INSERT INTO fair_rank_state
+            (id, engagement_min, engagement_max, impressions_min, impressions_max, computed_at)
+            VALUES (1, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                engagement_min=excluded.engagement_min,
+                engagement_max=excluded.engagement_max,
+                impressions_min=excluded.impressions_min,
+                impressions_max=excluded.impressions_max,
+                computed_at=excluded.computed_at
+            """,
+            (
+                bounds["engagement_min"],
+                bounds["engagement_max"],
+                bounds["impressions_min"],
+                bounds["impressions_max"],
+                computed_at,
+            )
+        )
+
+    @staticmethod
+    def get_pending_changes():
+        """Return change-log rows (project_id, changed_at) written by the schema triggers."""
+        return BaseRepository.fetch_all("SELECT project_id, changed_at FROM fair_rank_changes")
+
+    @staticmethod
+    def clear_changes(changes):
+        """Drop processed change-log rows.
+
+        Matching on `changed_at` keeps rows that were touched again while
+        the engine was running so the next run picks them up.
+        """
+        return BaseRepository.execute_many(
+            "DELETE FROM fair_rank_changes WHERE project_id = ? AND changed_at = ?",
+            ((c["project_id"], c["changed_at"]) for c in changes)
         )
 
     @staticmethod
@@ -30,8 +191,17 @@ class FairRankRepository(BaseRepository):
         )
     
     @staticmethod
-    def get_ranked_feed(limit=20, offset=0):
-        """Get projects ranked by FairRank with project details for API feed"""
+    def get_ranked_feed(limit=20, offset=0, after=None):
+        """Get projects ranked by FairRank with project details for API feed.
+
+        Ordered by `(final_score DESC, project_id DESC)`. Pages with
+        `LIMIT/OFFSET`, or - when `after` is the `(final_score, project_id)`
+        of the last row already served - with a keyset seek on
+        `idx_fairrank_score_project`, which stays O(limit) at any depth.
+        `limit=None` returns the whole ranking.
+        """
+        if limit is None:
+            limit = -1  # SQLite: no limit
         query = """
         SELECT 
             p.project_id,
@@ -45,49 +215,52 @@ class FairRankRepository(BaseRepository):
             f.engagement_score,
             f.freshness_boost,
             f.underexposed_boost
-        FROM projects p
-        JOIN fair_rank_scores f ON p.project_id = f.project_id
-        ORDER BY f.final_score DESC
+        FROM fair_rank_scores f
+        JOIN projects p ON p.project_id = f.project_id
+        {where}
+        ORDER BY f.final_score DESC, f.project_id DESC
+        LIMIT ? OFFSET ?
         """
-        
+        if after is not None:
+            query = query.format(where="WHERE (f.final_score, f.project_id) < (?, ?)")
+            params = (after[0], after[1], limit, 0)
+        else:
+            query = query.format(where="")
+            params = (limit, offset)
+
         try:
-            rows = BaseRepository.fetch_all(query)
+            rows = BaseRepository.fetch_all(query, params)
         except Exception as e:
             print(f"Error fetching ranked feed: {e}")
             return []
         
         # Convert to format expected by API
-        results = []
-        for row in rows:
-            try:
-                results.append({
-                    "project": {
-                        "id": row[0],
-                        "title": row[1],
-                        "abstract": row[2],
-                        "creator_id": row[3],
-                        "stage": row[4],
-                        "created_at": row[5],
-                        "impressions": row[6]
-                    },
-                    "fairrank": {
-                        "score": row[7],
-                        "engagement_score": row[8],
-                        "freshness_score": row[9],
-                        "underexposed_boost": row[10]
-                    }
-                })
-            except Exception as e:
-                print(f"Error processing row: {e}, row: {row}")
-                continue
-        
-        return results
+        return [
+            {
+                "project": {
+                    "id": row["project_id"],
+                    "title": row["title"],
+                    "abstract": row["abstract"],
+                    "creator_id": row["creator_id"],
+                    "stage": row["stage"],
+                    "created_at": row["created_at"],
+                    "impressions": row["impressions"]
+                },
+                "fairrank": {
+                    "score": row["final_score"],
+                    "engagement_score": row["engagement_score"],
+                    "freshness_score": row["freshness_boost"],
+                    "underexposed_boost": row["underexposed_boost"]
+                }
+            }
+            for row in rows
+        ]
     
     @staticmethod
     def count_ranked_projects():
         """Count total projects with FairRank scores"""
         try:
-            result = BaseRepository.fetch_one("SELECT COUNT(*) FROM fair_rank_scores")
-            return result[0] if result else 0
-        except:
+            result = BaseRepository.fetch_one("SELECT COUNT(*) AS total FROM fair_rank_scores")
+            return result["total"] if result else 0
+        except Exception:
             return 0
\ No newline at end of file
@@ -1,3 +1,4 @@
+import json
 from datetime import datetime
 from app.repositories.base import BaseRepository
 
@@ -21,40 +22,119 @@ class PlatformStatsRepository(BaseRepository):
             (total_creators, total_projects, underexposed_count, avg_fairrank, exposure_gini, datetime.utcnow().isoformat())
         )
     
+    @staticmethod
+    def save_snapshot(stats):
+        """Materialize a full `/api/admin/stats` snapshot into the platform_stats row.
+
+        The `exposure_gini` column keeps its original meaning (engagement
+        Gini); the impression Gini goes to `impression_gini`.
+        """
+        BaseRepository.execute(
+            """
+            INSERT INTO platform_stats (id, total_creators, total_projects, total_engagements, underexposed_count,
+                                        avg_fairrank, exposure_gini, impression_gini, impression_gini_error,
+                                        exposure_distribution, updated_at)
+            VALUES (1, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                total_creators=excluded.total_creators,
+                total_projects=excluded.total_projects,
+                total_engagements=excluded.total_engagements,
+                underexposed_count=excluded.underexposed_count,
+                avg_fairrank=excluded.avg_fairrank,
+                exposure_gini=excluded.exposure_gini,
+                impression_gini=excluded.impression_gini,
+                impression_gini_error=excluded.impression_gini_error,
+                exposure_distribution=excluded.exposure_distribution,
+                updated_at=excluded.updated_at
+            """,
+            (
+                stats["total_creators"],
+                stats["total_projects"],
+                stats["total_engagements"],
+                stats["underexposed_projects"],
+                stats["avg_fairrank"],
+                stats["engagement_gini"],  # -> exposure_gini
+                stats["exposure_gini"],  # -> impression_gini
+                stats["exposure_gini_error"],  # -> impression_gini_error
+                json.dumps(stats["exposure_distribution"]),
+                stats["updated_at"],
+            )
+        )
+
+    @staticmethod
+    def get_snapshot():
+        """Return the last materialized snapshot, or None if none was saved."""
+        row = BaseRepository.fetch_one("SELECT * FROM platform_stats WHERE id = 1")
+        if not row or row["exposure_distribution"] is None:
+            return None
+        return {
+            "total_projects": row["total_projects"],
+            "total_creators": row["total_creators"],
+            "total_engagements": row["total_engagements"],
+            "underexposed_projects": row["underexposed_count"],
+            "avg_fairrank": row["avg_fairrank"],
+            "exposure_distribution": json.loads(row["exposure_distribution"]),
+            # API names differ from the columns on purpose; see init_db.ADDED_COLUMNS
+            "exposure_gini": row["impression_gini"],
+            "exposure_gini_error": row["impression_gini_error"],
+            "engagement_gini": row["exposure_gini"],
+            "updated_at": row["updated_at"],
+        }
+
+    @staticmethod
+    def get_totals():
+        """Creator and engagement counts, the average FairRank and the last
+        engagement Gini written by FairRank, in one query."""
+        result = BaseRepository.fetch_one(
+            """
+            SELECT
+                (SELECT COUNT(*) FROM creator_profiles) AS total_creators,
+                (SELECT COUNT(*) FROM engagements) AS total_engagements,
+                (SELECT AVG(final_score) FROM fair_rank_scores) AS avg_fairrank,
+                (SELECT exposure_gini FROM platform_stats WHERE id = 1) AS engagement_gini
+            """
+        )
+        return {
+            "total_creators": result["total_creators"] if result else 0,
+            "total_engagements": result["total_engagements"] if result else 0,
+            "avg_fairrank": float(result["avg_fairrank"]) if result and result["avg_fairrank"] is not None else 0.0,
+            "engagement_gini": result["engagement_gini"] if result else None,
+        }
+
     @staticmethod
     def count_projects():
         """Count total projects"""
-        result = BaseRepository.fetch_one("SELECT COUNT(*) FROM projects")
-        return result[0] if result else 0
+        result = BaseRepository.fetch_one("SELECT COUNT(*) AS total FROM projects")
+        return result["total"] if result else 0
     
     @staticmethod
     def count_creators():
         """Count total creators"""
-        result = BaseRepository.fetch_one("SELECT COUNT(*) FROM creator_profiles")
-        return result[0] if result else 0
+        result = BaseRepository.fetch_one("SELECT COUNT(*) AS total FROM creator_profiles")
+        return result["total"] if result else 0
     
     @staticmethod
     def count_engagements():
         """Count total engagements"""
-        result = BaseRepository.fetch_one("SELECT COUNT(*) FROM engagements")
-        return result[0] if result else 0
+        result = BaseRepository.fetch_one("SELECT COUNT(*) AS total FROM engagements")
+        return result["total"] if result else 0
     
     @staticmethod
     def count_underexposed_projects(threshold=100):
         """Count projects with impressions below threshold"""
         result = BaseRepository.fetch_one(
-            "SELECT COUNT(*) FROM projects WHERE impressions < ?",
+            "SELECT COUNT(*) AS total FROM projects WHERE impressions < ?",
             (threshold,)
         )
-        return result[0] if result else 0
+        return result["total"] if result else 0
     
     @staticmethod
     def get_avg_fairrank():
         """Get average FairRank score - handles empty table"""
-        result = BaseRepository.fetch_one("SELECT AVG(final_score) FROM fair_rank_scores")
+        result = BaseRepository.fetch_one("SELECT AVG(final_score) AS average FROM fair_rank_scores")
         # Handle NULL when table is empty
-        if result and result[0] is not None:
-            return float(result[0])
+        if result and result["average"] is not None:
+            return float(result["average"])
         return 0.0
     
     @staticmethod
@@ -81,6 +161,6 @@ class PlatformStatsRepository(BaseRepository):
         
         distribution = {}
         for row in rows:
-            distribution[row[0]] = row[1]
+            distribution[row["bucket"]] = row["count"]
         
         return distribution
\ No newline at end of file
@@ -1,8 +1,29 @@
 from datetime import datetime
+from app.core.logger import get_logger
 from app.repositories.base import BaseRepository
 
+logger = get_logger(__name__)
+
 
 class ProjectRepository(BaseRepository):
+    # callbacks(event, payload) run after project rows change:
+    # ("created", project_id), ("impressions", {project_id: n}),
+    # ("impressions_set", (project_id, impressions))
+    _change_listeners = []
+
+    @staticmethod
+    def add_change_listener(callback):
+        """Register `callback(event, payload)` to be called when projects change."""
+        if callback not in ProjectRepository._change_listeners:
+            ProjectRepository._change_listeners.append(callback)
+
+    @staticmethod
+    def _notify_change(event, payload):
+        for callback in list(ProjectRepository._change_listeners):
+            try:
+                callback(event, payload)
+            except Exception:
+                logger.exception("Project change listener failed for %s", event)
 
     @staticmethod
     def create_project(creator_id, title, abstract, stage):
@@ -11,10 +32,12 @@ class ProjectRepository(BaseRepository):
         (creator_id, title, abstract, stage, created_at)
         VALUES (?, ?, ?, ?, ?)
         """
-        return BaseRepository.execute(
+        project_id = BaseRepository.execute(
             query,
             (creator_id, title, abstract, stage, datetime.utcnow().isoformat())
         )
+        ProjectRepository._notify_change("created", project_id)
+        return project_id
 
     @staticmethod
     def get_project(project_id):
@@ -23,6 +46,19 @@ class ProjectRepository(BaseRepository):
             (project_id,)
         )
 
+    @staticmethod
+    def get_projects_by_ids(project_ids):
+        """Return {project_id: row} for the given ids in one query."""
+        ids = list(project_ids)
+        if not ids:
+            return {}
+        placeholders = ", ".join("?" * len(ids))
+        rows = BaseRepository.fetch_all(
+            f"SELECT * FROM projects WHERE project_id IN ({placeholders})",
+            tuple(ids)
+        )
+        return {row["project_id"]: row for row in rows}
+
     @staticmethod
     def get_all_projects(limit=None, offset=0, stage_filter=None):
         """Get all projects with optional pagination and stage filter"""
@@ -51,6 +87,23 @@ class ProjectRepository(BaseRepository):
             "UPDATE projects SET impressions = ? WHERE project_id = ?",
             (impressions, project_id)
         )
+        ProjectRepository._notify_change("impressions_set", (project_id, impressions))
+
+    @staticmethod
+    def increment_impressions(counts, batch_size=None):
+        """Add `counts` ({project_id: n}) to `impressions` in one transaction.
+
+        All-or-nothing, so a failed flush can be retried without double
+        counting. Returns the number of project rows updated.
+        """
+        with BaseRepository.transaction():
+            updated = BaseRepository.execute_many(
+                "UPDATE projects SET impressions = COALESCE(impressions, 0) + ? WHERE project_id = ?",
+                ((n, project_id) for project_id, n in counts.items()),
+                batch_size=batch_size,
+            )
+        ProjectRepository._notify_change("impressions", counts)
+        return updated
 
     
     @staticmethod
@@ -81,12 +134,12 @@ class ProjectRepository(BaseRepository):
     @staticmethod
     def count_projects(stage_filter=None):
         """Count total projects"""
-        query = "SELECT COUNT(*) FROM projects"
-        params = None
+        query = "SELECT COUNT(*) AS total FROM projects"
+        params = ()
         
         if stage_filter:
             query += " WHERE stage = ?"
             params = (stage_filter,)
         
         result = BaseRepository.fetch_one(query, params)
-        return result[0] if result else 0
+        return result["total"] if result else 0
@@ -1,41 +1,117 @@
 from datetime import datetime
+from itertools import islice
+from app.api.config import settings
 from app.repositories.base import BaseRepository
 
 
+# Upper bounds (exclusive) of levels 1-4; anything above is level 5
+LEVEL_THRESHOLDS = (10, 30, 60, 100)
+
+
 def compute_level(points: float) -> int:
-    if points < 10:
-        return 1
-    elif points < 30:
-        return 2
-    elif points < 60:
-        return 3
-    elif points < 100:
-        return 4
-    else:
-        return 5
+    for level, threshold in enumerate(LEVEL_THRESHOLDS, start=1):
+        if points < threshold:
+            return level
+    return len(LEVEL_THRESHOLDS) + 1
+
+
+def level_case(points_expr: str) -> str:
+    """SQL equivalent of `compute_level` for the given points expression."""
+    whens = " ".join(
+        "WHEN {} < {} THEN {}".format(points_expr, threshold, level)
+        for level, threshold in enumerate(LEVEL_THRESHOLDS, start=1)
+    )
+    return "CASE {} ELSE {} END".format(whens, len(LEVEL_THRESHOLDS) + 1)
+
+
+INSERT_REWARD_QUERY = """
+INSERT INTO creator_rewards (creator_id, reward_type, value, awarded_at)
+VALUES (?, ?, ?, ?)
+"""
+
+# Running total: constant cost per award regardless of reward history
+ADD_POINTS_QUERY = """
+UPDATE creator_profiles
+SET points = COALESCE(points, 0) + :delta,
+    level = {level}
+WHERE creator_id = :creator_id
+""".format(level=level_case("(COALESCE(points, 0) + :delta)"))
+
+SET_POINTS_QUERY = """
+UPDATE creator_profiles
+SET points = :points,
+    level = {level}
+WHERE creator_id = :creator_id
+""".format(level=level_case(":points"))
 
 
 class RewardRepository(BaseRepository):
     @staticmethod
     def add_reward(creator_id, reward_type, value):
-        BaseRepository.execute(
-            """
-            INSERT INTO creator_rewards (creator_id, reward_type, value, awarded_at)
-            VALUES (?, ?, ?, ?)
-            """,
-            (creator_id, reward_type, value, datetime.utcnow().isoformat()),
-        )
-
-        row = BaseRepository.fetch_one(
-            "SELECT COALESCE(SUM(value), 0) as total FROM creator_rewards WHERE creator_id = ?",
-            (creator_id,)
-        )
-        total = row.get("total") if row else 0
-        level = compute_level(total or 0)
-
-        BaseRepository.execute(
-            "UPDATE creator_profiles SET points = ?, level = ? WHERE creator_id = ?",
-            (total, level, creator_id),
-        )
+        with BaseRepository.transaction():
+            BaseRepository.execute(
+                INSERT_REWARD_QUERY,
+                (creator_id, reward_type, value, datetime.utcnow().isoformat()),
+            )
+            BaseRepository.execute(ADD_POINTS_QUERY, {"delta": value, "creator_id": creator_id})
+            row = BaseRepository.fetch_one(
+                "SELECT points, level FROM creator_profiles WHERE creator_id = ?",
+                (creator_id,)
+            )
 
+        total = row["points"] if row else value
+        level = row["level"] if row else compute_level(value or 0)
         return {"creator_id": creator_id, "points": total, "level": level}
+
+    @staticmethod
+    def add_rewards(rows, batch_size=None):
+        """Bulk variant of `add_reward`; `rows` yields (creator_id, reward_type, value).
+
+        Each chunk inserts its reward rows and applies one summed
+        `points + delta` update per creator in a single transaction.
+        Returns the number of rewards written.
+        """
+        batch_size = batch_size or settings.DB_BATCH_SIZE
+        iterator = iter(rows)
+        total = 0
+        while True:
+            chunk = list(islice(iterator, batch_size))
+            if not chunk:
+                break
+            awarded_at = datetime.utcnow().isoformat()
+            deltas = {}
+            for creator_id, _, value in chunk:
+                deltas[creator_id] = deltas.get(creator_id, 0) + value
+            with BaseRepository.transaction():
+                BaseRepository.execute_many(
+                    INSERT_REWARD_QUERY,
+                    ((creator_id, reward_type, value, awarded_at) for creator_id, reward_type, value in chunk),
+                )
+                BaseRepository.execute_many(
+                    ADD_POINTS_QUERY,
+                    ({"delta": delta, "creator_id": creator_id} for creator_id, delta in deltas.items()),
+                )
+            total += len(chunk)
+        return total
+
+    @staticmethod
+    def reconcile_points(tolerance=1e-9):
+        """Reset running totals that drifted from `SUM(creator_rewards.value)`.
+
+        Returns the number of creator profiles corrected.
+        """
+        query = """
+        SELECT c.creator_id, COALESCE(r.total, 0) AS points
+        FROM creator_profiles c
+        LEFT JOIN (
+            SELECT creator_id, SUM(value) AS total
+            FROM creator_rewards
+            GROUP BY creator_id
+        ) r ON r.creator_id = c.creator_id
+        WHERE ABS(COALESCE(c.points, 0) - COALESCE(r.total, 0)) > ?
+           OR c.level IS NOT {level}
+        """.format(level=level_case("COALESCE(r.total, 0)"))
+        with BaseRepository.transaction():
+            drifted = BaseRepository.fetch_all(query, (tolerance,))
+            BaseRepository.execute_many(SET_POINTS_QUERY, drifted)
+        return len(drifted)
@@ -22,19 +22,37 @@ class SimilarityRepository(BaseRepository):
         )
 from app.repositories.base import BaseRepository
 
+UPSERT_SIMILARITY_QUERY = """
+INSERT INTO project_similarity
+(project_a, project_b, similarity, posted_first)
+VALUES (?, ?, ?, ?)
+ON CONFLICT(project_a, project_b) DO UPDATE SET
+    similarity=excluded.similarity
+"""
+
 
 class SimilarityRepository(BaseRepository):
 
     @staticmethod
     def upsert_similarity(a, b, score):
-        query = """
-        INSERT INTO project_similarity
-        (project_a, project_b, similarity, posted_first)
-        VALUES (?, ?, ?, ?)
-        ON CONFLICT(project_a, project_b) DO UPDATE SET
-            similarity=excluded.similarity
+        BaseRepository.execute(UPSERT_SIMILARITY_QUERY, (a, b, score, min(a, b)))
+
+    @staticmethod
+    def upsert_similarities(rows, batch_size=None):
+        """Bulk variant of `upsert_similarity`; `rows` yields (a, b, score).
+
+        Rows are streamed through executemany in chunked transactions, so
+        a generator over all pairs never has to be materialized.
         """
-        BaseRepository.execute(query, (a, b, score, min(a, b)))
+        return BaseRepository.execute_many(
+            UPSERT_SIMILARITY_QUERY,
+            ((a, b, score, min(a, b)) for a, b, score in rows),
+            batch_size=batch_size,
+        )
+
+    @staticmethod
+    def delete_all():
+        BaseRepository.execute("DELETE FROM project_similarity")
 
     @staticmethod
     def get_similar_projects(project_id):
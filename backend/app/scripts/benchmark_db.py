@@ -0,0 +1,159 @@
+"""Benchmark feed-style reads while FairRankEngine is writing.
+
+Builds a throwaway database, starts the FairRank engine in a writer thread
+and hammers cheap lookups from reader threads, then reports read
+throughput, latency percentiles and `database is locked` errors.
+
+Usage examples:
+  PYTHONPATH=. python3 app/scripts/benchmark_db.py
+  PYTHONPATH=. python3 app/scripts/benchmark_db.py --journal-mode DELETE --synchronous FULL
+  PYTHONPATH=. python3 app/scripts/benchmark_db.py --projects 20000 --engine run_batch
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Read throughput under FairRank writes")
+    parser.add_argument("--projects", type=int, default=2000, help="Number of synthetic projects")
+    parser.add_argument("--engagements", type=int, default=5, help="Engagements per project")
+    parser.add_argument("--readers", type=int, default=4, help="Reader threads")
+    parser.add_argument("--engine", choices=["run", "run_batch"], default="run",
+                        help="FairRankEngine entry point used as the writer")
+    parser.add_argument("--journal-mode", default=None, help="Override DB_JOURNAL_MODE (e.g. WAL, DELETE)")
+    parser.add_argument("--synchronous", default=None, help="Override DB_SYNCHRONOUS (e.g. NORMAL, FULL)")
+    return parser.parse_args()
+
+
+def populate(path, n_projects, per_project):
+    conn = sqlite3.connect(path)
+    now = datetime.utcnow()
+    creators = max(1, n_projects // 10)
+    conn.executemany(
+        "INSERT INTO users (user_id, name, user_type, created_at) VALUES (?, ?, 'creator', ?)",
+        [(i, "User{}".format(i), now.isoformat()) for i in range(1, creators + 1)],
+    )
+    conn.executemany(
+        "INSERT INTO creator_profiles (creator_id, role, skills) VALUES (?, 'dev', 'python')",
+        [(i,) for i in range(1, creators + 1)],
+    )
+    conn.executemany(
+        "INSERT INTO projects (creator_id, title, abstract, stage, created_at, impressions) "
+        "VALUES (?, ?, 'Benchmark project', 'idea', ?, ?)",
+        [
+            (
+                random.randint(1, creators),
+                "Project {}".format(i),
+                (now - timedelta(days=random.randint(0, 30))).isoformat(),
+                random.randint(0, 600),
+            )
+            for i in range(n_projects)
+        ],
+    )
+    conn.executemany(
+        "INSERT INTO engagements (project_id, user_id, reaction, weight, created_at) "
+        "VALUES (?, ?, 'like', 1.0, ?)",
+        [
+            (random.randint(1, n_projects), random.randint(1, creators), now.isoformat())
+            for _ in range(n_projects * per_project)
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+
+def percentile(sorted_vals, pct):
+    if not sorted_vals:
+        return 0.0
+    idx = min(len(sorted_vals) - 1, int(len(sorted_vals) * pct / 100))
+    return sorted_vals[idx]
+
+
+def main():
+    args = parse_args()
+
+    # Settings and DATABASE_NAME are read at import time, so configure the
+    # environment before importing anything from `app`.
+    db_fd, db_path = tempfile.mkstemp(prefix="fairrank_bench_", suffix=".db")
+    os.close(db_fd)
+    os.environ["FAIRRANK_DB"] = db_path
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    if args.journal_mode:
+        os.environ["DB_JOURNAL_MODE"] = args.journal_mode
+    if args.synchronous:
+        os.environ["DB_SYNCHRONOUS"] = args.synchronous
+
+    import logging
+
+    from app.core.database import get_connection
+    from app.repositories.projects import ProjectRepository
+    from app.scripts.init_db import init_database
+    from app.services.fairrank_engine import FairRankEngine
+
+    logging.disable(logging.INFO)
+    try:
+        init_database()
+        populate(db_path, args.projects, args.engagements)
+        conn = get_connection()
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        conn.close()
+
+        done = threading.Event()
+        latencies = []
+        errors = {"locked": 0, "other": 0}
+        lock = threading.Lock()
+
+        def reader():
+            local = []
+            while not done.is_set():
+                start = time.perf_counter()
+                try:
+                    ProjectRepository.get_project(random.randint(1, args.projects))
+                except sqlite3.OperationalError as e:
+                    with lock:
+                        errors["locked" if "locked" in str(e) else "other"] += 1
+                    continue
+                local.append(time.perf_counter() - start)
+            with lock:
+                latencies.extend(local)
+
+        readers = [threading.Thread(target=reader) for _ in range(args.readers)]
+        for t in readers:
+            t.start()
+
+        writer_start = time.perf_counter()
+        try:
+            getattr(FairRankEngine, args.engine)()
+        finally:
+            elapsed = time.perf_counter() - writer_start
+            done.set()
+            for t in readers:
+                t.join()
+
+        latencies.sort()
+        print("journal_mode={} engine={} projects={} readers={}".format(
+            journal_mode, args.engine, args.projects, args.readers))
+        print("writer: {:.2f}s".format(elapsed))
+        print("reads: {} ({:.0f}/s) p50={:.2f}ms p99={:.2f}ms".format(
+            len(latencies),
+            len(latencies) / elapsed if elapsed else 0,
+            percentile(latencies, 50) * 1000,
+            percentile(latencies, 99) * 1000,
+        ))
+        print("errors: locked={locked} other={other}".format(**errors))
+    finally:
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            try:
+                os.remove(db_path + suffix)
+            except OSError:
+                pass
+
+
+if __name__ == "__main__":
+    main()
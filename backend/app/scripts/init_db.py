@@ -1,14 +1,44 @@
 import os
-from app.core.database import execute_script
+from app.core.database import execute_script, get_connection
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 SCHEMA_PATH = os.path.join(BASE_DIR, "models", "schema.sql")
 
+# Columns added to existing tables after their first release:
+# (table, column, declaration). `CREATE TABLE IF NOT EXISTS` leaves old
+# tables untouched, so these are added with ALTER TABLE when missing.
+#
+# platform_stats.exposure_gini predates these and keeps holding the Gini
+# of FairRank engagement scores; the impression Gini lives in
+# impression_gini(_error). `/api/admin/stats` reports them as
+# engagement_gini and exposure_gini(_error) respectively (see
+# PlatformStatsRepository.get_snapshot) -- do not "fix" the names.
+ADDED_COLUMNS = (
+    ("platform_stats", "total_engagements", "INTEGER DEFAULT 0"),
+    ("platform_stats", "impression_gini", "REAL"),
+    ("platform_stats", "impression_gini_error", "REAL DEFAULT 0.0"),
+    ("fair_rank_state", "scores_updated_at", "TEXT"),
+    ("platform_stats", "exposure_distribution", "TEXT"),
+)
+
+
+def migrate_columns():
+    conn = get_connection()
+    try:
+        for table, column, declaration in ADDED_COLUMNS:
+            existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            if column not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+        conn.commit()
+    finally:
+        conn.close()
+
 
 def init_database():
     with open(SCHEMA_PATH, "r") as f:
         schema = f.read()
     execute_script(schema)
+    migrate_columns()
     print("Database initialized successfully.")
 
 
@@ -4,7 +4,7 @@ import random
 from app.repositories.projects import ProjectRepository
 from app.repositories.creators import CreatorRepository
 from app.repositories.users import UserRepository
-from app.repositories.engagements import EngagementRepository
+from app.services.gamification import GamificationService
 from app.core.database import get_connection
 from app.repositories.collab import CollabRepository
 from app.core.logger import get_logger
@@ -135,7 +135,7 @@ def seed_database():
             
             for user_id in engaged_users:
                 reaction = random.choice(reaction_types)
-                EngagementRepository.create_engagement(
+                GamificationService.record_engagement(
                     project_id=project_id,
                     user_id=user_id,
                     reaction=reaction,
@@ -0,0 +1,96 @@
+import json
+import os
+
+import numpy as np
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class EmbeddingSnapshot:
+    """Read-only embedding matrix stored as `.npy` files in a directory.
+
+    A snapshot is a pair of files, `embedding_ids-<stamp>.npy` (int64
+    project ids) and `embeddings-<stamp>.npy` (float32 matrix, one row per
+    id), plus `current.json` naming the live stamp. The matrix is opened
+    with `mmap_mode="r"`, so worker processes loading the same snapshot
+    share its pages through the OS page cache.
+
+    Writers create the new files first and swap `current.json` last with
+    `os.replace`, so readers always see a complete snapshot; superseded
+    files are removed afterwards (open mappings keep their data alive).
+    """
+
+    POINTER = "current.json"
+
+    def __init__(self, project_ids, matrix, stamp):
+        self.project_ids = project_ids
+        self.matrix = matrix
+        self.stamp = stamp
+
+    def __len__(self):
+        return len(self.project_ids)
+
+    @staticmethod
+    def _paths(directory, stamp):
+        return (
+            os.path.join(directory, "embedding_ids-{}.npy".format(stamp)),
+            os.path.join(directory, "embeddings-{}.npy".format(stamp)),
+        )
+
+    @staticmethod
+    def _replace(path, write):
+        tmp = "{}.{}.tmp".format(path, os.getpid())
+        with open(tmp, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def write(cls, directory, project_ids, matrix, stamp):
+        """Persist a snapshot under `stamp`, make it current and return it loaded."""
+        os.makedirs(directory, exist_ok=True)
+        project_ids = np.asarray(project_ids, dtype=np.int64)
+        matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        ids_path, matrix_path = cls._paths(directory, stamp)
+
+        cls._replace(ids_path, lambda f: np.save(f, project_ids))
+        cls._replace(matrix_path, lambda f: np.save(f, matrix))
+        pointer = {
+            "stamp": stamp,
+            "count": int(matrix.shape[0]),
+            "dim": int(matrix.shape[1]) if matrix.ndim == 2 else 0,
+        }
+        cls._replace(
+            os.path.join(directory, cls.POINTER),
+            lambda f: f.write(json.dumps(pointer).encode("utf-8")),
+        )
+        cls._prune(directory, stamp)
+        logger.info("Wrote embedding snapshot: dir=%s stamp=%s projects=%d", directory, stamp, len(project_ids))
+        return cls.load(directory)
+
+    @classmethod
+    def load(cls, directory):
+        """Memory-map the current snapshot in `directory`, or return None."""
+        try:
+            with open(os.path.join(directory, cls.POINTER), "r") as f:
+                stamp = json.load(f)["stamp"]
+            ids_path, matrix_path = cls._paths(directory, stamp)
+            project_ids = np.load(ids_path)
+            matrix = np.load(matrix_path, mmap_mode="r")
+        except (OSError, ValueError, KeyError):
+            return None
+        if matrix.ndim != 2 or matrix.shape[0] != len(project_ids):
+            logger.warning("Ignoring inconsistent embedding snapshot in %s", directory)
+            return None
+        return cls(project_ids, matrix, stamp)
+
+    @classmethod
+    def _prune(cls, directory, keep):
+        kept = set(cls._paths(directory, keep))
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if name.endswith(".npy") and name.startswith(("embedding_ids-", "embeddings-")) and path not in kept:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
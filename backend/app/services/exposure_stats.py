@@ -0,0 +1,229 @@
+import threading
+import time
+
+from app.api.config import settings
+from app.core.logger import get_logger
+from app.repositories.base import BaseRepository
+from app.repositories.projects import ProjectRepository
+
+logger = get_logger(__name__)
+
+
+class StreamingHistogram:
+    """Log-linear histogram of non-negative integers with a Gini estimate.
+
+    Values below 2**SUB_BITS get a bucket each; above that every power of
+    two is split into 2**SUB_BITS equal buckets, so a bucket is never wider
+    than 1/16 of its values. Each bucket keeps a count and an exact sum;
+    `add`/`remove` are O(1).
+
+    `gini` is computed from the buckets alone. Pairs in different buckets
+    contribute exactly; only pairs inside one bucket are unknown, and their
+    contribution is at most that of putting the bucket's mass on its two
+    endpoints. The estimate is the midpoint of the resulting bounds and
+    the true Gini is within +- the returned error.
+    """
+
+    SUB_BITS = 4
+    SUB = 1 << SUB_BITS
+
+    def __init__(self):
+        self._counts = {}
+        self._sums = {}
+        self.count = 0
+        self.total = 0
+
+    @classmethod
+    def bucket(cls, value):
+        if value < cls.SUB:
+            return value
+        shift = value.bit_length() - cls.SUB_BITS - 1
+        return cls.SUB + shift * cls.SUB + ((value >> shift) - cls.SUB)
+
+    @classmethod
+    def bounds(cls, index):
+        """Inclusive (lo, hi) range of the values in bucket `index`."""
+        if index < cls.SUB:
+            return index, index
+        shift, offset = divmod(index - cls.SUB, cls.SUB)
+        lo = (cls.SUB + offset) << shift
+        return lo, lo + (1 << shift) - 1
+
+    def add(self, value, n=1):
+        value = max(0, int(value))
+        index = self.bucket(value)
+        count = self._counts.get(index, 0) + n
+        if count:
+            self._counts[index] = count
+            self._sums[index] = self._sums.get(index, 0) + n * value
+        else:
+            self._counts.pop(index, None)
+            self._sums.pop(index, None)
+        self.count += n
+        self.total += n * value
+
+    def remove(self, value):
+        self.add(value, -1)
+
+    def move(self, old, new):
+        if self.bucket(max(0, int(old))) == self.bucket(max(0, int(new))):
+            # same bucket: only the sum changes
+            index = self.bucket(max(0, int(new)))
+            self._sums[index] += int(new) - int(old)
+            self.total += int(new) - int(old)
+            return
+        self.remove(old)
+        self.add(new)
+
+    def gini(self):
+        """Return (estimate, error_bound); (0.0, 0.0) for no or all-zero values."""
+        if self.count == 0 or self.total <= 0:
+            return 0.0, 0.0
+        cross = 0.0  # sum of |x_i - x_j| over unordered pairs in different buckets
+        within = 0.0  # upper bound of the same over ordered pairs inside buckets
+        seen_n, seen_sum = 0, 0
+        for index in sorted(self._counts):
+            n, s = self._counts[index], self._sums[index]
+            cross += s * seen_n - n * seen_sum
+            seen_n += n
+            seen_sum += s
+            lo, hi = self.bounds(index)
+            if hi > lo and n > 1:
+                at_hi = (s - n * lo) / (hi - lo)
+                within += 2 * at_hi * (n - at_hi) * (hi - lo)
+        denominator = self.count * self.total
+        lower = cross / denominator
+        slack = within / (2 * denominator)
+        return lower + slack / 2, slack / 2
+
+
+class ExposureStats:
+    """Incrementally maintained exposure statistics for `/api/admin/stats`.
+
+    Keeps each project's impression count, the admin exposure buckets,
+    the underexposed count and a `StreamingHistogram` for the exposure
+    Gini. `ProjectRepository` change notifications (new projects,
+    impression flushes) update it in O(1) per project, so reads do not scan
+    `projects`. Writes from other processes are not seen, so
+    `get_exposure_stats` rebuilds it from the DB once it is older than
+    `EXPOSURE_STATS_MAX_AGE` seconds.
+    """
+
+    # (label, lo, hi) inclusive, as in PlatformStatsRepository.get_exposure_distribution
+    DISTRIBUTION_BUCKETS = (
+        ("0-50", 0, 50),
+        ("51-100", 51, 100),
+        ("101-200", 101, 200),
+        ("201-500", 201, 500),
+    )
+    OVERFLOW_BUCKET = "500+"
+    UNDEREXPOSED_THRESHOLD = 100
+
+    def __init__(self, rows=()):
+        self._lock = threading.Lock()
+        self._impressions = {}
+        self._distribution = {}
+        self._underexposed = 0
+        self.histogram = StreamingHistogram()
+        self.built_at = time.monotonic()
+        for row in rows:
+            self._add(row["project_id"], row["impressions"] or 0)
+
+    @classmethod
+    def label(cls, impressions):
+        for label, lo, hi in cls.DISTRIBUTION_BUCKETS:
+            if lo <= impressions <= hi:
+                return label
+        return cls.OVERFLOW_BUCKET
+
+    def _count(self, impressions, n):
+        label = self.label(impressions)
+        self._distribution[label] = self._distribution.get(label, 0) + n
+        if impressions < self.UNDEREXPOSED_THRESHOLD:
+            self._underexposed += n
+
+    def _add(self, project_id, impressions):
+        if project_id in self._impressions:
+            return
+        self._impressions[project_id] = impressions
+        self._count(impressions, 1)
+        self.histogram.add(impressions)
+
+    def add_project(self, project_id, impressions=0):
+        with self._lock:
+            self._add(project_id, impressions)
+
+    def set_impressions(self, project_id, impressions):
+        with self._lock:
+            old = self._impressions.get(project_id)
+            if old is None:
+                self._add(project_id, impressions)
+                return
+            self._impressions[project_id] = impressions
+            self._count(old, -1)
+            self._count(impressions, 1)
+            self.histogram.move(old, impressions)
+
+    def add_impressions(self, counts):
+        """Apply a flushed {project_id: views} batch."""
+        with self._lock:
+            for project_id, n in counts.items():
+                old = self._impressions.get(project_id)
+                if old is None:
+                    continue  # unknown project: picked up by the next rebuild
+                new = old + n
+                self._impressions[project_id] = new
+                self._count(old, -1)
+                self._count(new, 1)
+                self.histogram.move(old, new)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            gini, error = self.histogram.gini()
+            return {
+                "total_projects": len(self._impressions),
+                "underexposed_projects": self._underexposed,
+                "exposure_distribution": {k: v for k, v in self._distribution.items() if v},
+                "exposure_gini": gini,
+                "exposure_gini_error": error,
+            }
+
+
+_stats = None
+_stats_lock = threading.Lock()
+
+
+def _rebuild() -> ExposureStats:
+    rows = BaseRepository.fetch_all("SELECT project_id, COALESCE(impressions, 0) AS impressions FROM projects")
+    stats = ExposureStats(rows)
+    logger.info("Built exposure stats: projects=%d", len(rows))
+    return stats
+
+
+def get_exposure_stats(rebuild: bool = False) -> ExposureStats:
+    """Return the process-wide stats, (re)building them when missing or expired."""
+    global _stats
+    stats = _stats
+    max_age = settings.EXPOSURE_STATS_MAX_AGE
+    expired = stats is not None and max_age > 0 and time.monotonic() - stats.built_at > max_age
+    if stats is None or expired or rebuild:
+        with _stats_lock:
+            if _stats is stats:
+                _stats = _rebuild()
+            stats = _stats
+    return stats
+
+
+def _on_project_change(event, payload):
+    stats = _stats
+    if stats is None:
+        return
+    if event == "created":
+        stats.add_project(payload)
+    elif event == "impressions":
+        stats.add_impressions(payload)
+    elif event == "impressions_set":
+        stats.set_impressions(*payload)
+
+
+ProjectRepository.add_change_listener(_on_project_change)
@@ -101,12 +101,15 @@ class FairRankEngine:
             raise
 import math
 from datetime import datetime
+import numpy as np
+from app.api.config import settings
 from app.core.logger import get_logger
 from app.repositories.projects import ProjectRepository
 from app.repositories.engagements import EngagementRepository
 from app.repositories.fairrank import FairRankRepository
-from app.repositories.platform_stats import PlatformStatsRepository
 from app.repositories.rewards import RewardRepository
+from app.services.feed_snapshot import FeedCache
+from app.services.platform_stats_cache import PlatformStatsCache
 
 logger = get_logger(__name__)
 
@@ -121,8 +124,24 @@ class FairRankEngine:
 
     Notes for debugging: logs the Gini coefficient and average score. The
     scoring formula is intentionally simple; tune weights for production.
+
+    `run_batch` is the vectorized variant: one aggregate query for the
+    inputs, NumPy for the scoring and one `executemany` for the writes.
     """
 
+    # Score weights shared by the row-by-row and vectorized paths
+    ENGAGEMENT_WEIGHT = 0.6
+    FRESHNESS_WEIGHT = 0.15
+    UNDEREXPOSED_WEIGHT = 0.15
+    DIVERSITY_WEIGHT = 0.10
+
+    TOP_N_BOOST = 10
+    UNDEREXPOSED_THRESHOLD = 100
+
+    # run_incremental outcomes, for /api/admin/metrics
+    incremental_runs = 0
+    incremental_fallbacks = {}
+
     @staticmethod
     def compute_gini(values):
         """Return the Gini coefficient for a list of non-negative numbers.
@@ -151,7 +170,6 @@ class FairRankEngine:
         logger.info("Starting FairRankEngine.run()")
         try:
             projects = ProjectRepository.get_all_projects()
-            engagement_scores = []
             project_data = []
 
             now = datetime.utcnow()
@@ -210,12 +228,11 @@ class FairRankEngine:
 
                 project_data.append((pid, engagement_score, freshness, diversity_boost, underexposed_boost, raw_score))
 
-            gini = FairRankEngine.compute_gini(engagement_scores)
+            gini = FairRankEngine.compute_gini(list(raw_engagements.values()))
 
             avg_score = sum(d[-1] for d in project_data) / len(project_data) if project_data else 0
 
-            for data in project_data:
-                FairRankRepository.upsert_score(*data)
+            FairRankRepository.upsert_scores(project_data)
 
             # Award top-N projects with a FairRank boost
             try:
@@ -223,25 +240,303 @@ class FairRankEngine:
                 creator_map = {p["project_id"]: p.get("creator_id") for p in projects}
                 sorted_projects = sorted(project_data, key=lambda d: d[-1], reverse=True)
                 top_n = 10
-                for entry in sorted_projects[:top_n]:
-                    pid = entry[0]
-                    cid = creator_map.get(pid)
-                    if cid:
-                        RewardRepository.add_reward(cid, "FairRank Boost", 10)
+                RewardRepository.add_rewards(
+                    (creator_map[entry[0]], "FairRank Boost", 10)
+                    for entry in sorted_projects[:top_n]
+                    if creator_map.get(entry[0])
+                )
             except Exception:
                 logger.exception("Failed to award FairRank boosts")
 
-            PlatformStatsRepository.update_stats(
-                len(set(p["creator_id"] for p in projects)),
-                len(projects),
-                len([e for e in engagement_scores if e < 5]),
-                avg_score,
-                gini,
-            )
-
             logger.info("FairRankEngine completed: projects=%d gini=%.4f avg_score=%.4f",
                         len(projects), gini, avg_score)
+            FairRankEngine.publish_feed()
+            FairRankEngine.publish_stats(gini)
             return True
         except Exception:
             logger.exception("FairRankEngine.run failed")
             raise
+
+    @staticmethod
+    def load_inputs(now):
+        """Load per-project inputs as NumPy arrays using one GROUP BY query."""
+        return FairRankEngine.inputs_from_rows(FairRankRepository.get_ranking_inputs(now))
+
+    @staticmethod
+    def load_inputs_for(now, project_ids):
+        """Like `load_inputs` but restricted to `project_ids`."""
+        return FairRankEngine.inputs_from_rows(FairRankRepository.get_ranking_inputs(now, project_ids))
+
+    @staticmethod
+    def inputs_from_rows(rows):
+        n = len(rows)
+        age_days = np.array(
+            [r["age_days"] if r["age_days"] is not None else np.nan for r in rows],
+            dtype=np.float64,
+        )
+        return {
+            "project_ids": np.fromiter((r["project_id"] for r in rows), dtype=np.int64, count=n),
+            "creator_ids": [r["creator_id"] for r in rows],
+            "impressions": np.fromiter((r["impressions"] for r in rows), dtype=np.float64, count=n),
+            "engagement": np.fromiter((r["engagement_sum"] for r in rows), dtype=np.float64, count=n),
+            "age_days": age_days,
+        }
+
+    @staticmethod
+    def normalize(values, bounds=None):
+        """Min-max normalize `values` to [0, 1]; all-equal inputs map to 0.5.
+
+        `bounds` overrides the (min, max) taken from `values`, which lets
+        callers score a subset against global bounds; values outside them
+        are clipped to [0, 1].
+        """
+        if values.size == 0:
+            return values.astype(np.float64)
+        vmin, vmax = bounds if bounds is not None else (values.min(), values.max())
+        if vmin == vmax:
+            return np.full(values.shape, 0.5)
+        normalized = (values - vmin) / (vmax - vmin)
+        return np.clip(normalized, 0.0, 1.0) if bounds is not None else normalized
+
+    @staticmethod
+    def compute_scores(engagement, impressions, age_days, eng_bounds=None, exp_bounds=None):
+        """Vectorized scoring; returns (engagement, freshness, underexposed, final) arrays."""
+        engagement_score = FairRankEngine.normalize(engagement, eng_bounds)
+        # same day bucketing as `run` (floor(age) + 1, at least 1);
+        # a missing created_at (NaN age) gets no freshness boost
+        days = np.maximum(1.0, np.floor(age_days) + 1)
+        freshness = np.where(np.isnan(days), 0.0, 1.0 / days)
+        underexposed_boost = np.clip(1.0 - FairRankEngine.normalize(impressions, exp_bounds), 0.0, 1.0)
+        final = (
+            FairRankEngine.ENGAGEMENT_WEIGHT * engagement_score
+            + FairRankEngine.FRESHNESS_WEIGHT * freshness
+            + FairRankEngine.UNDEREXPOSED_WEIGHT * underexposed_boost
+            + FairRankEngine.DIVERSITY_WEIGHT * 1.0
+        )
+        return engagement_score, freshness, underexposed_boost, final
+
+    @staticmethod
+    def compute_gini_array(values):
+        """NumPy equivalent of `compute_gini`."""
+        n = values.size
+        if n == 0:
+            return 0.0
+        sorted_vals = np.sort(values)
+        total = sorted_vals.sum()
+        if total == 0:
+            return 0.0
+        cumulative = np.dot(np.arange(1, n + 1, dtype=np.float64), sorted_vals)
+        return float((2 * cumulative) / (n * total) - (n + 1) / n)
+
+    @staticmethod
+    def award_top_boosts(project_ids, creator_ids, final):
+        """Award the FairRank boost to the creators of the top-N projects."""
+        try:
+            top = np.argsort(-final, kind="stable")[:FairRankEngine.TOP_N_BOOST]
+            RewardRepository.add_rewards(
+                (creator_ids[idx], "FairRank Boost", 10) for idx in top.tolist() if creator_ids[idx]
+            )
+        except Exception:
+            logger.exception("Failed to award FairRank boosts")
+
+    @staticmethod
+    def bounds_changed(old, new, tolerance=0.0):
+        """True if `new` bounds moved away from `old` by more than `tolerance`.
+
+        `tolerance` is a fraction of the old (min, max) range per input.
+        """
+        for prefix in ("engagement", "impressions"):
+            old_min, old_max = old.get(prefix + "_min"), old.get(prefix + "_max")
+            allowed = tolerance * (old_max - old_min) if old_min is not None and old_max is not None else 0.0
+            for key in (prefix + "_min", prefix + "_max"):
+                a, b = old.get(key), new.get(key)
+                if a is None or b is None:
+                    if a is not b:
+                        return True
+                elif abs(a - b) > allowed and not math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-12):
+                    return True
+        return False
+
+    @staticmethod
+    def run_stats() -> dict:
+        return {
+            "incremental_runs": FairRankEngine.incremental_runs,
+            "incremental_fallbacks": dict(FairRankEngine.incremental_fallbacks),
+        }
+
+    @staticmethod
+    def _fall_back(reason, checkpoint):
+        FairRankEngine.incremental_fallbacks[reason] = FairRankEngine.incremental_fallbacks.get(reason, 0) + 1
+        return FairRankEngine.run_batch(checkpoint)
+
+    @staticmethod
+    def persist_scores(project_ids, engagement_score, freshness, underexposed_boost, final, computed_at=None):
+        diversity = np.ones(project_ids.size)
+        FairRankRepository.upsert_scores(
+            zip(
+                project_ids.tolist(),
+                engagement_score.tolist(),
+                freshness.tolist(),
+                diversity.tolist(),
+                underexposed_boost.tolist(),
+                final.tolist(),
+            ),
+            computed_at=computed_at,
+        )
+
+    @staticmethod
+    def publish_feed():
+        """Swap in a fresh feed snapshot; a failure here never fails the run."""
+        try:
+            FeedCache.refresh()
+        except Exception:
+            logger.exception("Failed to publish feed snapshot")
+
+    @staticmethod
+    def publish_stats(engagement_gini=None):
+        """Refresh the materialized platform stats; a failure here never fails the run."""
+        try:
+            PlatformStatsCache.refresh(engagement_gini)
+        except Exception:
+            logger.exception("Failed to refresh platform stats")
+
+    @staticmethod
+    def run_batch(checkpoint=None):
+        """Vectorized end-to-end FairRank run.
+
+        Produces the same columns as `run` but reads all inputs with a
+        single aggregate query and persists all scores in one transaction.
+        Also records the normalization bounds and drains the change log so
+        `run_incremental` can continue from here.
+
+        `checkpoint`, if given, is called after loading and after scoring;
+        it may raise (e.g. `Job.check_cancelled`) to abort the run before
+        anything is written. Once persisting starts the run completes.
+        """
+        logger.info("Starting FairRankEngine.run_batch()")
+        try:
+            now = datetime.utcnow()
+            changes = FairRankRepository.get_pending_changes()
+            inputs = FairRankEngine.load_inputs(now)
+            aggregates = FairRankEngine.partial_aggregates(inputs)
+            if checkpoint is not None:
+                checkpoint()
+            FairRankEngine.score_full(now, changes, inputs, aggregates, checkpoint)
+            logger.info("FairRankEngine batch completed: projects=%d", inputs["project_ids"].size)
+            return True
+        except Exception:
+            logger.exception("FairRankEngine.run_batch failed")
+            raise
+
+    @staticmethod
+    def partial_aggregates(inputs):
+        """Summary of loaded inputs: counts and the normalization bounds."""
+        engagement, impressions = inputs["engagement"], inputs["impressions"]
+        if engagement.size == 0:
+            return {"count": 0, "underexposed": 0}
+        return {
+            "count": int(engagement.size),
+            "underexposed": int(np.count_nonzero(impressions < FairRankEngine.UNDEREXPOSED_THRESHOLD)),
+            "engagement_min": float(engagement.min()),
+            "engagement_max": float(engagement.max()),
+            "impressions_min": float(impressions.min()),
+            "impressions_max": float(impressions.max()),
+        }
+
+    @staticmethod
+    def score_full(now, changes, inputs, aggregates, checkpoint=None):
+        """Score, persist and publish a full run from loaded inputs and their aggregates.
+
+        `checkpoint` is called between scoring and persisting.
+        """
+        project_ids = inputs["project_ids"]
+        bounds = {key: aggregates.get(key) for key in
+                  ("engagement_min", "engagement_max", "impressions_min", "impressions_max")}
+        has_rows = aggregates["count"] > 0
+
+        engagement_score, freshness, underexposed_boost, final = FairRankEngine.compute_scores(
+            inputs["engagement"],
+            inputs["impressions"],
+            inputs["age_days"],
+            eng_bounds=(bounds["engagement_min"], bounds["engagement_max"]) if has_rows else None,
+            exp_bounds=(bounds["impressions_min"], bounds["impressions_max"]) if has_rows else None,
+        )
+        if checkpoint is not None:
+            checkpoint()
+        FairRankEngine.persist_scores(
+            project_ids, engagement_score, freshness, underexposed_boost, final, computed_at=now.isoformat()
+        )
+        FairRankRepository.save_state(bounds, now.isoformat())
+        FairRankRepository.clear_changes(changes)
+        FairRankEngine.award_top_boosts(project_ids, inputs["creator_ids"], final)
+
+        gini = FairRankEngine.compute_gini_array(inputs["engagement"])
+        avg_score = float(final.mean()) if final.size else 0.0
+
+        logger.info("FairRank scored: projects=%d gini=%.4f avg_score=%.4f", project_ids.size, gini, avg_score)
+        FairRankEngine.publish_feed()
+        FairRankEngine.publish_stats(float(gini))
+
+    @staticmethod
+    def run_incremental(checkpoint=None):
+        """Rescore only the projects whose score is out of date.
+
+        Those are the projects in the FairRank change log plus the ones
+        whose whole-day age (and so freshness) changed since they were
+        last scored. They are normalized against the bounds recorded by
+        the last full run, so they stay comparable with the untouched
+        scores. Falls back to `run_batch` when no full run has been
+        recorded yet, or when the live engagement/impression bounds moved
+        by more than `FAIRRANK_BOUNDS_TOLERANCE` of their range; within
+        the tolerance, values beyond the recorded bounds are clipped. The
+        fallback counts are reported by `run_stats`. Incremental runs do
+        not award top-N boosts or touch `platform_stats`; those are
+        refreshed by the next full run. `checkpoint` is honoured as in
+        `run_batch`.
+        """
+        logger.info("Starting FairRankEngine.run_incremental()")
+        try:
+            FairRankEngine.incremental_runs += 1
+            now = datetime.utcnow()
+            state = FairRankRepository.get_state()
+            if not state or not state.get("computed_at"):
+                logger.info("No previous full FairRank run recorded; running full batch")
+                return FairRankEngine._fall_back("no_full_run", checkpoint)
+
+            bounds = FairRankRepository.get_input_bounds()
+            if FairRankEngine.bounds_changed(state, bounds, settings.FAIRRANK_BOUNDS_TOLERANCE):
+                logger.info("Normalization bounds moved (%s -> %s); running full batch", state, bounds)
+                return FairRankEngine._fall_back("bounds_moved", checkpoint)
+
+            changes = FairRankRepository.get_pending_changes()
+            stale = FairRankRepository.get_freshness_stale(now)
+            project_ids = sorted({c["project_id"] for c in changes}.union(stale))
+            if not project_ids:
+                logger.info("FairRankEngine incremental: no changes")
+                return True
+
+            inputs = FairRankEngine.load_inputs_for(now, project_ids)
+            if checkpoint is not None:
+                checkpoint()
+            engagement_score, freshness, underexposed_boost, final = FairRankEngine.compute_scores(
+                inputs["engagement"],
+                inputs["impressions"],
+                inputs["age_days"],
+                eng_bounds=(state["engagement_min"], state["engagement_max"]),
+                exp_bounds=(state["impressions_min"], state["impressions_max"]),
+            )
+            if checkpoint is not None:
+                checkpoint()
+            FairRankEngine.persist_scores(
+                inputs["project_ids"], engagement_score, freshness, underexposed_boost, final,
+                computed_at=now.isoformat(),
+            )
+            FairRankRepository.clear_changes(changes)
+
+            logger.info("FairRankEngine incremental completed: changed=%d day_rollover=%d rescored=%d",
+                        len(changes), len(stale), inputs["project_ids"].size)
+            FairRankEngine.publish_feed()
+            return True
+        except Exception:
+            logger.exception("FairRankEngine.run_incremental failed")
+            raise
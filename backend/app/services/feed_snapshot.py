@@ -0,0 +1,172 @@
+import threading
+import time
+from bisect import bisect_right
+from datetime import datetime
+
+from app.api.config import settings
+from app.core.logger import get_logger
+from app.repositories.fairrank import FairRankRepository
+
+logger = get_logger(__name__)
+
+
+def generate_explanation_badge(project: dict, fairrank_data: dict, now: datetime = None) -> str:
+    """
+    Generate explanation badge for why a project is shown in the feed.
+
+    Priority order:
+    1. Underexposed (impressions < 100)
+    2. Fresh (created < 24 hours ago)
+    3. High engagement (engagement_score > 0.7)
+    4. Default recommendation
+    """
+    impressions = project.get("impressions", 0)
+    created_at = project.get("created_at")
+    engagement_score = fairrank_data.get("engagement_score", 0.0)
+
+    # Parse created_at timestamp
+    try:
+        if isinstance(created_at, str):
+            created_datetime = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
+        else:
+            created_datetime = created_at
+
+        hours_old = ((now or datetime.utcnow()) - created_datetime).total_seconds() / 3600
+    except Exception as e:
+        logger.warning(f"Failed to parse created_at: {e}")
+        hours_old = 999  # Default to old
+
+    # Generate badge based on priority
+    if impressions < 100:
+        return "🚀 Boosting emerging project"
+    elif hours_old < 24:
+        return "✨ Fresh content"
+    elif engagement_score > 0.7:
+        return "📈 High engagement"
+    else:
+        return "🎯 Recommended for you"
+
+
+class FeedSnapshot:
+    """Immutable, ranked copy of the discovery feed.
+
+    `items` holds one response-ready record per project (badge already
+    rendered) in `(final_score DESC, project_id DESC)` order, the same
+    order as `FairRankRepository.get_ranked_feed`, so offsets and cursors
+    are interchangeable between the two.
+    """
+
+    __slots__ = ("version", "built_at", "items", "_keys")
+
+    def __init__(self, version, items, built_at=None):
+        self.version = version
+        self.built_at = built_at if built_at is not None else time.monotonic()
+        self.items = tuple(items)
+        # ascending sort keys for bisecting a keyset cursor
+        self._keys = [(-item["fairrank_score"], -item["id"]) for item in self.items]
+
+    def __len__(self):
+        return len(self.items)
+
+    @classmethod
+    def from_ranked_rows(cls, version, rows):
+        """Build a snapshot from `get_ranked_feed` rows, rendering badges once."""
+        now = datetime.utcnow()
+        items = []
+        for row in rows:
+            project, fairrank = row["project"], row["fairrank"]
+            items.append({
+                "id": project["id"],
+                "title": project["title"],
+                "abstract": project["abstract"],
+                "creator_id": project["creator_id"],
+                "stage": project["stage"],
+                "fairrank_score": fairrank["score"],
+                "explanation_badge": generate_explanation_badge(project, fairrank, now),
+                "impressions": project["impressions"],
+                "created_at": project["created_at"],
+            })
+        return cls(version, items)
+
+    def page(self, limit, offset=0, after=None):
+        """Return (items, has_more) for one page.
+
+        `after` is the `(final_score, project_id)` of the last item already
+        served and takes precedence over `offset`.
+        """
+        start = offset
+        if after is not None:
+            start = bisect_right(self._keys, (-after[0], -after[1]))
+        items = self.items[start:start + limit]
+        return list(items), start + limit < len(self.items)
+
+
+class FeedCache:
+    """Process-wide holder of the current `FeedSnapshot`.
+
+    `FairRankEngine` calls `refresh` after every run; the new snapshot is
+    swapped in with a single reference assignment, so readers see either
+    the old or the new version, never a mix. Engines run from another
+    process (e.g. the CLI) cannot notify this one, so every
+    `FEED_SNAPSHOT_MAX_AGE` seconds one reader compares the scores
+    version stamp with the snapshot's and rebuilds only if it moved;
+    meanwhile the other readers keep getting the current snapshot.
+    """
+
+    _snapshot = None
+    _version = 0
+    _stamp = None  # scores version the snapshot was built from
+    _checked_at = 0.0  # time.monotonic() of the last stamp check
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _rebuild():
+        # caller holds _lock; read the stamp first so a run writing
+        # meanwhile shows as a change at the next check
+        stamp = FairRankRepository.get_scores_version()
+        rows = FairRankRepository.get_ranked_feed(limit=None)
+        FeedCache._version += 1
+        snapshot = FeedSnapshot.from_ranked_rows(FeedCache._version, rows)
+        FeedCache._snapshot, FeedCache._stamp = snapshot, stamp
+        FeedCache._checked_at = time.monotonic()
+        logger.info("Published feed snapshot v%d: items=%d", snapshot.version, len(snapshot))
+        return snapshot
+
+    @staticmethod
+    def refresh():
+        """Rebuild the snapshot from `fair_rank_scores` and publish it."""
+        with FeedCache._lock:
+            return FeedCache._rebuild()
+
+    @staticmethod
+    def get_snapshot():
+        """Return the current snapshot, building it if missing.
+
+        Only the first build makes readers wait. Once
+        `FEED_SNAPSHOT_MAX_AGE` has passed, the reader that gets the lock
+        checks the scores stamp (and rebuilds if it moved); concurrent
+        readers are served the current snapshot instead of queueing.
+        """
+        snapshot = FeedCache._snapshot
+        if snapshot is None:
+            with FeedCache._lock:
+                # another thread may have built it while we waited
+                current = FeedCache._snapshot
+                return current if current is not None else FeedCache._rebuild()
+        max_age = settings.FEED_SNAPSHOT_MAX_AGE
+        if max_age > 0 and time.monotonic() - FeedCache._checked_at > max_age:
+            if FeedCache._lock.acquire(blocking=False):
+                try:
+                    if FeedCache._snapshot is snapshot:
+                        if FairRankRepository.get_scores_version() != FeedCache._stamp:
+                            return FeedCache._rebuild()
+                        FeedCache._checked_at = time.monotonic()
+                    return FeedCache._snapshot
+                finally:
+                    FeedCache._lock.release()
+        return snapshot
+
+    @staticmethod
+    def invalidate():
+        """Drop the snapshot; the next read rebuilds it from the DB."""
+        FeedCache._snapshot = None
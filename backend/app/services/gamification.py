@@ -2,6 +2,9 @@ from datetime import datetime
 from app.repositories.creators import CreatorRepository
 from app.repositories.base import BaseRepository
 from app.repositories.rewards import RewardRepository, compute_level
+from app.repositories.engagements import EngagementRepository
+from app.repositories.projects import ProjectRepository
+from app.services.reward_queue import get_reward_queue
 from app.core.logger import get_logger
 
 logger = get_logger(__name__)
@@ -9,6 +12,7 @@ logger = get_logger(__name__)
 
 class GamificationService:
     LEVEL_THRESHOLDS = [0, 100, 300, 700, 1500]
+    ENGAGEMENT_BONUS_REACTIONS = ("like", "comment")
 
     @staticmethod
     def level_for_points(points: int) -> int:
@@ -27,3 +31,20 @@ class GamificationService:
         except Exception:
             logger.exception("Failed to award points to %s", creator_id)
             raise
+
+    @staticmethod
+    def record_engagement(project_id, user_id, reaction, weight=1.0):
+        """Store an engagement and reward the project's creator for likes/comments.
+
+        The bonus is applied by the reward queue, off the request path; a
+        reward error never fails the engagement.
+        """
+        rowid = EngagementRepository.create_engagement(project_id, user_id, reaction, weight)
+        try:
+            if reaction and reaction.lower() in GamificationService.ENGAGEMENT_BONUS_REACTIONS:
+                project = ProjectRepository.get_project(project_id)
+                if project:
+                    get_reward_queue().submit(project.get("creator_id"), "Engagement Bonus", 1)
+        except Exception:
+            logger.exception("Failed to queue engagement bonus for project %s", project_id)
+        return rowid
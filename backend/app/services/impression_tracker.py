@@ -0,0 +1,169 @@
+import threading
+import time
+
+from app.api.config import settings
+from app.core.logger import get_logger
+from app.repositories.projects import ProjectRepository
+
+logger = get_logger(__name__)
+
+
+class _Shard:
+    __slots__ = ("lock", "counts", "pending", "oldest")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = {}
+        self.pending = 0
+        self.oldest = None  # monotonic time of the oldest unflushed view
+
+
+class ImpressionTracker:
+    """Write-behind impression counter.
+
+    Views are added to in-memory counters sharded by project id, so
+    concurrent requests rarely contend on the same lock, and are written as
+    one batched `impressions = impressions + ?` transaction per flush. A
+    background thread (`start`) flushes every `flush_interval` seconds, or
+    sooner once a shard holds its share of `flush_threshold` views.
+
+    Durability: a flush either commits every count or none, and on failure
+    the counts are merged back for the next attempt, so views are never
+    double counted. `stop` performs a final flush; only a hard crash can
+    lose views, at most those recorded since the last flush.
+    """
+
+    def __init__(self, shards=16, flush_interval=5.0, flush_threshold=1000):
+        self._shards = [_Shard() for _ in range(max(1, shards))]
+        self.flush_interval = flush_interval
+        self.shard_threshold = max(1, flush_threshold // len(self._shards))
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.flushed_views = 0
+        self.last_flush_at = None
+        self.last_flush_seconds = 0.0
+        self.last_flush_lag = 0.0
+
+    def record(self, project_ids):
+        """Count one view for each id in `project_ids` (repeats add up)."""
+        for project_id in project_ids:
+            shard = self._shards[project_id % len(self._shards)]
+            with shard.lock:
+                shard.counts[project_id] = shard.counts.get(project_id, 0) + 1
+                shard.pending += 1
+                if shard.oldest is None:
+                    shard.oldest = time.monotonic()
+                full = shard.pending >= self.shard_threshold
+            if full:
+                self._wakeup.set()
+
+    def _drain(self):
+        counts, oldest = {}, None
+        for shard in self._shards:
+            with shard.lock:
+                shard_counts, shard_oldest = shard.counts, shard.oldest
+                shard.counts, shard.pending, shard.oldest = {}, 0, None
+            for project_id, n in shard_counts.items():
+                counts[project_id] = counts.get(project_id, 0) + n
+            if shard_oldest is not None and (oldest is None or shard_oldest < oldest):
+                oldest = shard_oldest
+        return counts, oldest
+
+    def _restore(self, counts, oldest):
+        for project_id, n in counts.items():
+            shard = self._shards[project_id % len(self._shards)]
+            with shard.lock:
+                shard.counts[project_id] = shard.counts.get(project_id, 0) + n
+                shard.pending += n
+                if shard.oldest is None or oldest < shard.oldest:
+                    shard.oldest = oldest
+
+    def flush(self):
+        """Write all pending views to the database; returns views written."""
+        with self._flush_lock:
+            counts, oldest = self._drain()
+            if not counts:
+                return 0
+            start = time.monotonic()
+            try:
+                ProjectRepository.increment_impressions(counts)
+            except Exception:
+                self.failed_flushes += 1
+                self._restore(counts, oldest)
+                logger.exception("Impression flush failed; %d views re-queued", sum(counts.values()))
+                return 0
+            views = sum(counts.values())
+            now = time.monotonic()
+            self.flushes += 1
+            self.flushed_views += views
+            self.last_flush_at = time.time()
+            self.last_flush_seconds = now - start
+            self.last_flush_lag = now - oldest
+            logger.debug("Flushed %d views for %d projects in %.3fs", views, len(counts), self.last_flush_seconds)
+            return views
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def start(self):
+        """Start the background flush thread (idempotent)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="impression-flush", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the flush thread and write whatever is still pending."""
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def stats(self) -> dict:
+        pending = 0
+        oldest = None
+        for shard in self._shards:
+            with shard.lock:
+                pending += shard.pending
+                if shard.oldest is not None and (oldest is None or shard.oldest < oldest):
+                    oldest = shard.oldest
+        return {
+            "pending_views": pending,
+            "flush_lag_seconds": time.monotonic() - oldest if oldest is not None else 0.0,
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes,
+            "flushed_views": self.flushed_views,
+            "last_flush_at": self.last_flush_at,
+            "last_flush_seconds": self.last_flush_seconds,
+            "last_flush_lag_seconds": self.last_flush_lag,
+            "running": self._thread is not None and self._thread.is_alive(),
+        }
+
+
+_tracker = None
+_tracker_lock = threading.Lock()
+
+
+def get_impression_tracker() -> ImpressionTracker:
+    """Return the process-wide tracker, creating it on first use."""
+    global _tracker
+    if _tracker is None:
+        with _tracker_lock:
+            if _tracker is None:
+                _tracker = ImpressionTracker(
+                    settings.IMPRESSION_SHARDS,
+                    settings.IMPRESSION_FLUSH_INTERVAL,
+                    settings.IMPRESSION_FLUSH_THRESHOLD,
+                )
+    return _tracker
@@ -0,0 +1,250 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+
+from app.api.config import settings
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Raised inside a job function by `Job.check_cancelled`."""
+
+
+class Job:
+    """One engine run tracked by `JobRunner`.
+
+    The job function receives the job itself and may report progress with
+    `set_progress` and honour cancellation with `check_cancelled` between
+    steps; cancellation is cooperative. `future` resolves (never raises)
+    once the job has finished, whatever its outcome.
+    """
+
+    def __init__(self, kind, func, mode=None, scope=0):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.func = func
+        self.mode = mode
+        self.scope = scope
+        self.status = QUEUED
+        self.progress = 0.0
+        self.message = None
+        self.error = None
+        self.result = None
+        self.coalesced = 0  # triggers folded into this job
+        self.created_at = datetime.utcnow()
+        self.started_at = None
+        self.finished_at = None
+        self.future = Future()
+        self._started = None
+        self._duration = None
+        self._cancel = threading.Event()
+
+    @property
+    def finished(self):
+        return self.status in FINISHED
+
+    @property
+    def duration(self):
+        if self._started is None:
+            return None
+        if self._duration is not None:
+            return self._duration
+        return time.monotonic() - self._started
+
+    def set_progress(self, fraction, message=None):
+        self.progress = max(0.0, min(1.0, float(fraction)))
+        if message is not None:
+            self.message = message
+
+    def check_cancelled(self):
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def wait(self, timeout=None):
+        """Block until the job has finished; returns the job."""
+        return self.future.result(timeout)
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "mode": self.mode,
+            "status": self.status,
+            "progress": self.progress,
+            "message": self.message,
+            "error": self.error,
+            "coalesced": self.coalesced,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "duration_seconds": self.duration,
+        }
+
+
+class JobRunner:
+    """In-process background job executor with per-kind coalescing.
+
+    Jobs of the same `kind` (e.g. one engine) never run concurrently: while
+    one is running, the first new trigger becomes a single queued follow-up
+    run and later triggers join that follow-up instead of adding more runs.
+    A trigger with a wider `scope` than the queued follow-up (e.g. a full
+    run vs. an incremental one) upgrades it to its own function and mode,
+    so every joined trigger gets at least the run it asked for.
+    Jobs run on a small worker thread pool; the most recent `history` jobs
+    are kept in memory for status lookups.
+    """
+
+    def __init__(self, max_workers=2, history=100):
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="job")
+        self.history = max(1, history)
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()
+        self._running = {}  # kind -> job
+        self._queued = {}  # kind -> follow-up waiting for the running job
+
+    def submit(self, kind, func, mode=None, scope=0) -> Job:
+        """Schedule `func(job)` as a `kind` job; returns the new or joined job."""
+        with self._lock:
+            queued = self._queued.get(kind)
+            if queued is not None:
+                queued.coalesced += 1
+                if scope > queued.scope:
+                    queued.func, queued.mode, queued.scope = func, mode, scope
+                    logger.info("Upgraded queued %s job %s to %s", kind, queued.id, mode)
+                logger.info("Coalesced %s trigger into queued job %s", kind, queued.id)
+                return queued
+            job = Job(kind, func, mode, scope)
+            self._jobs[job.id] = job
+            self._prune()
+            if kind in self._running:
+                self._queued[kind] = job
+                logger.info("Queued %s job %s behind running job %s", kind, job.id, self._running[kind].id)
+            else:
+                self._running[kind] = job
+                self._executor.submit(self._run, job)
+                logger.info("Started %s job %s", kind, job.id)
+            return job
+
+    def _prune(self):
+        # caller holds _lock; drop the oldest finished jobs beyond `history`
+        excess = len(self._jobs) - self.history
+        for job_id in [jid for jid, job in self._jobs.items() if job.finished][:max(0, excess)]:
+            del self._jobs[job_id]
+
+    def _run(self, job):
+        if not job._cancel.is_set():
+            job.status = RUNNING
+            job.started_at = datetime.utcnow()
+            job._started = time.monotonic()
+            try:
+                job.result = job.func(job)
+                job.set_progress(1.0)
+                job.status = SUCCEEDED
+            except JobCancelled:
+                job.status = CANCELLED
+            except Exception as e:
+                job.status = FAILED
+                job.error = str(e)
+                logger.exception("%s job %s failed", job.kind, job.id)
+            job._duration = time.monotonic() - job._started
+        else:
+            job.status = CANCELLED
+        self._finish(job)
+
+        with self._lock:
+            if self._running.get(job.kind) is job:
+                del self._running[job.kind]
+            follow_up = self._queued.pop(job.kind, None)
+            if follow_up is not None:
+                self._running[job.kind] = follow_up
+                self._executor.submit(self._run, follow_up)
+
+    @staticmethod
+    def _finish(job):
+        job.finished_at = datetime.utcnow()
+        logger.info("%s job %s %s in %.3fs", job.kind, job.id, job.status, job.duration or 0.0)
+        job.future.set_result(job)
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """Cancel a job: a queued one at once, a running one at its next check.
+
+        Returns the job, or None if it is unknown.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return job
+            job._cancel.set()
+            if self._queued.get(job.kind) is job:
+                del self._queued[job.kind]
+                job.status = CANCELLED
+                self._finish(job)
+        return job
+
+    def shutdown(self, wait=True):
+        """Cancel queued follow-ups and (optionally) wait for running jobs."""
+        with self._lock:
+            queued = list(self._queued.values())
+            self._queued.clear()
+            running = list(self._running.values())
+        for job in queued:
+            job._cancel.set()
+            job.status = CANCELLED
+            self._finish(job)
+        for job in running:
+            job._cancel.set()
+        self._executor.shutdown(wait=wait)
+
+    def stats(self) -> dict:
+        with self._lock:
+            jobs = list(self._jobs.values())
+            running = sorted(self._running)
+            queued = sorted(self._queued)
+        counts = {}
+        for job in jobs:
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "running": running,
+            "queued": queued,
+            "by_status": counts,
+            "coalesced": sum(job.coalesced for job in jobs),
+        }
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def get_job_runner() -> JobRunner:
+    """Return the process-wide job runner, creating it on first use."""
+    global _runner
+    if _runner is None:
+        with _runner_lock:
+            if _runner is None:
+                _runner = JobRunner(settings.JOB_WORKERS, settings.JOB_HISTORY)
+    return _runner
+
+
+def shutdown_job_runner():
+    """Stop the process-wide runner (called on application shutdown)."""
+    global _runner
+    with _runner_lock:
+        if _runner is not None:
+            _runner.shutdown()
+            _runner = None
@@ -31,51 +31,313 @@ class MatchingEngine:
             except Exception:
                 logger.exception("Failed to compute/insert match for creator_id=%s", c.get("creator_id"))
                 raise
+import heapq
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from app.api.config import settings
 from app.core.logger import get_logger
 from app.repositories.creators import CreatorRepository
 from app.repositories.collab import CollabRepository
+from app.services.skill_index import SkillIndex, tokenize_skills
+from app.services.reward_queue import get_reward_queue
 
 logger = get_logger(__name__)
 
 
+def select_matches(scores, top_k=None, min_score=None):
+    """Pick [(creator_id, score)] from a {creator_id: score} dict, best first.
+
+    Ties are broken by creator id; `top_k` bounds the result with a heap.
+    """
+    candidates = scores.items()
+    if min_score is not None:
+        candidates = [(cid, score) for cid, score in candidates if score >= min_score]
+    key = lambda item: (item[1], -item[0])  # noqa: E731
+    if top_k:
+        return heapq.nlargest(top_k, candidates, key=key)
+    return sorted(candidates, key=key, reverse=True)
+
+
+# Process pool workers for `MatchingEngine.run_batch`: each builds its own
+# index once from the creator rows passed to the initializer.
+_worker_index = None
+
+
+def _init_worker(creators):
+    global _worker_index
+    _worker_index = SkillIndex(creators)
+
+
+def _score_chunk(requests, top_k, min_score):
+    return [
+        (
+            request["request_id"],
+            select_matches(
+                _worker_index.score(
+                    request["skills_needed"],
+                    request["location_pref"],
+                    skill_weight=MatchingEngine.SKILL_WEIGHT,
+                    location_weight=MatchingEngine.LOCATION_WEIGHT,
+                ),
+                top_k,
+                min_score,
+            ),
+        )
+        for request in requests
+    ]
+
+
 class MatchingEngine:
     """Simple matching engine that scores creators against a collaboration
 
     request using skill overlap and location preference. Each match is
     written to the `collab_matches` table.
+
+    Candidates come from an in-memory `SkillIndex`, so only creators that
+    share a skill or the preferred location are scored; creators with a
+    zero score are not stored. The index is built on first use and kept
+    current through `CreatorRepository` change notifications.
+
+    `run` keeps only the `top_k` best candidates scoring at least
+    `min_score` (selected with a heap) and replaces the request's previous
+    matches with them, so each run writes O(K) rows.
+
+    `get_matches` is the read path used by the API: results are cached per
+    request together with the request's criteria and the creator profile
+    version (`CreatorRepository.get_profile_version`). A repeat call with
+    nothing changed is served from the cache; after a profile change the
+    request is rescored in memory, and `collab_matches` is only rewritten
+    if the result actually differs, so unrelated profile edits cause no
+    writes.
     """
 
+    SKILL_WEIGHT = 2
+    LOCATION_WEIGHT = 1
+    MATCH_BONUS_TYPE = "Collaboration Bonus"
+    MATCH_BONUS = 5
+
+    _index = None
+    _index_stamp = None  # profile version the index reflects
+    _index_lock = threading.Lock()
+
+    # request_id -> (criteria, profile stamp, [(creator_id, score)])
+    _results = OrderedDict()
+    _results_lock = threading.Lock()
+    cache_hits = 0
+    cache_misses = 0
+    match_writes = 0
+
     @staticmethod
     def skill_overlap(skills1, skills2):
         """Return the number of overlapping skills between two comma-separated strings."""
-        if not skills1 or not skills2:
-            return 0
-        s1 = set(s.strip().lower() for s in skills1.split(",") if s.strip())
-        s2 = set(s.strip().lower() for s in skills2.split(",") if s.strip())
-        return len(s1 & s2)
+        return len(tokenize_skills(skills1) & tokenize_skills(skills2))
 
     @staticmethod
-    def run(request_id):
-        logger.info("Running MatchingEngine for request_id=%s", request_id)
+    def get_index(rebuild: bool = False, stamp=None):
+        """Return the process-wide skill index, building it on first use.
+
+        Passing the current profile `stamp` also rebuilds an index that
+        missed changes, e.g. profiles edited by another process.
+        """
+        index = MatchingEngine._index
+        stale = stamp is not None and stamp != MatchingEngine._index_stamp
+        if index is None or rebuild or stale:
+            with MatchingEngine._index_lock:
+                stale = stamp is not None and stamp != MatchingEngine._index_stamp
+                if MatchingEngine._index is None or rebuild or stale:
+                    # read the stamp first so changes made during the build show as stale
+                    MatchingEngine._index_stamp = CreatorRepository.get_profile_version()
+                    MatchingEngine._index = SkillIndex(CreatorRepository.get_all_creators())
+                    logger.info("Built skill index: creators=%d", len(MatchingEngine._index))
+                index = MatchingEngine._index
+        return index
+
+    @staticmethod
+    def invalidate_index():
+        """Drop the cached index and results; the next run rebuilds from the DB."""
+        MatchingEngine._index = None
+        MatchingEngine._index_stamp = None
+        with MatchingEngine._results_lock:
+            MatchingEngine._results.clear()
+
+    @staticmethod
+    def refresh_creator(creator_id):
+        """Re-read one creator profile into the index (no-op before first build)."""
+        index = MatchingEngine._index
+        if index is None:
+            return
+        creator = CreatorRepository.get_creator(creator_id)
+        if creator:
+            index.update(creator)
+        else:
+            index.remove(creator_id)
+        stamp = CreatorRepository.get_profile_version()
+        with MatchingEngine._index_lock:
+            current = MatchingEngine._index_stamp
+            # at most one version ahead means the only change was this one
+            if (MatchingEngine._index is index and current and stamp
+                    and stamp[0] == current[0] and stamp[1] - current[1] <= 1):
+                MatchingEngine._index_stamp = stamp
+
+    @staticmethod
+    def score_request(request, top_k=None, min_score=None):
+        """Return [(creator_id, score)] best first, ties broken by creator id.
+
+        Only creators scoring at least `min_score` (default: any non-zero
+        score) are returned; `top_k` bounds the result with a heap instead
+        of sorting every candidate.
+        """
+        scores = MatchingEngine.get_index().score(
+            request.get("skills_needed"),
+            request.get("location_pref"),
+            skill_weight=MatchingEngine.SKILL_WEIGHT,
+            location_weight=MatchingEngine.LOCATION_WEIGHT,
+        )
+        return select_matches(scores, top_k, min_score)
+
+    @staticmethod
+    def run(request_id, top_k=None, min_score=None):
+        """Score a request and persist its matches; returns [(creator_id, score)].
+
+        `top_k` and `min_score` default to `MATCH_TOP_K` and
+        `MATCH_MIN_SCORE`; `top_k=0` keeps every qualifying match.
+        """
+        top_k = settings.MATCH_TOP_K if top_k is None else top_k
+        min_score = settings.MATCH_MIN_SCORE if min_score is None else min_score
+        logger.info("Running MatchingEngine for request_id=%s top_k=%s min_score=%s",
+                    request_id, top_k, min_score)
         request = CollabRepository.get_request(request_id)
-        creators = CreatorRepository.get_all_creators()
 
         if not request:
             logger.warning("No collab request found for id=%s", request_id)
-            return
+            return None
 
-        for c in creators:
-            try:
-                skill_score = MatchingEngine.skill_overlap(
-                    request.get("skills_needed"),
-                    c.get("skills"),
+        matches = MatchingEngine.score_request(request, top_k=top_k, min_score=min_score)
+
+        with MatchingEngine._results_lock:
+            MatchingEngine._results.pop(request_id, None)
+        try:
+            MatchingEngine.award_new_matches(CollabRepository.replace_matches(request_id, matches))
+        except Exception:
+            logger.exception("Failed to insert matches for request_id=%s", request_id)
+            raise
+
+        logger.info("MatchingEngine stored %d matches for request_id=%s", len(matches), request_id)
+        return matches
+
+    @staticmethod
+    def award_new_matches(creator_ids):
+        """Queue the collaboration bonus for newly matched creators (after the write commits)."""
+        get_reward_queue().submit_many(
+            (creator_id, MatchingEngine.MATCH_BONUS_TYPE, MatchingEngine.MATCH_BONUS) for creator_id in creator_ids
+        )
+
+    @staticmethod
+    def get_matches(request_id, top_k=None, min_score=None):
+        """Return the request's [(creator_id, score)], rescoring only when needed.
+
+        Returns None if the request does not exist.
+        """
+        top_k = settings.MATCH_TOP_K if top_k is None else top_k
+        min_score = settings.MATCH_MIN_SCORE if min_score is None else min_score
+        request = CollabRepository.get_request(request_id)
+        if not request:
+            return None
+
+        criteria = (request.get("skills_needed"), request.get("location_pref"), top_k, min_score)
+        stamp = CreatorRepository.get_profile_version()
+        with MatchingEngine._results_lock:
+            cached = MatchingEngine._results.get(request_id)
+            if cached is not None and cached[0] == criteria and cached[1] == stamp:
+                MatchingEngine._results.move_to_end(request_id)
+                MatchingEngine.cache_hits += 1
+                return cached[2]
+            MatchingEngine.cache_misses += 1
+
+        MatchingEngine.get_index(stamp=stamp)
+        matches = MatchingEngine.score_request(request, top_k=top_k, min_score=min_score)
+        if cached is not None and cached[0] == criteria:
+            previous = cached[2]
+        else:
+            previous = CollabRepository.get_match_scores(request_id)
+        if matches != previous:
+            MatchingEngine.award_new_matches(CollabRepository.replace_matches(request_id, matches))
+            MatchingEngine.match_writes += 1
+            logger.info("MatchingEngine stored %d matches for request_id=%s", len(matches), request_id)
+
+        with MatchingEngine._results_lock:
+            MatchingEngine._results[request_id] = (criteria, stamp, matches)
+            MatchingEngine._results.move_to_end(request_id)
+            while len(MatchingEngine._results) > max(1, settings.MATCH_CACHE_SIZE):
+                MatchingEngine._results.popitem(last=False)
+        return matches
+
+    @staticmethod
+    def run_batch(requests=None, top_k=None, min_score=None, workers=None):
+        """Match many requests at once (default: every open request).
+
+        The skill index is built once and each request is scored against
+        it; batches of at least `MATCH_PARALLEL_MIN_REQUESTS` are split
+        across a process pool of `workers` (default `MATCH_WORKERS`, or the
+        CPU count), each worker indexing the creators once. All results are
+        written with `CollabRepository.replace_matches_bulk`. Returns
+        {request_id: [(creator_id, score)]}.
+        """
+        top_k = settings.MATCH_TOP_K if top_k is None else top_k
+        min_score = settings.MATCH_MIN_SCORE if min_score is None else min_score
+        if requests is None:
+            requests = CollabRepository.get_open_requests()
+        requests = list(requests)
+        if not requests:
+            logger.info("MatchingEngine batch: no requests to match")
+            return {}
+
+        stamp = CreatorRepository.get_profile_version()
+        workers = workers or settings.MATCH_WORKERS or os.cpu_count() or 1
+        if workers > 1 and len(requests) >= settings.MATCH_PARALLEL_MIN_REQUESTS:
+            creators = [
+                {"creator_id": c["creator_id"], "skills": c["skills"], "location": c["location"]}
+                for c in CreatorRepository.get_all_creators()
+            ]
+            chunk_size = -(-len(requests) // (workers * 4))
+            chunks = [requests[i:i + chunk_size] for i in range(0, len(requests), chunk_size)]
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(creators,)) as pool:
+                futures = [pool.submit(_score_chunk, chunk, top_k, min_score) for chunk in chunks]
+                results = [item for future in futures for item in future.result()]
+        else:
+            workers = 1
+            MatchingEngine.get_index(stamp=stamp)
+            results = [
+                (request["request_id"], MatchingEngine.score_request(request, top_k, min_score))
+                for request in requests
+            ]
+
+        new_matches = CollabRepository.replace_matches_bulk(results)
+        MatchingEngine.award_new_matches(creator_id for _, creator_id in new_matches)
+        written = sum(len(matches) for _, matches in results)
+        with MatchingEngine._results_lock:
+            for request, (request_id, matches) in zip(requests, results):
+                MatchingEngine._results.pop(request_id, None)
+                MatchingEngine._results[request_id] = (
+                    (request["skills_needed"], request["location_pref"], top_k, min_score), stamp, matches
                 )
+            while len(MatchingEngine._results) > max(1, settings.MATCH_CACHE_SIZE):
+                MatchingEngine._results.popitem(last=False)
+        logger.info("MatchingEngine batch: requests=%d matches=%d workers=%d",
+                    len(results), written, workers)
+        return dict(results)
 
-                location_score = 1 if request.get("location_pref") == c.get("location") else 0
+    @staticmethod
+    def cache_stats() -> dict:
+        return {
+            "cached_requests": len(MatchingEngine._results),
+            "hits": MatchingEngine.cache_hits,
+            "misses": MatchingEngine.cache_misses,
+            "writes": MatchingEngine.match_writes,
+        }
 
-                total_score = skill_score * 2 + location_score
 
-                CollabRepository.insert_match(request_id, c["creator_id"], total_score)
-            except Exception:
-                logger.exception("Failed to compute/insert match for creator_id=%s", c.get("creator_id"))
-                raise
+CreatorRepository.add_change_listener(MatchingEngine.refresh_creator)
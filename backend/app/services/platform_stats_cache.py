@@ -0,0 +1,91 @@
+import threading
+import time
+from datetime import datetime
+
+from app.api.config import settings
+from app.core.logger import get_logger
+from app.repositories.platform_stats import PlatformStatsRepository
+from app.services.exposure_stats import get_exposure_stats
+
+logger = get_logger(__name__)
+
+
+class PlatformStatsCache:
+    """Process-wide, TTL-cached copy of the `/api/admin/stats` payload.
+
+    Each refresh computes the stats once (exposure figures from
+    `ExposureStats`, the other totals from one query) and materializes
+    them into the `platform_stats` row. `FairRankEngine` refreshes after
+    every run and passes the engagement Gini it computed; other refreshes
+    keep the one already stored. Reads serve the in-memory copy for `PLATFORM_STATS_TTL`
+    seconds; after that a row saved by another process (e.g. a CLI
+    engine run) is adopted if it is still within the TTL, otherwise the
+    stats are recomputed.
+    """
+
+    _stats = None
+    _built_at = 0.0
+    _lock = threading.Lock()
+
+    @staticmethod
+    def compute(engagement_gini=None) -> dict:
+        exposure = get_exposure_stats().snapshot()
+        totals = PlatformStatsRepository.get_totals()
+        if engagement_gini is None:
+            engagement_gini = totals["engagement_gini"]
+        return {
+            "total_projects": exposure["total_projects"],
+            "total_creators": totals["total_creators"],
+            "total_engagements": totals["total_engagements"],
+            "underexposed_projects": exposure["underexposed_projects"],
+            "avg_fairrank": totals["avg_fairrank"],
+            "exposure_distribution": exposure["exposure_distribution"],
+            "exposure_gini": exposure["exposure_gini"],
+            "exposure_gini_error": exposure["exposure_gini_error"],
+            "engagement_gini": engagement_gini,
+            "updated_at": datetime.utcnow().isoformat(),
+        }
+
+    @staticmethod
+    def _refresh(engagement_gini=None):
+        # caller holds _lock
+        stats = PlatformStatsCache.compute(engagement_gini)
+        PlatformStatsRepository.save_snapshot(stats)
+        PlatformStatsCache._stats = stats
+        PlatformStatsCache._built_at = time.monotonic()
+        logger.info("Refreshed platform stats snapshot: projects=%d", stats["total_projects"])
+        return stats
+
+    @staticmethod
+    def refresh(engagement_gini=None) -> dict:
+        """Recompute the stats, save them to `platform_stats` and cache them."""
+        with PlatformStatsCache._lock:
+            return PlatformStatsCache._refresh(engagement_gini)
+
+    @staticmethod
+    def get(fresh: bool = False) -> dict:
+        """Return the cached stats; `fresh` always recomputes."""
+        if fresh:
+            return PlatformStatsCache.refresh()
+        ttl = settings.PLATFORM_STATS_TTL
+        stats = PlatformStatsCache._stats
+        if stats is not None and time.monotonic() - PlatformStatsCache._built_at < ttl:
+            return stats
+        with PlatformStatsCache._lock:
+            current = PlatformStatsCache._stats
+            # another thread may have refreshed it while we waited
+            if current is not None and current is not stats:
+                return current
+            saved = PlatformStatsRepository.get_snapshot()
+            if saved is not None:
+                age = (datetime.utcnow() - datetime.fromisoformat(saved["updated_at"])).total_seconds()
+                if 0 <= age < ttl:
+                    PlatformStatsCache._stats = saved
+                    PlatformStatsCache._built_at = time.monotonic() - age
+                    return saved
+            return PlatformStatsCache._refresh()
+
+    @staticmethod
+    def invalidate():
+        """Drop the cached copy; the next read goes to `platform_stats` or recomputes."""
+        PlatformStatsCache._stats = None
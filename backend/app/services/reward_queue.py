@@ -0,0 +1,190 @@
+import queue
+import threading
+
+from app.api.config import settings
+from app.core.logger import get_logger
+from app.repositories.base import BaseRepository
+from app.repositories.rewards import RewardRepository
+
+logger = get_logger(__name__)
+
+_STOP = object()
+
+
+class RewardQueue:
+    """In-process queue that applies reward events off the request path.
+
+    `submit` enqueues a (creator_id, reward_type, value) event; a worker
+    thread takes up to `batch_size` events at a time and applies them with
+    `RewardRepository.add_rewards`, which writes every reward row but
+    coalesces the point updates to one per creator.
+
+    The backlog is bounded by `maxsize`: when it is full, or when the
+    worker is not running (CLI, scripts, tests), the event is applied
+    synchronously instead, so rewards are delayed but never dropped. `stop`
+    drains whatever is still queued.
+    """
+
+    def __init__(self, maxsize=10000, batch_size=500, flush_interval=0.5):
+        self._queue = queue.Queue(maxsize=maxsize)
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._thread = None
+        self._counter_lock = threading.Lock()
+
+        self.submitted = 0
+        self.applied = 0
+        self.batches = 0
+        self.failed = 0
+        self.applied_inline = 0
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _count(self, **deltas):
+        with self._counter_lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+    def submit(self, creator_id, reward_type, value):
+        """Queue a reward; applies it inline if the worker is down or the queue is full."""
+        if not creator_id:
+            return
+        event = (creator_id, reward_type, value)
+        self._count(submitted=1)
+        if self.running:
+            try:
+                self._queue.put_nowait(event)
+                return
+            except queue.Full:
+                logger.warning("Reward queue full (%d); applying reward inline", self.maxsize)
+        self._apply([event])
+        self._count(applied_inline=1)
+
+    def submit_many(self, events):
+        """`submit` for many (creator_id, reward_type, value) events.
+
+        Events that cannot be queued are applied inline as one batch.
+        """
+        inline = []
+        for event in events:
+            if not event[0]:
+                continue
+            self._count(submitted=1)
+            if self.running:
+                try:
+                    self._queue.put_nowait(event)
+                    continue
+                except queue.Full:
+                    logger.warning("Reward queue full (%d); applying reward inline", self.maxsize)
+            inline.append(event)
+        if inline:
+            self._apply(inline)
+            self._count(applied_inline=len(inline))
+
+    def _apply(self, events):
+        try:
+            # one transaction (a savepoint inside a caller's) for the whole
+            # batch: add_rewards commits per chunk, so a failure in a later
+            # chunk would otherwise leave earlier chunks paid before the retry
+            with BaseRepository.transaction():
+                RewardRepository.add_rewards(events)
+            self._count(applied=len(events), batches=1)
+            return
+        except Exception:
+            logger.exception("Batched reward apply failed; retrying %d events one by one", len(events))
+        # nothing from the batch landed; isolate the bad event(s) so the rest still does
+        for creator_id, reward_type, value in events:
+            try:
+                RewardRepository.add_reward(creator_id, reward_type, value)
+                self._count(applied=1)
+            except Exception:
+                self._count(failed=1)
+                logger.exception("Dropping reward for creator %s (%s, %s)", creator_id, reward_type, value)
+
+    def _take_batch(self, first):
+        events = [first]
+        while len(events) < self.batch_size:
+            try:
+                event = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if event is _STOP:
+                self._queue.put(_STOP)  # let the loop see it after this batch
+                break
+            events.append(event)
+        return events
+
+    def _run(self):
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            if first is _STOP:
+                return
+            self._apply(self._take_batch(first))
+
+    def start(self):
+        """Start the worker thread (idempotent)."""
+        if self.running:
+            return
+        self._thread = threading.Thread(target=self._run, name="reward-queue", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the worker and apply every event still in the backlog."""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+        self.drain()
+
+    def drain(self):
+        """Apply queued events synchronously; returns how many were applied."""
+        drained = 0
+        while True:
+            events = []
+            while len(events) < self.batch_size:
+                try:
+                    event = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if event is not _STOP:
+                    events.append(event)
+            if not events:
+                return drained
+            self._apply(events)
+            drained += len(events)
+
+    def stats(self) -> dict:
+        return {
+            "depth": self._queue.qsize(),
+            "maxsize": self.maxsize,
+            "submitted": self.submitted,
+            "applied": self.applied,
+            "applied_inline": self.applied_inline,
+            "batches": self.batches,
+            "failed": self.failed,
+            "running": self.running,
+        }
+
+
+_reward_queue = None
+_reward_queue_lock = threading.Lock()
+
+
+def get_reward_queue() -> RewardQueue:
+    """Return the process-wide reward queue, creating it on first use."""
+    global _reward_queue
+    if _reward_queue is None:
+        with _reward_queue_lock:
+            if _reward_queue is None:
+                _reward_queue = RewardQueue(
+                    settings.REWARD_QUEUE_MAXSIZE,
+                    settings.REWARD_QUEUE_BATCH_SIZE,
+                    settings.REWARD_QUEUE_FLUSH_INTERVAL,
+                )
+    return _reward_queue
@@ -75,10 +75,16 @@ import json
 import random
 import math
 import hashlib
+import threading
+import time
+from app.api.config import settings
 from app.core.logger import get_logger
+from app.repositories.base import BaseRepository
 from app.repositories.projects import ProjectRepository
 from app.repositories.embeddings import EmbeddingRepository
 from app.repositories.similarity import SimilarityRepository
+from app.services.embedding_snapshot import EmbeddingSnapshot
+from app.services.vector_index import VectorIndex, normalize_rows
 
 logger = get_logger(__name__)
 
@@ -87,24 +93,100 @@ class SimilarityEngine:
     """Generate or compute embeddings and populate project similarity table.
 
     - `generate_dummy_embeddings` creates pseudo-random vectors for each
-      project and persists them via `EmbeddingRepository.upsert_embedding`.
+      project and persists them via `EmbeddingRepository.upsert_embeddings`.
     - `compute_all_similarities` loads embeddings and writes pairwise
       similarities into `project_similarity` using `SimilarityRepository`.
+    - `compute_all_similarities_blocked` does the same with tiled NumPy
+      matrix products and keeps only pairs above a threshold.
+    - `find_similar` answers top-K queries from an in-process
+      `VectorIndex`, rebuilt when the embedding version stamp moves;
+      `compute_top_k_similarities` persists only the top-K neighbours per
+      project instead of every pair.
+    - `export_snapshot` / `load_snapshot` keep a memory-mapped `.npy` copy
+      of the normalized embedding matrix that workers can share; it is
+      rebuilt only when the embedding version stamp changes.
     """
 
     VECTOR_DIM = 8
 
+    _index = None
+    _index_stamp = None  # embedding version the index reflects
+    _index_checked_at = 0.0  # time.monotonic() of the last stamp check
+    _index_lock = threading.Lock()
+
+    @staticmethod
+    def project_text(project):
+        return "{} {}".format(project.get("title") or "", project.get("description") or "")
+
     @staticmethod
     def generate_dummy_embeddings(dim: int = None):
         dim = dim or SimilarityEngine.VECTOR_DIM
         logger.info("Generating dummy embeddings dim=%d", dim)
         projects = ProjectRepository.get_all_projects()
 
-        for p in projects:
-            text = "{} {}".format(p.get("title") or "", p.get("description") or "")
-            vector = SimilarityEngine.text_to_embedding(text, dim)
-            # EmbeddingRepository handles JSON serialization
-            EmbeddingRepository.upsert_embedding(p["project_id"], vector)
+        # EmbeddingRepository handles JSON serialization and batching
+        EmbeddingRepository.upsert_embeddings(
+            (
+                p["project_id"],
+                SimilarityEngine.text_to_embedding(SimilarityEngine.project_text(p), dim),
+            )
+            for p in projects
+        )
+        SimilarityEngine.invalidate_index()
+
+    @staticmethod
+    def generate_embedding_for_project(project_id, dim: int = None):
+        """(Re)compute and store the embedding of a single project.
+
+        Uses the dimension of the stored embeddings so the new vector stays
+        comparable with the rest of the catalog, and updates the cached
+        index row in place instead of invalidating it.
+        """
+        project = ProjectRepository.get_project(project_id)
+        if not project:
+            logger.warning("No project found for id=%s", project_id)
+            return None
+        dim = dim or SimilarityEngine.embedding_dim()
+        vector = SimilarityEngine.text_to_embedding(SimilarityEngine.project_text(project), dim)
+        with BaseRepository.transaction():
+            # the write lock is held, so the two stamps bracket exactly this write
+            before = EmbeddingRepository.get_version()
+            EmbeddingRepository.upsert_embedding(project_id, vector)
+            after = EmbeddingRepository.get_version()
+        SimilarityEngine.update_index(project_id, vector, before, after)
+        return vector
+
+    @staticmethod
+    def embedding_dim():
+        """Dimension for new embeddings: the cached index's, else one stored row's."""
+        index = SimilarityEngine._index
+        if index is not None and index.dim:
+            return index.dim
+        return EmbeddingRepository.get_dimension() or SimilarityEngine.VECTOR_DIM
+
+    @staticmethod
+    def update_index(project_id, vector, stamp_before=None, stamp_after=None):
+        """Add or replace one project's row in the cached index, if one is built.
+
+        Vectors of another dimension are left out, as `build_index` would.
+        If the index reflected `stamp_before`, the embedding version just
+        before this write, it now reflects `stamp_after` and needs no
+        rebuild; otherwise the next stamp check rebuilds it.
+        """
+        with SimilarityEngine._index_lock:
+            index = SimilarityEngine._index
+            if index is None:
+                return
+            if not len(index):
+                SimilarityEngine.invalidate_index()  # nothing cached worth keeping
+                return
+            if len(vector) != index.dim:
+                logger.warning("Not indexing project %s: dim %d != index dim %d",
+                               project_id, len(vector), index.dim)
+                return
+            index.upsert(project_id, vector)
+            if stamp_before is not None and stamp_before == SimilarityEngine._index_stamp:
+                SimilarityEngine._index_stamp = stamp_after
 
     @staticmethod
     def text_to_embedding(text: str, dim: int):
@@ -156,18 +238,153 @@ class SimilarityEngine:
             parsed = {e["project_id"]: e["embedding"] for e in embeddings}
             project_ids = list(parsed.keys())
 
-            for i in range(len(project_ids)):
-                for j in range(i + 1, len(project_ids)):
-                    p1 = project_ids[i]
-                    p2 = project_ids[j]
-
-                    sim = SimilarityEngine.cosine_similarity(parsed[p1], parsed[p2])
+            def pairs():
+                for i in range(len(project_ids)):
+                    for j in range(i + 1, len(project_ids)):
+                        p1 = project_ids[i]
+                        p2 = project_ids[j]
+                        sim = SimilarityEngine.cosine_similarity(parsed[p1], parsed[p2])
+                        yield p1, p2, float(sim)
 
-                    # store an undirected similarity; repository ensures uniqueness
-                    SimilarityRepository.upsert_similarity(p1, p2, float(sim))
+            # store undirected similarities, streamed in chunked transactions
+            SimilarityRepository.upsert_similarities(pairs())
 
             logger.info("Similarity computation complete: pairs=%d",
                         max(0, len(project_ids) * (len(project_ids) - 1) // 2))
         except Exception:
             logger.exception("compute_all_similarities failed")
             raise
+
+    @staticmethod
+    def export_snapshot(directory: str = None):
+        """Write the normalized embedding matrix to `directory` and return it mmapped."""
+        directory = directory or settings.EMBEDDING_SNAPSHOT_DIR
+        # read the stamp first: a concurrent write makes the snapshot look
+        # stale (and get rebuilt) rather than fresh
+        stamp = EmbeddingRepository.get_version()
+        project_ids, matrix = EmbeddingRepository.get_embedding_matrix()
+        return EmbeddingSnapshot.write(directory, project_ids, normalize_rows(matrix), stamp)
+
+    @staticmethod
+    def load_snapshot(directory: str = None):
+        """Return the current snapshot in `directory`, re-exporting it if stale."""
+        directory = directory or settings.EMBEDDING_SNAPSHOT_DIR
+        snapshot = EmbeddingSnapshot.load(directory)
+        if snapshot is not None and snapshot.stamp == EmbeddingRepository.get_version():
+            return snapshot
+        logger.info("Embedding snapshot in %s is missing or stale; rebuilding", directory)
+        return SimilarityEngine.export_snapshot(directory)
+
+    @staticmethod
+    def build_index():
+        """Return (embedding version stamp, `VectorIndex`) over the stored embeddings."""
+        kwargs = dict(lsh_tables=settings.SIMILARITY_LSH_TABLES, lsh_bits=settings.SIMILARITY_LSH_BITS)
+        if settings.EMBEDDING_SNAPSHOT_DIR:
+            snapshot = SimilarityEngine.load_snapshot()
+            if snapshot is not None:
+                return snapshot.stamp, VectorIndex(snapshot.project_ids, snapshot.matrix, normalized=True, **kwargs)
+        # read the stamp first so writes made during the build show as stale
+        stamp = EmbeddingRepository.get_version()
+        project_ids, matrix = EmbeddingRepository.get_embedding_matrix()
+        return stamp, VectorIndex(project_ids, matrix, **kwargs)
+
+    @staticmethod
+    def index_stale():
+        """True if embeddings changed since the index was built.
+
+        Compares version stamps at most every
+        `SIMILARITY_INDEX_CHECK_INTERVAL` seconds; this catches embeddings
+        written by other processes (API workers, CLI runs) and projects
+        deleted since, whose embeddings go with them.
+        """
+        now = time.monotonic()
+        if now - SimilarityEngine._index_checked_at < settings.SIMILARITY_INDEX_CHECK_INTERVAL:
+            return False
+        SimilarityEngine._index_checked_at = now
+        return EmbeddingRepository.get_version() != SimilarityEngine._index_stamp
+
+    @staticmethod
+    def get_index(rebuild: bool = False):
+        """Return the process-wide vector index, building it on first use
+        and rebuilding it once `index_stale` reports changes."""
+        index = SimilarityEngine._index
+        stale = index is not None and not rebuild and SimilarityEngine.index_stale()
+        if index is None or rebuild or stale:
+            with SimilarityEngine._index_lock:
+                # another thread may have rebuilt it while we waited
+                if SimilarityEngine._index is None or rebuild or (stale and SimilarityEngine._index is index):
+                    stamp, built = SimilarityEngine.build_index()
+                    SimilarityEngine._index, SimilarityEngine._index_stamp = built, stamp
+                    SimilarityEngine._index_checked_at = time.monotonic()
+                    logger.info("Built vector index: projects=%d dim=%d", len(built), built.dim)
+                index = SimilarityEngine._index
+        return index
+
+    @staticmethod
+    def invalidate_index():
+        """Drop the cached index; the next query rebuilds it from the DB."""
+        SimilarityEngine._index = None
+        SimilarityEngine._index_stamp = None
+
+    @staticmethod
+    def find_similar(project_id, k: int = None):
+        """Return up to `k` (project_id, similarity) neighbours from the index."""
+        k = k or settings.SIMILARITY_TOP_K
+        return SimilarityEngine.get_index().query(project_id, k)
+
+    @staticmethod
+    def compute_top_k_similarities(k: int = None):
+        """Replace `project_similarity` with each project's top-K neighbours.
+
+        Stores O(n * k) rows instead of O(n^2); an undirected pair that is
+        in both projects' top-K is written once.
+        """
+        k = k or settings.SIMILARITY_TOP_K
+        logger.info("Computing top-%d similarities", k)
+        try:
+            index = SimilarityEngine.get_index(rebuild=True)
+
+            def pairs():
+                seen = set()
+                for pid, neighbours in index.top_k_all(k):
+                    for nid, score in neighbours:
+                        key = (min(pid, nid), max(pid, nid))
+                        if key in seen:
+                            continue
+                        seen.add(key)
+                        yield key[0], key[1], score
+
+            # swap the table contents atomically for readers
+            with BaseRepository.transaction():
+                SimilarityRepository.delete_all()
+                written = SimilarityRepository.upsert_similarities(pairs())
+
+            logger.info("Top-K similarity computation complete: projects=%d pairs=%d", len(index), written)
+            return written
+        except Exception:
+            logger.exception("compute_top_k_similarities failed")
+            raise
+
+    @staticmethod
+    def compute_all_similarities_blocked(threshold: float = None, block_size: int = None):
+        """All-pairs similarity via blocked `E @ E.T` on a normalized float32 matrix.
+
+        Replaces `project_similarity` with every pair whose similarity is
+        at least `threshold`; peak memory is one `block_size` x
+        `block_size` tile rather than per-pair Python lists.
+        """
+        threshold = settings.SIMILARITY_MIN_SCORE if threshold is None else threshold
+        block_size = block_size or settings.SIMILARITY_BLOCK_SIZE
+        logger.info("Computing blocked pairwise similarities threshold=%.3f block_size=%d",
+                    threshold, block_size)
+        try:
+            index = SimilarityEngine.get_index(rebuild=True)
+            with BaseRepository.transaction():
+                SimilarityRepository.delete_all()
+                written = SimilarityRepository.upsert_similarities(index.pairs_above(threshold, block_size))
+
+            logger.info("Blocked similarity computation complete: projects=%d pairs=%d", len(index), written)
+            return written
+        except Exception:
+            logger.exception("compute_all_similarities_blocked failed")
+            raise
@@ -0,0 +1,88 @@
+import threading
+from collections import Counter
+
+
+def tokenize_skills(skills):
+    """Split a comma-separated skills string into a set of lowercase tokens."""
+    if not skills:
+        return frozenset()
+    return frozenset(s.strip().lower() for s in skills.split(",") if s.strip())
+
+
+class SkillIndex:
+    """Inverted index of creator profiles for collaboration matching.
+
+    Maps each lowercase skill token to the creators listing it, and each
+    location to the creators there, so a request only scores creators that
+    can get a non-zero score. Skills are tokenized once per profile rather
+    than once per request.
+    """
+
+    def __init__(self, creators=()):
+        self._lock = threading.Lock()
+        self._skills = {}
+        self._locations = {}
+        self._by_skill = {}
+        self._by_location = {}
+        for creator in creators:
+            self._add(creator)
+
+    def __len__(self):
+        return len(self._skills)
+
+    def __contains__(self, creator_id):
+        return creator_id in self._skills
+
+    def _add(self, creator):
+        creator_id = creator["creator_id"]
+        skills = tokenize_skills(creator.get("skills"))
+        location = creator.get("location")
+        self._skills[creator_id] = skills
+        self._locations[creator_id] = location
+        for skill in skills:
+            self._by_skill.setdefault(skill, set()).add(creator_id)
+        self._by_location.setdefault(location, set()).add(creator_id)
+
+    def _remove(self, creator_id):
+        skills = self._skills.pop(creator_id, None)
+        if skills is None:
+            return
+        for skill in skills:
+            postings = self._by_skill.get(skill)
+            if postings is not None:
+                postings.discard(creator_id)
+                if not postings:
+                    del self._by_skill[skill]
+        location = self._locations.pop(creator_id)
+        postings = self._by_location.get(location)
+        if postings is not None:
+            postings.discard(creator_id)
+            if not postings:
+                del self._by_location[location]
+
+    def update(self, creator):
+        """Insert or replace one creator profile row."""
+        with self._lock:
+            self._remove(creator["creator_id"])
+            self._add(creator)
+
+    def remove(self, creator_id):
+        with self._lock:
+            self._remove(creator_id)
+
+    def score(self, skills_needed, location_pref, skill_weight=2, location_weight=1):
+        """Return {creator_id: score} for every creator with a non-zero score.
+
+        score = skill_weight * |shared skills| + location_weight * (same location)
+        """
+        wanted = tokenize_skills(skills_needed)
+        with self._lock:
+            overlap = Counter()
+            for skill in wanted:
+                overlap.update(self._by_skill.get(skill, ()))
+            same_location = set(self._by_location.get(location_pref, ()))
+
+        scores = {cid: n * skill_weight for cid, n in overlap.items()}
+        for cid in same_location:
+            scores[cid] = scores.get(cid, 0) + location_weight
+        return scores
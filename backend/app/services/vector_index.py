@@ -0,0 +1,214 @@
+import numpy as np
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def normalize_rows(matrix):
+    """Return a contiguous float32 copy of `matrix` with unit-length rows."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return np.ascontiguousarray(matrix / norms, dtype=np.float32)
+
+
+class VectorIndex:
+    """In-process cosine-similarity index over project embeddings.
+
+    Vectors are L2-normalized into one float32 matrix so a top-K query is a
+    single matrix-vector product plus `argpartition`. Optionally a
+    random-projection LSH layer (`lsh_tables` tables of `lsh_bits`
+    hyperplanes each) narrows the candidate set first; queries fall back to
+    brute force when the buckets yield fewer than K candidates.
+
+    Pass `normalized=True` for a matrix whose rows are already unit length
+    (e.g. a memory-mapped snapshot); it is then used as-is, without a copy.
+    """
+
+    def __init__(self, project_ids, matrix, lsh_tables=0, lsh_bits=12, seed=0, normalized=False):
+        self.project_ids = np.asarray(project_ids, dtype=np.int64)
+        if not normalized:
+            matrix = np.asarray(matrix, dtype=np.float32)
+            if matrix.ndim != 2:
+                matrix = matrix.reshape(len(self.project_ids), -1)
+            matrix = normalize_rows(matrix)
+        self.matrix = matrix
+        self._positions = {int(pid): i for i, pid in enumerate(self.project_ids)}
+
+        self.lsh_tables = lsh_tables
+        self._planes = []
+        self._buckets = []
+        if lsh_tables and len(self):
+            rng = np.random.default_rng(seed)
+            weights = 1 << np.arange(lsh_bits, dtype=np.int64)
+            for _ in range(lsh_tables):
+                planes = rng.standard_normal((self.dim, lsh_bits)).astype(np.float32)
+                codes = self._codes(self.matrix, planes, weights)
+                buckets = {}
+                for pos, code in enumerate(codes.tolist()):
+                    buckets.setdefault(code, []).append(pos)
+                self._planes.append((planes, weights))
+                self._buckets.append({c: np.array(p, dtype=np.int64) for c, p in buckets.items()})
+
+    @classmethod
+    def from_embeddings(cls, rows, **kwargs):
+        """Build an index from `EmbeddingRepository.get_all_embeddings()` rows.
+
+        Rows whose dimension differs from the most common one are skipped
+        (they were generated with a different `dim` and are not comparable).
+        """
+        rows = [r for r in rows if r.get("embedding")]
+        if not rows:
+            return cls(np.empty(0, dtype=np.int64), np.empty((0, 0), dtype=np.float32), **kwargs)
+        dims = [len(r["embedding"]) for r in rows]
+        dim = max(set(dims), key=dims.count)
+        kept = [r for r in rows if len(r["embedding"]) == dim]
+        if len(kept) != len(rows):
+            logger.warning("Skipping %d embeddings with dim != %d", len(rows) - len(kept), dim)
+        ids = np.fromiter((r["project_id"] for r in kept), dtype=np.int64, count=len(kept))
+        matrix = np.array([r["embedding"] for r in kept], dtype=np.float32)
+        return cls(ids, matrix, **kwargs)
+
+    def __len__(self):
+        return len(self.project_ids)
+
+    @property
+    def dim(self):
+        return self.matrix.shape[1] if self.matrix.ndim == 2 else 0
+
+    def __contains__(self, project_id):
+        return int(project_id) in self._positions
+
+    @staticmethod
+    def _codes(vectors, planes, weights):
+        return ((vectors @ planes) > 0).astype(np.int64) @ weights
+
+    def upsert(self, project_id, vector):
+        """Add or replace one project's vector without rebuilding the index.
+
+        Only the touched row and its LSH bucket entries change. The id
+        array is swapped in before a grown matrix, so a concurrent query
+        never sees a matrix row without its id. A read-only (memory-mapped)
+        matrix is copied on the first replacement.
+        """
+        row = normalize_rows(np.asarray(vector, dtype=np.float32).reshape(1, -1))
+        pos = self._positions.get(int(project_id))
+        old = None
+        if pos is None:
+            pos = len(self)
+            self.project_ids = np.append(self.project_ids, np.int64(project_id))
+            self.matrix = np.concatenate([self.matrix, row])
+            self._positions[int(project_id)] = pos
+        else:
+            if not self.matrix.flags.writeable:
+                self.matrix = np.array(self.matrix)
+            old = self.matrix[pos].copy()
+            self.matrix[pos] = row[0]
+
+        for (planes, weights), buckets in zip(self._planes, self._buckets):
+            if old is not None:
+                code = int(self._codes(old, planes, weights))
+                remaining = buckets[code][buckets[code] != pos]
+                if remaining.size:
+                    buckets[code] = remaining
+                else:
+                    del buckets[code]
+            code = int(self._codes(row[0], planes, weights))
+            buckets[code] = np.append(buckets.get(code, np.empty(0, dtype=np.int64)), pos)
+
+    def _candidates(self, vector):
+        found = [
+            buckets.get(int(self._codes(vector, planes, weights)))
+            for (planes, weights), buckets in zip(self._planes, self._buckets)
+        ]
+        found = [f for f in found if f is not None]
+        return np.unique(np.concatenate(found)) if found else np.empty(0, dtype=np.int64)
+
+    @staticmethod
+    def _top_k(scores, k):
+        if k >= scores.size:
+            return np.argsort(-scores, kind="stable")
+        part = np.argpartition(-scores, k)[:k]
+        return part[np.argsort(-scores[part], kind="stable")]
+
+    def query_vector(self, vector, k, exclude=None):
+        """Return up to `k` (project_id, similarity) pairs closest to `vector`."""
+        if not len(self) or k <= 0:
+            return []
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return []
+        vector = vector / norm
+        exclude_pos = self._positions.get(int(exclude)) if exclude is not None else None
+
+        positions = None
+        if self._planes:
+            positions = self._candidates(vector)
+            if exclude_pos is not None:
+                positions = positions[positions != exclude_pos]
+            if positions.size < k:
+                positions = None  # too few candidates, fall back to brute force
+
+        if positions is None:
+            scores = self.matrix @ vector
+            if exclude_pos is not None:
+                scores[exclude_pos] = -np.inf
+            order = self._top_k(scores, k)
+            order = order[np.isfinite(scores[order])]
+            return [(int(self.project_ids[i]), float(scores[i])) for i in order]
+
+        scores = self.matrix[positions] @ vector
+        order = self._top_k(scores, k)
+        return [(int(self.project_ids[positions[i]]), float(scores[i])) for i in order]
+
+    def query(self, project_id, k):
+        """Return the `k` nearest neighbours of an indexed project (itself excluded)."""
+        pos = self._positions.get(int(project_id))
+        if pos is None:
+            return []
+        return self.query_vector(self.matrix[pos], k, exclude=project_id)
+
+    def top_k_all(self, k, block_size=1024):
+        """Yield (project_id, [(neighbour_id, similarity), ...]) for every project.
+
+        Brute force in row blocks of `block_size`, so peak memory is
+        `block_size * len(self)` floats instead of the full n x n matrix.
+        """
+        n = len(self)
+        k = min(k, n - 1)
+        if k <= 0:
+            return
+        for start in range(0, n, block_size):
+            stop = min(n, start + block_size)
+            scores = self.matrix[start:stop] @ self.matrix.T
+            scores[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+            part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            for row, cols in enumerate(part):
+                row_scores = scores[row, cols]
+                order = np.argsort(-row_scores, kind="stable")
+                yield int(self.project_ids[start + row]), [
+                    (int(self.project_ids[cols[j]]), float(row_scores[j])) for j in order
+                ]
+
+    def pairs_above(self, threshold, block_size=1024):
+        """Yield (project_a, project_b, similarity) for every pair >= `threshold`.
+
+        All-pairs cosine similarity computed tile by tile as
+        `E[i:i+b] @ E[j:j+b].T` over the upper triangle, so memory stays at
+        `block_size ** 2` floats per tile regardless of catalog size.
+        """
+        n = len(self)
+        ids = self.project_ids
+        for i0 in range(0, n, block_size):
+            i1 = min(n, i0 + block_size)
+            rows = self.matrix[i0:i1]
+            for j0 in range(i0, n, block_size):
+                j1 = min(n, j0 + block_size)
+                tile = rows @ self.matrix[j0:j1].T
+                keep = tile >= threshold
+                if j0 == i0:
+                    # diagonal tile: only pairs with j > i
+                    keep &= np.triu(np.ones(tile.shape, dtype=bool), k=1)
+                r, c = np.nonzero(keep)
+                yield from zip(ids[i0 + r].tolist(), ids[j0 + c].tolist(), tile[r, c].tolist())
@@ -1,60 +1,20 @@
 #!/usr/bin/env python3
-import argparse
-import os
-from app.core.logger import get_logger
-
-logger = get_logger(__name__)
-
-
-def main():
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--init-db", action="store_true")
-    parser.add_argument("--run-fairrank", action="store_true")
-    parser.add_argument("--compute-similarity", action="store_true")
-    parser.add_argument("--run-matching", action="store_true")
-    parser.add_argument("--request-id", type=int)
-    parser.add_argument("--run-tests", action="store_true")
-    args = parser.parse_args()
-
-    if args.init_db:
-        from app.scripts.init_db import init_database
-        init_database()
-
-    if args.run_fairrank:
-        from app.services.fairrank_engine import FairRankEngine
-        FairRankEngine.run()
-
-    if args.compute_similarity:
-        from app.services.similarity_engine import SimilarityEngine
-        SimilarityEngine.generate_dummy_embeddings()
-        SimilarityEngine.compute_all_similarities()
-
-    if args.run_matching:
-        from app.services.matching_engine import MatchingEngine
-        if not args.request_id:
-            logger.error("--request-id is required for --run-matching")
-        else:
-            MatchingEngine.run(args.request_id)
-
-    if args.run_tests:
-        os.environ.setdefault("PYTHONPATH", os.getcwd())
-        from app.scripts.test_fairrank import populate, test_fairrank, test_similarity, test_matching
-        populate()
-        test_fairrank()
-        test_similarity()
-        test_matching()
-
-
-if __name__ == "__main__":
-    main()
-#!/usr/bin/env python3
 """CLI entrypoint to run DB init and engines manually.
 
 Usage examples:
   python3 main.py --init-db
   python3 main.py --run-fairrank
+  python3 main.py --run-fairrank --batch
+  python3 main.py --run-fairrank --incremental
   python3 main.py --compute-similarity
+  python3 main.py --compute-similarity --top-k 10
+  python3 main.py --compute-similarity --blocked --min-similarity 0.6
+  python3 main.py --migrate-embeddings
+  python3 main.py --verify-engagement-stats --rebuild-engagement-stats
+  python3 main.py --export-embeddings data/snapshots
+  python3 main.py --reconcile-points
   python3 main.py --run-matching --request-id 1
+  python3 main.py --run-matching --all-open --workers 4
   python3 main.py --run-tests
 """
 import argparse
@@ -68,9 +28,29 @@ def main():
     parser = argparse.ArgumentParser(description="FairRank backend CLI")
     parser.add_argument("--init-db", action="store_true", help="Initialize the database schema")
     parser.add_argument("--run-fairrank", action="store_true", help="Run the FairRank engine")
+    parser.add_argument("--batch", action="store_true", help="Use the vectorized FairRank batch mode")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Rescore only projects changed since the last FairRank run")
     parser.add_argument("--compute-similarity", action="store_true", help="Run the similarity engine")
+    parser.add_argument("--top-k", type=int, help="Store only the top-K neighbours per project / matches per request")
+    parser.add_argument("--blocked", action="store_true",
+                        help="Compute all pairs with blocked NumPy matrix products")
+    parser.add_argument("--min-similarity", type=float, help="Threshold for --blocked (default from settings)")
+    parser.add_argument("--min-score", type=float, help="Minimum match score for --run-matching (default from settings)")
+    parser.add_argument("--migrate-embeddings", action="store_true",
+                        help="Convert JSON-text embeddings to the binary float32 format")
+    parser.add_argument("--export-embeddings", metavar="DIR", nargs="?", const="",
+                        help="Write the memory-mapped embedding snapshot (default EMBEDDING_SNAPSHOT_DIR)")
+    parser.add_argument("--rebuild-engagement-stats", action="store_true",
+                        help="Recompute project_engagement_stats from engagements")
+    parser.add_argument("--verify-engagement-stats", action="store_true",
+                        help="Report projects whose engagement aggregates drifted")
+    parser.add_argument("--reconcile-points", action="store_true",
+                        help="Recompute creator point totals and levels from creator_rewards")
     parser.add_argument("--run-matching", action="store_true", help="Run matching for a request id")
     parser.add_argument("--request-id", type=int, help="Request id for matching")
+    parser.add_argument("--all-open", action="store_true", help="Match every open request in one batch")
+    parser.add_argument("--workers", type=int, help="Processes for --all-open (default from settings)")
     parser.add_argument("--run-tests", action="store_true", help="Run the test_fairrank script")
 
     args = parser.parse_args()
@@ -80,24 +60,74 @@ def main():
 
         init_database()
 
+    if args.migrate_embeddings:
+        from app.repositories.embeddings import EmbeddingRepository
+
+        converted = EmbeddingRepository.migrate_to_binary()
+        logger.info("Migrated %d embeddings to binary format", converted)
+
+    if args.export_embeddings is not None:
+        from app.api.config import settings
+        from app.services.similarity_engine import SimilarityEngine
+
+        directory = args.export_embeddings or settings.EMBEDDING_SNAPSHOT_DIR
+        if not directory:
+            logger.error("--export-embeddings needs a directory or EMBEDDING_SNAPSHOT_DIR")
+        else:
+            SimilarityEngine.export_snapshot(directory)
+
+    if args.verify_engagement_stats:
+        from app.repositories.engagements import EngagementRepository
+
+        drifted = EngagementRepository.verify_project_stats()
+        if drifted:
+            logger.warning("Engagement stats drift for %d projects: %s%s", len(drifted),
+                           drifted[:20], " ..." if len(drifted) > 20 else "")
+        else:
+            logger.info("Engagement stats verified: no drift")
+
+    if args.rebuild_engagement_stats:
+        from app.repositories.engagements import EngagementRepository
+
+        rows = EngagementRepository.rebuild_project_stats()
+        logger.info("Rebuilt engagement stats for %d projects", rows)
+
+    if args.reconcile_points:
+        from app.repositories.rewards import RewardRepository
+
+        fixed = RewardRepository.reconcile_points()
+        logger.info("Reconciled creator points: %d profiles corrected", fixed)
+
     if args.run_fairrank:
         from app.services.fairrank_engine import FairRankEngine
 
-        FairRankEngine.run()
+        if args.incremental:
+            FairRankEngine.run_incremental()
+        elif args.batch:
+            FairRankEngine.run_batch()
+        else:
+            FairRankEngine.run()
 
     if args.compute_similarity:
         from app.services.similarity_engine import SimilarityEngine
 
         SimilarityEngine.generate_dummy_embeddings()
-        SimilarityEngine.compute_all_similarities()
+        if args.top_k:
+            SimilarityEngine.compute_top_k_similarities(args.top_k)
+        elif args.blocked:
+            SimilarityEngine.compute_all_similarities_blocked(threshold=args.min_similarity)
+        else:
+            SimilarityEngine.compute_all_similarities()
 
     if args.run_matching:
         from app.services.matching_engine import MatchingEngine
 
-        if not args.request_id:
-            logger.error("--request-id is required for --run-matching")
+        if args.all_open:
+            MatchingEngine.run_batch(top_k=args.top_k, min_score=args.min_score, workers=args.workers)
+        elif not args.request_id:
+            logger.error("--request-id or --all-open is required for --run-matching")
         else:
-            MatchingEngine.run(args.request_id)
+            MatchingEngine.run(args.request_id, top_k=args.top_k, min_score=args.min_score)
 
     if args.run_tests:
         # run test_fairrank script (same as running the module)
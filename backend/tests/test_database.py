@@ -0,0 +1,71 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+from app.core.database import ConnectionPool
+
+
+class ConnectionPoolTestCase(unittest.TestCase):
+    def setUp(self):
+        self.db_fd, self.db_path = tempfile.mkstemp(prefix="fairrank_pool_", suffix=".db")
+
+    def tearDown(self):
+        os.close(self.db_fd)
+        os.remove(self.db_path)
+
+    def test_connections_are_reused(self):
+        pool = ConnectionPool(self.db_path, size=2, timeout=1)
+        conn = pool.acquire()
+        pool.release(conn)
+        self.assertIs(pool.acquire(), conn)
+        self.assertEqual(pool.stats()["open"], 1)
+        pool.close()
+
+    def test_unhealthy_connection_is_replaced(self):
+        pool = ConnectionPool(self.db_path, size=1, timeout=1)
+        conn = pool.acquire()
+        pool.release(conn)
+        conn.close()  # simulate a broken connection sitting in the pool
+
+        fresh = pool.acquire()
+        self.assertIsNot(fresh, conn)
+        self.assertEqual(fresh.execute("SELECT 1").fetchone()[0], 1)
+        pool.release(fresh)
+        pool.close()
+
+    def test_release_rolls_back_open_transaction(self):
+        pool = ConnectionPool(self.db_path, size=1, timeout=1)
+        conn = pool.acquire()
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.commit()
+        conn.execute("INSERT INTO t VALUES (1)")
+        pool.release(conn)
+
+        conn = pool.acquire()
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM t").fetchone()[0], 0)
+        pool.release(conn)
+        pool.close()
+
+    def test_exhausted_pool_times_out(self):
+        pool = ConnectionPool(self.db_path, size=1, timeout=0.05)
+        conn = pool.acquire()
+        errors = []
+
+        def worker():
+            try:
+                pool.acquire()
+            except sqlite3.OperationalError as e:
+                errors.append(e)
+
+        t = threading.Thread(target=worker)
+        t.start()
+        t.join()
+        self.assertEqual(len(errors), 1)
+        pool.release(conn)
+        pool.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,17 +1,38 @@
+import asyncio
+import json
 import os
+import threading
+import time
 import unittest
 import tempfile
+import uuid
+from datetime import datetime, timedelta
+from unittest import mock
+
+import numpy as np
 
 from app.scripts import init_db
+from app.repositories.base import AsyncRepository, BaseRepository
 from app.repositories.users import UserRepository
 from app.repositories.creators import CreatorRepository
 from app.repositories.projects import ProjectRepository
 from app.repositories.engagements import EngagementRepository
 from app.repositories.embeddings import EmbeddingRepository
 from app.repositories.fairrank import FairRankRepository
+from app.repositories.similarity import SimilarityRepository
+from app.repositories.rewards import RewardRepository, compute_level
 from app.services.similarity_engine import SimilarityEngine
 from app.services.fairrank_engine import FairRankEngine
 from app.services.gamification import GamificationService
+from app.services.feed_snapshot import FeedCache
+from app.services.impression_tracker import ImpressionTracker
+from app.services.exposure_stats import get_exposure_stats
+from app.repositories.platform_stats import PlatformStatsRepository
+from app.services.platform_stats_cache import PlatformStatsCache
+from app.services.reward_queue import RewardQueue
+from app.services.job_runner import JobCancelled
+from app.services.matching_engine import MatchingEngine
+from app.repositories.collab import CollabRepository
 
 
 class EnginesTestCase(unittest.TestCase):
@@ -55,6 +76,267 @@ class EnginesTestCase(unittest.TestCase):
         self.assertGreaterEqual(sim, -1.0)
         self.assertLessEqual(sim, 1.0)
 
+    def test_binary_embeddings_and_legacy_migration(self):
+        u = UserRepository.create_user("Erin", "creator")
+        CreatorRepository.create_creator_profile(u, "dev", "python", "full", "NY", "bio")
+        p1 = ProjectRepository.create_project(u, "Vec A", "Binary storage", "idea")
+        p2 = ProjectRepository.create_project(u, "Vec B", "Legacy storage", "idea")
+
+        EmbeddingRepository.upsert_embedding(p1, [0.5, -1.0, 2.0])
+        # a row written by the old JSON-text format
+        BaseRepository.execute(
+            "INSERT OR REPLACE INTO project_embeddings (project_id, embedding) VALUES (?, ?)",
+            (p2, json.dumps([1.0, 0.0, 0.25])),
+        )
+        row = BaseRepository.fetch_one(
+            "SELECT typeof(embedding) AS t, length(embedding) AS n FROM project_embeddings WHERE project_id = ?",
+            (p1,),
+        )
+        self.assertEqual((row["t"], row["n"]), ("blob", 8 + 3 * 4))
+
+        self.assertGreaterEqual(EmbeddingRepository.migrate_to_binary(), 1)
+        self.assertEqual(EmbeddingRepository.migrate_to_binary(), 0)
+
+        ids, matrix = EmbeddingRepository.get_embedding_matrix()
+        self.assertEqual(matrix.dtype, np.float32)
+        # other tests (and earlier runs on the same DB) store other dimensions
+        rows = {r["project_id"]: r["embedding"] for r in EmbeddingRepository.get_all_embeddings()
+                if r["project_id"] in (p1, p2)}
+        self.assertEqual(rows, {p1: [0.5, -1.0, 2.0], p2: [1.0, 0.0, 0.25]})
+
+    def test_embedding_snapshot_rebuilt_only_when_stale(self):
+        u = UserRepository.create_user("Finn", "creator")
+        CreatorRepository.create_creator_profile(u, "dev", "python", "full", "NY", "bio")
+        pid = ProjectRepository.create_project(u, "Snap", "Snapshot project", "idea")
+        SimilarityEngine.generate_dummy_embeddings(dim=8)
+
+        with tempfile.TemporaryDirectory() as directory:
+            first = SimilarityEngine.load_snapshot(directory)
+            self.assertEqual(first.stamp, EmbeddingRepository.get_version())
+            self.assertIn(pid, first.project_ids.tolist())
+            self.assertEqual(SimilarityEngine.load_snapshot(directory).stamp, first.stamp)
+
+            EmbeddingRepository.upsert_embedding(pid, [1.0] * 8)
+            second = SimilarityEngine.load_snapshot(directory)
+            self.assertNotEqual(second.stamp, first.stamp)
+            row = second.project_ids.tolist().index(pid)
+            self.assertAlmostEqual(float(second.matrix[row][0]), 8 ** -0.5, places=6)
+
+    def test_single_project_embedding_updates_cached_index(self):
+        u = UserRepository.create_user("Fay", "creator")
+        CreatorRepository.create_creator_profile(u, "dev", "python", "full", "NY", "bio")
+        pid = ProjectRepository.create_project(u, "Live", "Indexed in place", "idea")
+        SimilarityEngine.generate_dummy_embeddings(dim=16)
+        index = SimilarityEngine.get_index()
+
+        new = ProjectRepository.create_project(u, "Live 2", "Indexed in place too", "idea")
+        vector = SimilarityEngine.generate_embedding_for_project(new)
+        self.assertEqual(len(vector), index.dim)
+        # the in-place update also advanced the stamp, so a check keeps the index
+        with mock.patch("app.services.similarity_engine.settings.SIMILARITY_INDEX_CHECK_INTERVAL", 0):
+            self.assertIs(SimilarityEngine.get_index(), index)
+        self.assertIn(new, index)
+        self.assertIn(pid, [n for n, _ in SimilarityEngine.find_similar(new, k=len(index))])
+
+    def test_vector_index_rebuilt_after_external_writes(self):
+        u = UserRepository.create_user("Flo", "creator")
+        CreatorRepository.create_creator_profile(u, "dev", "python", "full", "NY", "bio")
+        pid = ProjectRepository.create_project(u, "Shared", "Indexed by two processes", "idea")
+        SimilarityEngine.generate_dummy_embeddings(dim=16)
+        index = SimilarityEngine.get_index()
+
+        # written by another process: this one's index is not updated in place
+        other = ProjectRepository.create_project(u, "Shared 2", "Embedded elsewhere", "idea")
+        EmbeddingRepository.upsert_embedding(other, [1.0] * 16)
+        self.assertIs(SimilarityEngine.get_index(), index)  # within the check interval
+        with mock.patch("app.services.similarity_engine.settings.SIMILARITY_INDEX_CHECK_INTERVAL", 0):
+            rebuilt = SimilarityEngine.get_index()
+            self.assertIsNot(rebuilt, index)
+            self.assertIn(other, rebuilt)
+            self.assertIs(SimilarityEngine.get_index(), rebuilt)
+
+            # a deleted project's embedding goes with it
+            BaseRepository.execute("DELETE FROM projects WHERE project_id = ?", (other,))
+            self.assertNotIn(other, SimilarityEngine.get_index())
+            self.assertIn(pid, SimilarityEngine.get_index())
+
+    def test_ranked_feed_offset_and_keyset_pages_agree(self):
+        u = UserRepository.create_user("Gail", "creator")
+        CreatorRepository.create_creator_profile(u, "dev", "python", "full", "NY", "bio")
+        for i in range(7):
+            ProjectRepository.create_project(u, "Feed {}".format(i), "Paged project", "idea")
+        FairRankEngine.run_batch()
+
+        total = FairRankRepository.count_ranked_projects()
+        self.assertGreaterEqual(total, 7)
+        full = FairRankRepository.get_ranked_feed(limit=total)
+        keys = [(r["fairrank"]["score"], r["project"]["id"]) for r in full]
+        self.assertEqual(keys, sorted(keys, reverse=True))
+
+        walked, after = [], None
+        while True:
+            page = FairRankRepository.get_ranked_feed(limit=3, after=after)
+            if not page:
+                break
+            self.assertEqual(page, FairRankRepository.get_ranked_feed(limit=3, offset=len(walked)))
+            walked.extend(page)
+            after = (page[-1]["fairrank"]["score"], page[-1]["project"]["id"])
+        self.assertEqual(walked, full)
+
+    def test_feed_snapshot_published_by_engine(self):
+        u = UserRepository.create_user("Hana", "creator")
+        CreatorRepository.create_creator_profile(u, "dev", "python", "full", "NY", "bio")
+        for i in range(5):
+            ProjectRepository.create_project(u, "Snap feed {}".format(i), "Cached project", "idea")
+
+        FairRankEngine.run_batch()
+        snapshot = FeedCache.get_snapshot()
+        rows = FairRankRepository.get_ranked_feed(limit=None)
+        self.assertEqual([i["id"] for i in snapshot.items], [r["project"]["id"] for r in rows])
+        self.assertTrue(all(i["explanation_badge"] for i in snapshot.items))
+
+        # pages slice the snapshot; a cursor resumes right after its item
+        first, has_more = snapshot.page(2)
+        self.assertTrue(has_more)
+        after = (first[-1]["fairrank_score"], first[-1]["id"])
+        self.assertEqual(snapshot.page(2, after=after)[0], snapshot.page(2, offset=2)[0])
+
+        FairRankEngine.run_batch()
+        self.assertGreater(FeedCache.get_snapshot().version, snapshot.version)
+
+    def test_feed_snapshot_revalidated_by_stamp(self):
+        u = UserRepository.create_user("Hugo", "creator")
+        CreatorRepository.create_creator_profile(u, "dev", "python", "full", "NY", "bio")
+        ProjectRepository.create_project(u, "Stamped feed", "Cached project", "idea")
+        FairRankEngine.run_batch()
+        snapshot = FeedCache.get_snapshot()
+
+        with mock.patch("app.services.feed_snapshot.settings.FEED_SNAPSHOT_MAX_AGE", 1e-9):
+            # expired but no run since: the stamp check keeps the snapshot
+            with mock.patch.object(FairRankRepository, "get_ranked_feed", side_effect=AssertionError):
+                time.sleep(0.001)
+                self.assertIs(FeedCache.get_snapshot(), snapshot)
+
+            # a run in another process moves the stamp; readers that find the
+            # lock taken keep the current snapshot instead of waiting
+            time.sleep(0.001)
+            FairRankRepository.touch_scores()
+            with FeedCache._lock:
+                self.assertIs(FeedCache.get_snapshot(), snapshot)
+            self.assertGreater(FeedCache.get_snapshot().version, snapshot.version)
+
+    def test_impression_tracker_flushes_increments(self):
+        u = UserRepository.create_user("Ivan", "creator")
+        CreatorRepository.create_creator_profile(u, "dev", "python", "full", "NY", "bio")
+        p1 = ProjectRepository.create_project(u, "Seen", "Viewed project", "idea")
+        p2 = ProjectRepository.create_project(u, "Seen too", "Viewed project", "idea")
+        ProjectRepository.update_impressions(p1, 10)
+        tracker = ImpressionTracker(shards=4, flush_threshold=1000)
+
+        tracker.record([p1, p2, p1])
+        with mock.patch.object(ProjectRepository, "increment_impressions", side_effect=RuntimeError("locked")):
+            self.assertEqual(tracker.flush(), 0)
+        self.assertEqual(tracker.stats()["pending_views"], 3)
+        self.assertEqual(tracker.stats()["failed_flushes"], 1)
+
+        tracker.record([p2])
+        self.assertEqual(tracker.flush(), 4)
+        self.assertEqual(ProjectRepository.get_project(p1)["impressions"], 12)
+        self.assertEqual(ProjectRepository.get_project(p2)["impressions"], 2)
+        self.assertEqual(tracker.stats()["pending_views"], 0)
+        self.assertEqual(tracker.flush(), 0)
+
+    def test_exposure_stats_follow_project_writes(self):
+        stats = get_exposure_stats(rebuild=True)
+        u = UserRepository.create_user("Jude", "creator")
+        CreatorRepository.create_creator_profile(u, "dev", "python", "full", "NY", "bio")
+        pid = ProjectRepository.create_project(u, "Streamed", "Exposure project", "idea")
+        ProjectRepository.increment_impressions({pid: 250})
+
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot["total_projects"], PlatformStatsRepository.count_projects())
+        self.assertEqual(snapshot["underexposed_projects"], PlatformStatsRepository.count_underexposed_projects(100))
+        self.assertEqual(snapshot["exposure_distribution"], PlatformStatsRepository.get_exposure_distribution())
+        self.assertEqual(get_exposure_stats(rebuild=True).snapshot(), snapshot)
+
+    def test_platform_stats_served_from_materialized_snapshot(self):
+        u = UserRepository.create_user("Kira", "creator")
+        CreatorRepository.create_creator_profile(u, "dev", "python", "full", "NY", "bio")
+        ProjectRepository.create_project(u, "Stats", "Stats project", "idea")
+        with mock.patch.object(
+            FairRankEngine, "compute_gini_array", wraps=FairRankEngine.compute_gini_array
+        ) as gini:
+            FairRankEngine.run_batch()
+
+        saved = PlatformStatsRepository.get_snapshot()
+        cached = PlatformStatsCache.get()
+        self.assertEqual(cached, saved)
+        # the row's exposure_gini still holds the engagement Gini
+        row = PlatformStatsRepository.fetch_one("SELECT * FROM platform_stats WHERE id = 1")
+        engagement_gini = float(FairRankEngine.compute_gini_array(*gini.call_args.args))
+        self.assertAlmostEqual(row["exposure_gini"], engagement_gini)
+        self.assertAlmostEqual(cached["engagement_gini"], engagement_gini)
+        self.assertEqual(row["impression_gini"], cached["exposure_gini"])
+        self.assertEqual(cached["total_projects"], PlatformStatsRepository.count_projects())
+        self.assertEqual(cached["total_creators"], PlatformStatsRepository.count_creators())
+        self.assertAlmostEqual(cached["avg_fairrank"], PlatformStatsRepository.get_avg_fairrank())
+
+        # later writes are only visible after the TTL or with fresh=True
+        ProjectRepository.create_project(u, "Stats 2", "Stats project", "idea")
+        self.assertIs(PlatformStatsCache.get(), cached)
+        fresh = PlatformStatsCache.get(fresh=True)
+        self.assertEqual(fresh["total_projects"], cached["total_projects"] + 1)
+        # refreshes outside an engine run keep the stored engagement Gini
+        self.assertEqual(fresh["engagement_gini"], cached["engagement_gini"])
+
+        # another process's cache adopts the saved row while it is within the TTL
+        PlatformStatsCache.invalidate()
+        self.assertEqual(PlatformStatsCache.get(), fresh)
+        with mock.patch("app.services.platform_stats_cache.settings.PLATFORM_STATS_TTL", 0):
+            self.assertNotEqual(PlatformStatsCache.get()["updated_at"], fresh["updated_at"])
+
+    def test_row_by_row_run_keeps_engagement_gini(self):
+        u = UserRepository.create_user("Lio", "creator")
+        CreatorRepository.create_creator_profile(u, "dev", "python", "full", "NY", "bio")
+        for weight in (1.0, 9.0):
+            pid = ProjectRepository.create_project(u, "Gini", "Gini project", "idea")
+            EngagementRepository.create_engagement(pid, u, "like", weight=weight)
+
+        FairRankEngine.run_batch()
+        batch = PlatformStatsCache.get(fresh=True)["engagement_gini"]
+        self.assertGreater(batch, 0.0)
+        FairRankEngine.run()
+        self.assertAlmostEqual(PlatformStatsCache.get()["engagement_gini"], batch)
+
+    def test_engagement_stats_maintained_and_verified(self):
+        u = UserRepository.create_user("Jude", "creator")
+        CreatorRepository.create_creator_profile(u, "dev", "python", "full", "NY", "bio")
+        pid = ProjectRepository.create_project(u, "Stats", "Aggregated project", "idea")
+        ProjectRepository.update_impressions(pid, 10)
+
+        EngagementRepository.create_engagement(pid, u, "like", 1.0)
+        EngagementRepository.create_engagement(pid, u, "insightful", 2.0)
+        e3 = EngagementRepository.create_engagement(pid, u, "like", 0.5)
+        EngagementRepository.delete_engagement(e3)
+        BaseRepository.execute(
+            "UPDATE engagements SET reaction = 'inspiring' WHERE project_id = ? AND reaction = 'insightful'", (pid,)
+        )
+
+        stats = EngagementRepository.get_project_stats(pid)
+        self.assertEqual(
+            (stats["total_reactions"], stats["likes"], stats["insightful"], stats["inspiring"]), (2, 1, 0, 1)
+        )
+        self.assertAlmostEqual(stats["engagement_score"], 0.2)
+        row = BaseRepository.fetch_one("SELECT weight_sum FROM project_engagement_stats WHERE project_id = ?", (pid,))
+        self.assertAlmostEqual(row["weight_sum"], 3.0)
+        self.assertIsNone(EngagementRepository.get_project_stats(10 ** 9))
+        self.assertEqual(EngagementRepository.verify_project_stats(), [])
+
+        BaseRepository.execute("UPDATE project_engagement_stats SET likes = 7 WHERE project_id = ?", (pid,))
+        self.assertEqual(EngagementRepository.verify_project_stats(), [pid])
+        EngagementRepository.rebuild_project_stats()
+        self.assertEqual(EngagementRepository.verify_project_stats(), [])
+
     def test_gamification_award_and_level(self):
         u = UserRepository.create_user("Carol", "creator")
         CreatorRepository.create_creator_profile(u, "dev", "go", "full", "Remote", "bio3")
@@ -67,6 +349,187 @@ class EnginesTestCase(unittest.TestCase):
         self.assertGreaterEqual(profile.get("points") or 0, 120)
         self.assertGreaterEqual(profile.get("level") or 1, 2)
 
+    def test_running_point_totals_and_reconcile(self):
+        a = UserRepository.create_user("Kai", "creator")
+        b = UserRepository.create_user("Lea", "creator")
+        CreatorRepository.create_creator_profile(a, "dev", "go", "full", "Remote", "bio")
+        CreatorRepository.create_creator_profile(b, "dev", "go", "full", "Remote", "bio")
+
+        self.assertEqual(RewardRepository.add_reward(a, "generic", 8), {"creator_id": a, "points": 8, "level": 1})
+        written = RewardRepository.add_rewards([(a, "FairRank Boost", 10), (b, "Bonus", 5), (a, "Bonus", 5)])
+        self.assertEqual(written, 3)
+        self.assertEqual(CreatorRepository.get_creator(a)["points"], 23)
+        self.assertEqual(CreatorRepository.get_creator(a)["level"], compute_level(23))
+        self.assertEqual(CreatorRepository.get_creator(b)["points"], 5)
+
+        BaseRepository.execute("UPDATE creator_profiles SET points = 500, level = 5 WHERE creator_id = ?", (a,))
+        self.assertGreaterEqual(RewardRepository.reconcile_points(), 1)
+        self.assertEqual((CreatorRepository.get_creator(a)["points"], CreatorRepository.get_creator(a)["level"]), (23, 2))
+        self.assertEqual(RewardRepository.reconcile_points(), 0)
+
+    def test_reward_queue_batches_and_drains_on_stop(self):
+        u = UserRepository.create_user("Mia", "creator")
+        CreatorRepository.create_creator_profile(u, "dev", "go", "full", "Remote", "bio")
+        rewards = RewardQueue(maxsize=100, batch_size=10, flush_interval=0.01)
+
+        rewards.submit(u, "Engagement Bonus", 1)  # worker not running: applied inline
+        self.assertEqual(CreatorRepository.get_creator(u)["points"], 1)
+
+        rewards.start()
+        for _ in range(25):
+            rewards.submit(u, "Engagement Bonus", 1)
+        rewards.stop()
+
+        stats = rewards.stats()
+        self.assertEqual((stats["depth"], stats["applied"], stats["failed"]), (0, 26, 0))
+        self.assertFalse(stats["running"])
+        self.assertEqual(CreatorRepository.get_creator(u)["points"], 26)
+        row = BaseRepository.fetch_one("SELECT COUNT(*) AS n FROM creator_rewards WHERE creator_id = ?", (u,))
+        self.assertEqual(row["n"], 26)
+
+    def test_reward_batch_failure_does_not_pay_twice(self):
+        u = UserRepository.create_user("Mo", "creator")
+        CreatorRepository.create_creator_profile(u, "dev", "go", "full", "Remote", "bio")
+        rewards = RewardQueue()
+        missing = 10 ** 9  # no such creator: the reward row violates its foreign key
+
+        # the first chunk would commit before the second one fails
+        with mock.patch("app.repositories.rewards.settings.DB_BATCH_SIZE", 2):
+            rewards.submit_many([(u, "Bonus", 1), (u, "Bonus", 1), (missing, "Bonus", 1)])
+            with BaseRepository.transaction():
+                rewards.submit_many([(u, "Bonus", 10), (u, "Bonus", 10), (missing, "Bonus", 1)])
+
+        self.assertEqual(CreatorRepository.get_creator(u)["points"], 22)
+        self.assertEqual((rewards.applied, rewards.failed), (4, 2))
+
+    def test_matching_scores_only_indexed_candidates(self):
+        owner = UserRepository.create_user("Nia", "creator")
+        CreatorRepository.create_creator_profile(owner, "dev", "python", "full", "NY", "bio")
+        project = ProjectRepository.create_project(owner, "Match", "Needs help", "idea")
+        a = UserRepository.create_user("Oli", "creator")
+        b = UserRepository.create_user("Pat", "creator")
+        c = UserRepository.create_user("Quin", "creator")
+        # tokens unique to this run: the suite's DB may hold creators from earlier runs
+        tag = uuid.uuid4().hex[:8]
+        CreatorRepository.create_creator_profile(a, "dev", f"Ada95{tag}, Forth{tag} ", "full", f"Tromso{tag}", "bio")
+        CreatorRepository.create_creator_profile(b, "dev", f"ada95{tag}", "full", f"Lima{tag}", "bio")
+        CreatorRepository.create_creator_profile(c, "dev", f"cobol{tag}", "full", f"Lima{tag}", "bio")
+        MatchingEngine.get_index(rebuild=True)
+
+        request_id = CollabRepository.create_request(
+            owner, project, "dev", f"ada95{tag},forth{tag}", f"Tromso{tag}"
+        )
+        scores = dict(MatchingEngine.score_request(CollabRepository.get_request(request_id)))
+        self.assertEqual((scores.get(a), scores.get(b)), (5, 2))
+        self.assertNotIn(c, scores)
+
+        # profile edits reach the live index without a rebuild
+        CreatorRepository.update_creator(c, skills=f"forth{tag}", location=f"Tromso{tag}")
+        MatchingEngine.run(request_id)
+        rows = BaseRepository.fetch_all(
+            "SELECT creator_id, match_score FROM collab_matches WHERE request_id = ?", (request_id,)
+        )
+        self.assertEqual({r["creator_id"]: r["match_score"] for r in rows}, {a: 5, b: 2, c: 3})
+
+    def test_matching_keeps_only_top_k_and_rewards_new_matches_once(self):
+        owner = UserRepository.create_user("Rae", "creator")
+        CreatorRepository.create_creator_profile(owner, "dev", "python", "full", "NY", "bio")
+        project = ProjectRepository.create_project(owner, "TopK", "Needs help", "idea")
+        tag = uuid.uuid4().hex[:8]
+        ids = []
+        for name, skills in (("Sam", "snobol{0},icon{0}"), ("Tia", "snobol{0}"), ("Uma", "icon{0}"), ("Vic", "snobol{0}")):
+            uid = UserRepository.create_user(name, "creator")
+            CreatorRepository.create_creator_profile(uid, "dev", skills.format(tag), "full", "Oslo" + tag, "bio")
+            ids.append(uid)
+        sam, tia, uma, vic = ids
+        request_id = CollabRepository.create_request(owner, project, "dev", "snobol{0},icon{0}".format(tag), "Quito" + tag)
+
+        matches = MatchingEngine.run(request_id, top_k=2, min_score=2)
+        # ties on score resolve to the lower creator id
+        self.assertEqual(matches, [(sam, 4), (tia, 2)])
+        stored = CollabRepository.get_matches_for_request(request_id)
+        self.assertEqual([m["creator_id"] for m in stored], [sam, tia])
+
+        MatchingEngine.run(request_id, top_k=3, min_score=2)
+        self.assertEqual(
+            [m["creator_id"] for m in CollabRepository.get_matches_for_request(request_id)], [sam, tia, uma]
+        )
+        self.assertEqual(len(CollabRepository.get_matches_for_request(request_id, limit=1)), 1)
+        # the bonus is paid once per creator, not once per run
+        self.assertEqual(
+            [CreatorRepository.get_creator(uid)["points"] for uid in ids], [5, 5, 5, 0]
+        )
+
+    def test_match_results_cached_until_a_relevant_profile_changes(self):
+        owner = UserRepository.create_user("Wes", "creator")
+        CreatorRepository.create_creator_profile(owner, "dev", "python", "full", "NY", "bio")
+        project = ProjectRepository.create_project(owner, "Cached", "Needs help", "idea")
+        a = UserRepository.create_user("Xan", "creator")
+        b = UserRepository.create_user("Yul", "creator")
+        tag = uuid.uuid4().hex[:8]
+        simula, algol, kyiv, baku = ("simula" + tag, "algol" + tag, "Kyiv" + tag, "Baku" + tag)
+        CreatorRepository.create_creator_profile(a, "dev", simula, "full", kyiv, "bio")
+        CreatorRepository.create_creator_profile(b, "dev", algol, "full", kyiv, "bio")
+        request_id = CollabRepository.create_request(owner, project, "dev", simula, baku)
+
+        self.assertEqual(MatchingEngine.get_matches(request_id), [(a, 2)])
+        writes, hits = MatchingEngine.match_writes, MatchingEngine.cache_hits
+        self.assertEqual(MatchingEngine.get_matches(request_id), [(a, 2)])
+        self.assertEqual(MatchingEngine.cache_hits, hits + 1)
+
+        # an edit that does not change this request's result: rescored, not rewritten
+        CreatorRepository.update_creator(b, skills=algol + ",pascal")
+        self.assertEqual(MatchingEngine.get_matches(request_id), [(a, 2)])
+        self.assertEqual(MatchingEngine.match_writes, writes)
+
+        CreatorRepository.update_creator(b, skills=simula)
+        self.assertEqual(MatchingEngine.get_matches(request_id), [(a, 2), (b, 2)])
+        self.assertEqual(MatchingEngine.match_writes, writes + 1)
+
+        # a write that bypasses the listeners (e.g. another process) still invalidates
+        BaseRepository.execute("UPDATE creator_profiles SET location = ? WHERE creator_id = ?", (baku, a))
+        self.assertEqual(MatchingEngine.get_matches(request_id), [(a, 3), (b, 2)])
+        self.assertEqual(CollabRepository.get_match_scores(request_id), [(a, 3), (b, 2)])
+
+    def test_batch_matching_serial_and_parallel_agree(self):
+        owner = UserRepository.create_user("Zed", "creator")
+        CreatorRepository.create_creator_profile(owner, "dev", "python", "full", "NY", "bio")
+        project = ProjectRepository.create_project(owner, "Batch", "Needs help", "idea")
+        tag = uuid.uuid4().hex[:8]
+        creators = []
+        for i, skills in enumerate(("lisp{0},ml{0}", "lisp{0}", "ml{0},prolog{0}", "prolog{0}")):
+            uid = UserRepository.create_user("Batch%d" % i, "creator")
+            CreatorRepository.create_creator_profile(uid, "dev", skills.format(tag), "full", "Accra" + tag, "bio")
+            creators.append(uid)
+        request_ids = [
+            CollabRepository.create_request(owner, project, "dev", skills.format(tag), "Accra" + tag)
+            for skills in ("lisp{0},ml{0}", "prolog{0}", "lisp{0}")
+        ]
+        requests = [r for r in CollabRepository.get_open_requests() if r["request_id"] in request_ids]
+        self.assertEqual(len(requests), 3)
+
+        serial = MatchingEngine.run_batch(requests, top_k=2, min_score=2, workers=1)
+        expected = {
+            rid: MatchingEngine.score_request(CollabRepository.get_request(rid), top_k=2, min_score=2)
+            for rid in request_ids
+        }
+        self.assertEqual(serial, expected)
+        self.assertEqual(serial[request_ids[0]], [(creators[0], 5), (creators[1], 3)])
+        for rid in request_ids:
+            self.assertEqual(CollabRepository.get_match_scores(rid), serial[rid])
+
+        # previous matches are read in IN-lists of at most ID_CHUNK_SIZE ids
+        with mock.patch("app.repositories.collab.ID_CHUNK_SIZE", 2):
+            self.assertEqual(MatchingEngine.run_batch(requests, top_k=2, min_score=2, workers=1), serial)
+
+        with mock.patch("app.services.matching_engine.settings.MATCH_PARALLEL_MIN_REQUESTS", 1):
+            parallel = MatchingEngine.run_batch(requests, top_k=2, min_score=2, workers=2)
+        self.assertEqual(parallel, serial)
+        # batch results prime the GET cache
+        hits = MatchingEngine.cache_hits
+        self.assertEqual(MatchingEngine.get_matches(request_ids[1], top_k=2, min_score=2), serial[request_ids[1]])
+        self.assertEqual(MatchingEngine.cache_hits, hits + 1)
+
     def test_fairrank_run_creates_scores(self):
         u = UserRepository.create_user("D", "creator")
         CreatorRepository.create_creator_profile(u, "dev", "rust", "full", "LA", "bio4")
@@ -79,6 +542,160 @@ class EnginesTestCase(unittest.TestCase):
         scores = FairRankRepository.get_ranked_projects()
         self.assertIsInstance(scores, list)
 
+    def test_fairrank_batch_scores_every_project(self):
+        u = UserRepository.create_user("E", "creator")
+        CreatorRepository.create_creator_profile(u, "dev", "c", "full", "LA", "bio5")
+        hot = ProjectRepository.create_project(u, "HotLib", "Very engaging project", "beta")
+        cold = ProjectRepository.create_project(u, "ColdLib", "Quiet project", "beta")
+        EngagementRepository.create_engagement(hot, u, "insightful", weight=10000.0)
+
+        ok = FairRankEngine.run_batch()
+        self.assertTrue(ok)
+
+        scores = {s["project_id"]: s for s in FairRankRepository.get_ranked_projects()}
+        self.assertIn(hot, scores)
+        self.assertIn(cold, scores)
+        self.assertAlmostEqual(scores[hot]["engagement_score"], 1.0)
+        self.assertGreater(scores[hot]["final_score"], scores[cold]["final_score"])
+        for s in scores.values():
+            self.assertGreaterEqual(s["underexposed_boost"], 0.0)
+            self.assertLessEqual(s["underexposed_boost"], 1.0)
+
+    def test_fairrank_checkpoint_aborts_before_writing(self):
+        u = UserRepository.create_user("Cy", "creator")
+        CreatorRepository.create_creator_profile(u, "dev", "c", "full", "LA", "bio")
+        pid = ProjectRepository.create_project(u, "Cancelled", "Never scored", "idea")
+        calls = []
+
+        def checkpoint():
+            calls.append(len(calls))
+            if len(calls) == 2:  # after scoring, before persisting
+                raise JobCancelled()
+
+        with self.assertRaises(JobCancelled):
+            FairRankEngine.run_batch(checkpoint=checkpoint)
+        self.assertNotIn(pid, {s["project_id"] for s in FairRankRepository.get_ranked_projects()})
+
+    def test_fairrank_incremental_rescores_only_changed_projects(self):
+        u = UserRepository.create_user("F", "creator")
+        CreatorRepository.create_creator_profile(u, "dev", "zig", "full", "LA", "bio6")
+        steady = ProjectRepository.create_project(u, "Steady", "Already engaged project", "beta")
+        changed = ProjectRepository.create_project(u, "Changed", "Gets a reaction later", "beta")
+        ProjectRepository.create_project(u, "Idle", "Never engaged project", "beta")
+        EngagementRepository.create_engagement(steady, u, "like", weight=2.0)
+
+        FairRankEngine.run_batch()
+        self.assertEqual(FairRankRepository.get_pending_changes(), [])
+        before = {s["project_id"]: s for s in FairRankRepository.get_ranked_projects()}
+
+        EngagementRepository.create_engagement(changed, u, "like", weight=1.0)
+        pending = [c["project_id"] for c in FairRankRepository.get_pending_changes()]
+        self.assertEqual(pending, [changed])
+
+        self.assertTrue(FairRankEngine.run_incremental())
+        after = {s["project_id"]: s for s in FairRankRepository.get_ranked_projects()}
+
+        self.assertEqual(FairRankRepository.get_pending_changes(), [])
+        self.assertEqual(after[steady]["computed_at"], before[steady]["computed_at"])
+        self.assertGreater(after[changed]["engagement_score"], before[changed]["engagement_score"])
+
+    def test_fairrank_incremental_rescores_day_rollovers(self):
+        u = UserRepository.create_user("G", "creator")
+        CreatorRepository.create_creator_profile(u, "dev", "zig", "full", "LA", "bio7")
+        aged = ProjectRepository.create_project(u, "Aged", "Crosses a day", "beta")
+        young = ProjectRepository.create_project(u, "Young", "Same day", "beta")
+        FairRankEngine.run_batch()
+        before = {s["project_id"]: s for s in FairRankRepository.get_ranked_projects()}
+
+        # created 30 hours ago and scored when it was 5 hours old: its
+        # whole-day age has moved from 0 to 1 since
+        now = datetime.utcnow()
+        BaseRepository.execute(
+            "UPDATE projects SET created_at = ? WHERE project_id = ?",
+            ((now - timedelta(hours=30)).isoformat(), aged),
+        )
+        BaseRepository.execute(
+            "UPDATE fair_rank_scores SET computed_at = ? WHERE project_id = ?",
+            ((now - timedelta(hours=25)).isoformat(), aged),
+        )
+        fallbacks = dict(FairRankEngine.incremental_fallbacks)
+        self.assertTrue(FairRankEngine.run_incremental())
+        self.assertEqual(FairRankEngine.incremental_fallbacks, fallbacks)
+        after = {s["project_id"]: s for s in FairRankRepository.get_ranked_projects()}
+        self.assertEqual((before[aged]["freshness_boost"], after[aged]["freshness_boost"]), (1.0, 0.5))
+        self.assertNotEqual(after[aged]["computed_at"], before[aged]["computed_at"])
+        self.assertEqual(after[young]["computed_at"], before[young]["computed_at"])
+
+    def test_fairrank_bounds_tolerance(self):
+        old = {"engagement_min": 0.0, "engagement_max": 100.0, "impressions_min": 0.0, "impressions_max": 1000.0}
+        drifted = dict(old, engagement_max=104.0, impressions_max=1040.0)
+        self.assertFalse(FairRankEngine.bounds_changed(old, drifted, tolerance=0.05))
+        self.assertTrue(FairRankEngine.bounds_changed(old, drifted))
+        self.assertTrue(FairRankEngine.bounds_changed(old, dict(old, impressions_max=1060.0), tolerance=0.05))
+        self.assertEqual(FairRankEngine.normalize(np.array([50.0, 104.0]), (0.0, 100.0)).tolist(), [0.5, 1.0])
+
+    def test_async_repository_runs_off_the_event_loop(self):
+        async def scenario():
+            user_id = await AsyncRepository.call(UserRepository.create_user, "Async", "creator")
+            row = await AsyncRepository.fetch_one("SELECT name FROM users WHERE user_id = ?", (user_id,))
+            self.assertEqual(row["name"], "Async")
+
+            # a slow DB call must not stall other coroutines on the loop
+            started = threading.Event()
+            ticks = []
+
+            def slow_query():
+                started.set()
+                time.sleep(0.2)
+                return BaseRepository.fetch_all("SELECT user_id FROM users WHERE user_id = ?", (user_id,))
+
+            async def ticker():
+                while not started.is_set():
+                    await asyncio.sleep(0.01)
+                for _ in range(5):
+                    ticks.append(time.monotonic())
+                    await asyncio.sleep(0.01)
+
+            rows, _ = await asyncio.gather(AsyncRepository.call(slow_query), ticker())
+            self.assertEqual(rows, [{"user_id": user_id}])
+            self.assertEqual(len(ticks), 5)
+
+        asyncio.run(scenario())
+
+    def test_transaction_commits_or_rolls_back_as_a_unit(self):
+        with BaseRepository.transaction():
+            kept = UserRepository.create_user("Kept", "creator")
+            # reads inside the block see the uncommitted insert
+            self.assertIsNotNone(UserRepository.get_user(kept))
+        self.assertIsNotNone(UserRepository.get_user(kept))
+
+        with self.assertRaises(RuntimeError):
+            with BaseRepository.transaction():
+                ghost = UserRepository.create_user("Ghost", "creator")
+                CreatorRepository.create_creator_profile(ghost, "dev", "go", "full", "NY", "bio")
+                raise RuntimeError("abort")
+        self.assertIsNone(UserRepository.get_user(ghost))
+        self.assertIsNone(CreatorRepository.get_creator(ghost))
+
+    def test_bulk_upsert_streams_rows_in_chunks(self):
+        base = 900000
+        rows = ((base, base + k, k / 10.0) for k in range(1, 6))
+        written = SimilarityRepository.upsert_similarities(rows, batch_size=2)
+        self.assertEqual(written, 5)
+
+        stored = SimilarityRepository.get_similar_projects(base)
+        self.assertEqual(len(stored), 5)
+        self.assertAlmostEqual(stored[0]["similarity"], 0.5)
+
+    def test_gini_array_matches_reference(self):
+        import numpy as np
+
+        values = [0, 3, 1, 7, 7, 2]
+        self.assertAlmostEqual(
+            FairRankEngine.compute_gini_array(np.array(values, dtype=float)),
+            FairRankEngine.compute_gini(values),
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+
+import numpy as np
+
+from app.services.exposure_stats import ExposureStats, StreamingHistogram
+from app.services.fairrank_engine import FairRankEngine
+
+
+class StreamingHistogramTestCase(unittest.TestCase):
+    def test_buckets_cover_values_contiguously(self):
+        previous_hi = -1
+        for index in range(StreamingHistogram.bucket(10 ** 6) + 1):
+            lo, hi = StreamingHistogram.bounds(index)
+            self.assertEqual(lo, previous_hi + 1)
+            self.assertEqual(StreamingHistogram.bucket(lo), index)
+            self.assertEqual(StreamingHistogram.bucket(hi), index)
+            previous_hi = hi
+
+    def test_gini_error_bound_holds(self):
+        rng = np.random.default_rng(7)
+        for values in (
+            rng.integers(0, 20, 500),
+            rng.pareto(1.5, 2000).astype(np.int64) * 37,
+            np.zeros(10, dtype=np.int64),
+        ):
+            histogram = StreamingHistogram()
+            for v in values.tolist():
+                histogram.add(v)
+            estimate, error = histogram.gini()
+            exact = FairRankEngine.compute_gini_array(values.astype(np.float64))
+            self.assertLessEqual(abs(estimate - exact), error + 1e-12)
+            self.assertLess(error, 0.02)
+
+    def test_moves_match_a_fresh_build(self):
+        histogram = StreamingHistogram()
+        for v in (0, 3, 40, 900):
+            histogram.add(v)
+        histogram.move(3, 5000)
+        histogram.move(40, 41)
+        rebuilt = StreamingHistogram()
+        for v in (0, 5000, 41, 900):
+            rebuilt.add(v)
+        self.assertEqual(histogram.gini(), rebuilt.gini())
+        self.assertEqual((histogram.count, histogram.total), (4, 5941))
+
+
+class ExposureStatsTestCase(unittest.TestCase):
+    def test_incremental_updates_match_rebuild(self):
+        stats = ExposureStats([{"project_id": 1, "impressions": 0}, {"project_id": 2, "impressions": 120}])
+        stats.add_project(3)
+        stats.add_impressions({1: 60, 3: 600, 99: 5})
+        stats.set_impressions(2, 10)
+
+        rebuilt = ExposureStats([
+            {"project_id": 1, "impressions": 60},
+            {"project_id": 2, "impressions": 10},
+            {"project_id": 3, "impressions": 600},
+        ])
+        self.assertEqual(stats.snapshot(), rebuilt.snapshot())
+        self.assertEqual(stats.snapshot()["exposure_distribution"], {"0-50": 1, "51-100": 1, "500+": 1})
+        self.assertEqual(stats.snapshot()["underexposed_projects"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
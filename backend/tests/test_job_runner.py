@@ -0,0 +1,82 @@
+import threading
+import unittest
+
+from app.services.job_runner import JobRunner, CANCELLED, FAILED, SUCCEEDED
+
+
+class JobRunnerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.runner = JobRunner(max_workers=4, history=10)
+
+    def tearDown(self):
+        self.runner.shutdown()
+
+    def test_overlapping_triggers_coalesce_into_one_follow_up(self):
+        release = threading.Event()
+        concurrent, active, lock = [], [], threading.Lock()
+
+        def work(job):
+            with lock:
+                active.append(job.id)
+                concurrent.append(len(active))
+            release.wait(5)
+            with lock:
+                active.remove(job.id)
+
+        first = self.runner.submit("engine", work)
+        follow_up = self.runner.submit("engine", work)
+        self.assertIsNot(follow_up, first)
+        for _ in range(3):
+            self.assertIs(self.runner.submit("engine", work), follow_up)
+        self.assertEqual(follow_up.coalesced, 3)
+
+        release.set()
+        follow_up.wait(5)
+        self.assertEqual((first.status, follow_up.status), (SUCCEEDED, SUCCEEDED))
+        self.assertEqual(max(concurrent), 1)  # never two runs of one kind at once
+        self.assertEqual(follow_up.progress, 1.0)
+        self.assertIsNotNone(follow_up.to_dict()["duration_seconds"])
+
+    def test_wider_trigger_upgrades_the_queued_follow_up(self):
+        release, ran = threading.Event(), []
+        self.runner.submit("engine", lambda job: release.wait(5))
+        follow_up = self.runner.submit("engine", lambda job: ran.append("incremental"), mode="incremental")
+        self.assertIs(self.runner.submit("engine", lambda job: ran.append("full"), mode="full", scope=1), follow_up)
+        # a narrower trigger joins without downgrading it
+        self.assertIs(self.runner.submit("engine", lambda job: ran.append("incremental"), mode="incremental"),
+                      follow_up)
+
+        release.set()
+        follow_up.wait(5)
+        self.assertEqual((ran, follow_up.mode, follow_up.coalesced), (["full"], "full", 2))
+
+    def test_cancel_queued_and_running_jobs(self):
+        started, release = threading.Event(), threading.Event()
+
+        def work(job):
+            started.set()
+            release.wait(5)
+            job.check_cancelled()
+
+        running = self.runner.submit("engine", work)
+        queued = self.runner.submit("engine", work)
+        started.wait(5)
+        self.assertEqual(self.runner.cancel(queued.id).status, CANCELLED)
+        self.runner.cancel(running.id)
+        release.set()
+        self.assertEqual(running.wait(5).status, CANCELLED)
+        self.assertIsNone(self.runner.cancel("missing"))
+
+    def test_failure_is_recorded_and_next_trigger_runs(self):
+        def boom(job):
+            raise RuntimeError("db down")
+
+        failed = self.runner.submit("engine", boom).wait(5)
+        self.assertEqual((failed.status, failed.error), (FAILED, "db down"))
+        ok = self.runner.submit("engine", lambda job: None).wait(5)
+        self.assertEqual(ok.status, SUCCEEDED)
+        self.assertIs(self.runner.get(failed.id), failed)
+
+
+if __name__ == "__main__":
+    unittest.main()
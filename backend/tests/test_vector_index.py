@@ -0,0 +1,95 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from app.services.embedding_snapshot import EmbeddingSnapshot
+from app.services.vector_index import VectorIndex, normalize_rows
+
+
+class VectorIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        self.ids = np.arange(100, 400)
+        self.matrix = rng.standard_normal((len(self.ids), 16)).astype(np.float32)
+        normed = self.matrix / np.linalg.norm(self.matrix, axis=1, keepdims=True)
+        self.exact = normed @ normed.T
+
+    def expected_neighbours(self, pos, k):
+        scores = self.exact[pos].copy()
+        scores[pos] = -np.inf
+        return [int(self.ids[i]) for i in np.argsort(-scores)[:k]]
+
+    def test_query_matches_exhaustive_top_k(self):
+        index = VectorIndex(self.ids, self.matrix)
+        result = index.query(int(self.ids[7]), 5)
+        self.assertEqual([pid for pid, _ in result], self.expected_neighbours(7, 5))
+        self.assertAlmostEqual(result[0][1], float(np.sort(self.exact[7])[-2]), places=5)
+
+    def test_top_k_all_matches_query_in_blocks(self):
+        index = VectorIndex(self.ids, self.matrix)
+        neighbours = dict(index.top_k_all(3, block_size=64))
+        self.assertEqual(len(neighbours), len(self.ids))
+        for pos in (0, 63, 64, 299):
+            pid = int(self.ids[pos])
+            self.assertEqual([n for n, _ in neighbours[pid]], self.expected_neighbours(pos, 3))
+
+    def test_lsh_returns_k_results_from_candidates(self):
+        index = VectorIndex(self.ids, self.matrix, lsh_tables=8, lsh_bits=4)
+        result = index.query(int(self.ids[0]), 5)
+        self.assertEqual(len(result), 5)
+        self.assertNotIn(int(self.ids[0]), [pid for pid, _ in result])
+        scores = [s for _, s in result]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_pairs_above_matches_exhaustive_threshold(self):
+        index = VectorIndex(self.ids, self.matrix)
+        pairs = list(index.pairs_above(0.4, block_size=37))
+
+        rows, cols = np.nonzero(np.triu(self.exact >= 0.4, k=1))
+        expected = {(int(self.ids[r]), int(self.ids[c])) for r, c in zip(rows, cols)}
+        self.assertEqual({(a, b) for a, b, _ in pairs}, expected)
+        self.assertEqual(len(pairs), len(expected))
+        self.assertTrue(all(score >= 0.4 for _, _, score in pairs))
+
+    def test_snapshot_round_trip_is_memory_mapped(self):
+        with tempfile.TemporaryDirectory() as directory:
+            EmbeddingSnapshot.write(directory, self.ids, normalize_rows(self.matrix), "a-1")
+            snapshot = EmbeddingSnapshot.write(directory, self.ids, normalize_rows(self.matrix), "a-2")
+
+            self.assertEqual(snapshot.stamp, "a-2")
+            self.assertIsInstance(snapshot.matrix, np.memmap)
+            self.assertEqual(sorted(n for n in os.listdir(directory) if n.endswith(".npy")),
+                             ["embedding_ids-a-2.npy", "embeddings-a-2.npy"])
+
+            index = VectorIndex(snapshot.project_ids, snapshot.matrix, normalized=True)
+            result = index.query(int(self.ids[7]), 5)
+            self.assertEqual([pid for pid, _ in result], self.expected_neighbours(7, 5))
+
+        self.assertIsNone(EmbeddingSnapshot.load(directory))
+
+    def test_upsert_matches_a_rebuilt_index(self):
+        readonly = normalize_rows(self.matrix)
+        readonly.flags.writeable = False
+        index = VectorIndex(self.ids, readonly, normalized=True, lsh_tables=4, lsh_bits=4)
+        replacement, added = -self.matrix[3], self.matrix[9] + 0.5
+        index.upsert(int(self.ids[5]), replacement)
+        index.upsert(999, added)
+
+        matrix = self.matrix.copy()
+        matrix[5] = replacement
+        rebuilt = VectorIndex(np.append(self.ids, 999), np.vstack([matrix, added]), lsh_tables=4, lsh_bits=4)
+        np.testing.assert_allclose(index.matrix, rebuilt.matrix, rtol=1e-6)
+        for mine, theirs in zip(index._buckets, rebuilt._buckets):
+            self.assertEqual({c: sorted(p.tolist()) for c, p in mine.items()},
+                             {c: sorted(p.tolist()) for c, p in theirs.items()})
+        self.assertEqual(index.query(999, 5), rebuilt.query(999, 5))
+
+    def test_unknown_project_returns_nothing(self):
+        index = VectorIndex(self.ids, self.matrix)
+        self.assertEqual(index.query(1, 5), [])
+
+
+if __name__ == "__main__":
+    unittest.main()